@@ -0,0 +1,51 @@
+# case_cache.py
+"""
+Cache of parsed and validated case files for the game server.
+Games created from the same case share one CaseData instance instead of
+re-reading and re-validating the JSON file each time.
+"""
+
+import os
+import threading
+from typing import Dict, Tuple
+
+from bayesian_core import CaseData
+
+
+class CaseCache:
+    """CaseData objects keyed by path, reloaded when the file changes."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, CaseData]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, case_file: str) -> CaseData:
+        """
+        Get the parsed case for a file.
+        Raises FileNotFoundError or ValueError like CaseData does.
+        """
+        try:
+            mtime = os.stat(case_file).st_mtime
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Could not find case file '{case_file}'")
+
+        entry = self._entries.get(case_file)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        case_data = CaseData(case_file)
+        with self._lock:
+            self._entries[case_file] = (mtime, case_data)
+        return case_data
+
+    def invalidate(self, case_file: str = None):
+        """Drop one cached case, or all of them."""
+        with self._lock:
+            if case_file is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(case_file, None)
@@ -0,0 +1,95 @@
+# classroom.py
+"""
+Roster parsing and table assignment for classroom provisioning.
+A teacher uploads one CSV of students (name, tolerance, rating scale) and
+the server spreads them over a batch of games created from one case, so
+each table gets a similar mix of conviction standards.
+"""
+
+import csv
+import io
+from typing import Dict, List
+
+TRUE_VALUES = ('1', 'true', 'yes', 'y', 'scale', 'rating')
+FALSE_VALUES = ('0', 'false', 'no', 'n', 'percent', 'percentage')
+
+
+def parse_roster_entry(entry: Dict, where: str) -> Dict:
+    """Validate one roster entry (name, tolerance, optional rating_scale)."""
+    name = str(entry.get('name') or '').strip()
+    if not name:
+        raise ValueError(f"{where}: name is required")
+
+    tolerance = entry.get('tolerance', entry.get('guilt_tolerance'))
+    try:
+        tolerance = int(str(tolerance).strip())
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: tolerance must be a whole number, got '{tolerance}'")
+    if tolerance <= 1:
+        raise ValueError(f"{where}: tolerance must be greater than 1")
+
+    rating_scale = entry.get('rating_scale', entry.get('use_rating_scale'))
+    if rating_scale is None or rating_scale == '':
+        use_rating_scale = True
+    elif isinstance(rating_scale, bool):
+        use_rating_scale = rating_scale
+    elif str(rating_scale).strip().lower() in TRUE_VALUES:
+        use_rating_scale = True
+    elif str(rating_scale).strip().lower() in FALSE_VALUES:
+        use_rating_scale = False
+    else:
+        raise ValueError(f"{where}: rating_scale must be yes or no, got '{rating_scale}'")
+
+    return {'name': name, 'guilt_tolerance': tolerance, 'use_rating_scale': use_rating_scale}
+
+
+def parse_roster_csv(text: str) -> List[Dict]:
+    """
+    Parse a roster CSV with columns name, tolerance (or guilt_tolerance) and
+    optionally rating_scale. Raises ValueError naming the offending line.
+    """
+    reader = csv.DictReader(io.StringIO(text.lstrip('\ufeff')))
+    if not reader.fieldnames:
+        raise ValueError("Roster is empty")
+    reader.fieldnames = [field.strip().lower() for field in reader.fieldnames]
+    if 'name' not in reader.fieldnames or not {'tolerance', 'guilt_tolerance'} & set(reader.fieldnames):
+        raise ValueError("Roster needs 'name' and 'tolerance' columns")
+
+    roster = []
+    for row in reader:
+        if not any((value or '').strip() for value in row.values() if isinstance(value, str)):
+            continue
+        roster.append(parse_roster_entry(row, f"Line {reader.line_num}"))
+    if not roster:
+        raise ValueError("Roster has no players")
+    return roster
+
+
+def parse_roster_list(entries: List[Dict]) -> List[Dict]:
+    """Validate a roster given as a JSON list of entries."""
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Roster has no players")
+    return [parse_roster_entry(entry if isinstance(entry, dict) else {}, f"Entry {number}")
+            for number, entry in enumerate(entries, 1)]
+
+
+def assign_to_tables(roster: List[Dict], table_count: int, max_per_table: int) -> List[List[Dict]]:
+    """
+    Split a roster over table_count tables of at most max_per_table players.
+    Players are dealt in a snake order by tolerance, so every table gets a
+    spread from the most lenient to the strictest standard and table sizes
+    differ by at most one.
+    """
+    if table_count < 1:
+        raise ValueError("At least one table is required")
+    if len(roster) > table_count * max_per_table:
+        raise ValueError(f"{len(roster)} players do not fit in {table_count} tables "
+                         f"of {max_per_table}")
+
+    tables: List[List[Dict]] = [[] for _ in range(table_count)]
+    ordered = sorted(roster, key=lambda entry: entry['guilt_tolerance'])
+    for position, entry in enumerate(ordered):
+        lap, offset = divmod(position, table_count)
+        table = offset if lap % 2 == 0 else table_count - 1 - offset
+        tables[table].append(entry)
+    return tables
@@ -0,0 +1,342 @@
+# evidence_stats.py
+"""
+Streaming statistics of players' dB updates per evidence item.
+
+For each (case hash, evidence index) the server keeps Welford running
+moments and a fixed-width dB histogram. Both are updated in O(1) per
+response, use bounded memory however many responses arrive, and merge
+exactly, so a juror's assessment can be compared with everyone who has
+judged the same item.
+
+Each worker process periodically writes its own cumulative snapshot to a
+shared directory; queries merge the live local state with the other
+workers' snapshots (reloaded only when a snapshot file changes). A
+snapshot nobody has rewritten for a long time belongs to a stopped
+worker: the first live worker to claim it folds its totals into its own
+and deletes it, so the directory holds about one file per running worker.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+import uuid
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from bayesian_core import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+SUMMARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class RunningMoments:
+    """Count, mean, variance, min and max via Welford's algorithm."""
+
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: 'RunningMoments'):
+        """Combine with another set of moments (Chan et al. parallel update)."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.minimum, 'max': self.maximum}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RunningMoments':
+        moments = cls()
+        moments.count, moments.mean, moments.m2 = data['count'], data['mean'], data['m2']
+        moments.minimum, moments.maximum = data['min'], data['max']
+        return moments
+
+
+class DbHistogram:
+    """
+    Quantile sketch over fixed-width dB bins. Values outside [low, high)
+    fall into an underflow or overflow bin. Quantiles are accurate to one
+    bin width inside the range; merging just adds counts.
+    """
+
+    __slots__ = ('bin_width', 'low', 'bins', 'counts')
+
+    def __init__(self, bin_width: float = 0.1, low: float = -40.0, high: float = 40.0):
+        self.bin_width = bin_width
+        self.low = low
+        self.bins = int(round((high - low) / bin_width))
+        # Sparse: bin index -> count, with -1 for underflow and self.bins for overflow
+        self.counts: Dict[int, int] = {}
+
+    def _bin(self, value: float) -> int:
+        index = math.floor((value - self.low) / self.bin_width)
+        return min(max(index, -1), self.bins)
+
+    def add(self, value: float):
+        index = self._bin(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+
+    def merge(self, other: 'DbHistogram'):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+
+    def quantile(self, q: float, minimum: float, maximum: float) -> Optional[float]:
+        """Estimate the q-quantile; minimum/maximum bound the outer bins."""
+        total = sum(self.counts.values())
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                if index < 0:
+                    return minimum
+                if index >= self.bins:
+                    return maximum
+                midpoint = self.low + (index + 0.5) * self.bin_width
+                return min(max(midpoint, minimum), maximum)
+        return maximum
+
+    def fraction_below(self, value: float) -> Optional[float]:
+        """Estimate the share of recorded values below value (half of its own bin counts)."""
+        total = sum(self.counts.values())
+        if not total:
+            return None
+        value_bin = self._bin(value)
+        below = sum(count for index, count in self.counts.items() if index < value_bin)
+        return (below + self.counts.get(value_bin, 0) / 2) / total
+
+    def to_dict(self) -> Dict:
+        return {'bin_width': self.bin_width, 'low': self.low, 'bins': self.bins,
+                'counts': {str(index): count for index, count in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DbHistogram':
+        histogram = cls(data['bin_width'], data['low'], data['low'] + data['bins'] * data['bin_width'])
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        return histogram
+
+
+class EvidenceStats:
+    """Moments and quantile sketch for one evidence item."""
+
+    __slots__ = ('moments', 'histogram')
+
+    def __init__(self):
+        self.moments = RunningMoments()
+        self.histogram = DbHistogram()
+
+    def add(self, value: float):
+        self.moments.add(value)
+        self.histogram.add(value)
+
+    def merge(self, other: 'EvidenceStats'):
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+
+    def summary(self, value: float = None) -> Dict:
+        moments = self.moments
+        summary = {
+            'count': moments.count,
+            'mean_db': moments.mean,
+            'stddev_db': math.sqrt(moments.variance),
+            'min_db': moments.minimum,
+            'max_db': moments.maximum,
+            'quantiles': {f"p{int(q * 100)}": self.histogram.quantile(q, moments.minimum, moments.maximum)
+                          for q in SUMMARY_QUANTILES},
+        }
+        if value is not None:
+            summary['value_db'] = value
+            summary['percentile'] = self.histogram.fraction_below(value) * 100
+        return summary
+
+    def to_dict(self) -> Dict:
+        return {'moments': self.moments.to_dict(), 'histogram': self.histogram.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EvidenceStats':
+        stats = cls()
+        stats.moments = RunningMoments.from_dict(data['moments'])
+        stats.histogram = DbHistogram.from_dict(data['histogram'])
+        return stats
+
+
+def _stats_key(case_hash: str, evidence_index: int) -> str:
+    return f"{case_hash}:{evidence_index}"
+
+
+class EvidenceStatsRegistry:
+    """This process's evidence statistics, merged with other workers' snapshots on read."""
+
+    def __init__(self, snapshot_dir: str = None, worker_id: str = None):
+        self.snapshot_dir = snapshot_dir
+        # A fresh id per process start, so a restarted worker never overwrites history
+        self.worker_id = worker_id or f"{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self._stats: Dict[str, EvidenceStats] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        # Other workers' snapshots: filename -> (mtime, {key: EvidenceStats})
+        self._peers: Dict[str, Tuple[float, Dict[str, EvidenceStats]]] = {}
+
+    def record(self, case_hash: str, evidence_index: int, db_update: float):
+        """Add one response's dB update."""
+        key = _stats_key(case_hash, evidence_index)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EvidenceStats()
+            stats.add(db_update)
+            self._dirty = True
+
+    def record_many(self, case_hash: str, evidence_index: int, db_updates: Iterable[float]):
+        for db_update in db_updates:
+            self.record(case_hash, evidence_index, db_update)
+
+    def merged(self, case_hash: str, evidence_index: int) -> Optional[EvidenceStats]:
+        """Get the statistics for an item across this and every other worker."""
+        key = _stats_key(case_hash, evidence_index)
+        merged = EvidenceStats()
+        with self._lock:
+            local = self._stats.get(key)
+            if local is not None:
+                merged.merge(local)
+        for peer in self._peer_snapshots():
+            if key in peer:
+                merged.merge(peer[key])
+        return merged if merged.moments.count else None
+
+    def summary(self, case_hash: str, evidence_index: int, value: float = None) -> Optional[Dict]:
+        stats = self.merged(case_hash, evidence_index)
+        if stats is None:
+            return None
+        summary = stats.summary(value)
+        summary.update({'case_hash': case_hash, 'evidence_index': evidence_index})
+        return summary
+
+    def flush(self) -> bool:
+        """Write this worker's cumulative snapshot if anything changed."""
+        if not self.snapshot_dir:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {key: stats.to_dict() for key, stats in self._stats.items()}
+            self._dirty = False
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        write_json_atomic(self._snapshot_path(self.worker_id), data, fsync=False)
+        return True
+
+    def compact(self, stale_seconds: float) -> int:
+        """
+        Absorb the snapshots of workers that stopped writing more than
+        stale_seconds ago into this worker's totals, then delete them.
+        Call this more often than stale_seconds, as it also refreshes the
+        timestamp of this worker's own snapshot.
+        Each file is claimed by renaming it, so only one worker absorbs it.
+        Returns the number of snapshots absorbed.
+        """
+        if not self.snapshot_dir or not os.path.isdir(self.snapshot_dir):
+            return 0
+        own_path = self._snapshot_path(self.worker_id)
+        own = os.path.basename(own_path)
+        try:
+            # Keep an idle worker's own snapshot from looking abandoned
+            os.utime(own_path)
+        except OSError:
+            pass
+        cutoff = time.time() - stale_seconds
+        claimed = []
+        for name in os.listdir(self.snapshot_dir):
+            if name == own or not (name.startswith('evidence_stats_') and name.endswith('.json')):
+                continue
+            path = os.path.join(self.snapshot_dir, name)
+            claim = os.path.join(self.snapshot_dir, f"claimed_{self.worker_id}_{name}")
+            try:
+                if os.path.getmtime(path) > cutoff:
+                    continue
+                os.rename(path, claim)
+            except OSError:
+                continue  # Rewritten, or claimed by another worker
+            try:
+                with open(claim, 'r') as file:
+                    snapshot = {key: EvidenceStats.from_dict(value) for key, value in json.load(file).items()}
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Discarding unreadable evidence stats snapshot {name}: {e}")
+                snapshot = {}
+            with self._lock:
+                for key, stats in snapshot.items():
+                    local = self._stats.get(key)
+                    if local is None:
+                        local = self._stats[key] = EvidenceStats()
+                    local.merge(stats)
+                self._dirty = True
+            self._peers.pop(name, None)
+            claimed.append(claim)
+        if claimed:
+            # Write the absorbed totals before the claimed files disappear
+            self.flush()
+            for claim in claimed:
+                try:
+                    os.remove(claim)
+                except OSError:
+                    pass
+        return len(claimed)
+
+    def _snapshot_path(self, worker_id: str) -> str:
+        return os.path.join(self.snapshot_dir, f"evidence_stats_{worker_id}.json")
+
+    def _peer_snapshots(self) -> Iterable[Dict[str, EvidenceStats]]:
+        if not self.snapshot_dir or not os.path.isdir(self.snapshot_dir):
+            return []
+        own = os.path.basename(self._snapshot_path(self.worker_id))
+        peers = {}
+        for name in os.listdir(self.snapshot_dir):
+            if name == own or not (name.startswith('evidence_stats_') and name.endswith('.json')):
+                continue
+            path = os.path.join(self.snapshot_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+                cached = self._peers.get(name)
+                if cached is None or cached[0] != mtime:
+                    with open(path, 'r') as file:
+                        snapshot = {key: EvidenceStats.from_dict(value) for key, value in json.load(file).items()}
+                    cached = (mtime, snapshot)
+                peers[name] = cached
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping evidence stats snapshot {name}: {e}")
+        self._peers = peers
+        return [snapshot for _, snapshot in peers.values()]
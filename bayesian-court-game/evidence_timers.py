@@ -0,0 +1,190 @@
+# evidence_timers.py
+"""
+Deadlines and quorum rules that move a game past its current evidence
+when some jurors never answer.
+
+Each game's policy can end an evidence item once its deadline passes, or
+once a quorum (e.g. 90% of connected players) has responded and a grace
+period has passed. The checkpoints of every game sit in one heap keyed by
+game id, and a single server task pops whatever is due on each tick, so
+thousands of open evidence items cost one heap entry each rather than one
+thread or greenlet per game. Re-opening or closing a game's timer leaves
+its old entry in the heap to be skipped when popped.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class AdvancePolicy:
+    """When to advance without waiting for every connected player."""
+    deadline_seconds: Optional[float] = 180.0
+    quorum: Optional[float] = 0.9
+    quorum_after_seconds: float = 45.0
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict], default: 'AdvancePolicy' = None) -> 'AdvancePolicy':
+        """
+        Build a policy from request JSON, filling gaps from default.
+        Use null to turn off the deadline or the quorum rule.
+        Raises ValueError for out-of-range values.
+        """
+        values = asdict(default or cls())
+        if data:
+            unknown = set(data) - set(values)
+            if unknown:
+                raise ValueError(f"Unknown advance policy fields {sorted(unknown)}")
+            values.update(data)
+
+        try:
+            deadline = values['deadline_seconds']
+            deadline = None if deadline is None else float(deadline)
+            quorum = values['quorum']
+            quorum = None if quorum is None else float(quorum)
+            quorum_after = float(values['quorum_after_seconds'])
+        except (TypeError, ValueError):
+            raise ValueError("Advance policy values must be numbers or null")
+
+        if deadline is not None and deadline <= 0:
+            raise ValueError("deadline_seconds must be positive")
+        if quorum is not None and not 0 < quorum <= 1:
+            raise ValueError("quorum must be a fraction between 0 and 1")
+        if quorum_after < 0:
+            raise ValueError("quorum_after_seconds cannot be negative")
+        return cls(deadline, quorum, quorum_after)
+
+    def checkpoints(self) -> List[float]:
+        """Seconds after an evidence item opens at which its rules can first fire."""
+        times = []
+        if self.quorum is not None:
+            times.append(self.quorum_after_seconds)
+        if self.deadline_seconds is not None:
+            times.append(self.deadline_seconds)
+        return sorted(set(times))
+
+
+class TimerHeap:
+    """One min-heap of due times, at most one live timer per key."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._live: Dict[str, int] = {}  # key -> sequence of its live entry
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def schedule(self, key: str, due: float):
+        """Set (or move) a key's timer."""
+        sequence = next(self._sequence)
+        self._live[key] = sequence
+        heapq.heappush(self._heap, (due, sequence, key))
+
+    def cancel(self, key: str) -> bool:
+        return self._live.pop(key, None) is not None
+
+    def next_due(self) -> Optional[float]:
+        self._skip_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[str]:
+        """Remove and return every key whose timer is at or before now, earliest first."""
+        keys = []
+        while True:
+            self._skip_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return keys
+            _, _, key = heapq.heappop(self._heap)
+            del self._live[key]
+            keys.append(key)
+
+    def _skip_stale(self):
+        while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+
+class EvidenceTimers:
+    """Advance policies and open-evidence checkpoints for every game."""
+
+    def __init__(self, default_policy: AdvancePolicy = None, clock: Callable[[], float] = time.monotonic):
+        self.default_policy = default_policy or AdvancePolicy()
+        self.clock = clock
+        self._policies: Dict[str, AdvancePolicy] = {}
+        self._opened: Dict[str, Tuple[int, float]] = {}  # game_id -> (evidence index, opened at)
+        self._timers = TimerHeap()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of games with an open evidence item."""
+        return len(self._opened)
+
+    def set_policy(self, game_id: str, policy: AdvancePolicy):
+        with self._lock:
+            self._policies[game_id] = policy
+
+    def policy(self, game_id: str) -> AdvancePolicy:
+        return self._policies.get(game_id, self.default_policy)
+
+    def open(self, game_id: str, evidence_index: int):
+        """Start timing a game's current evidence item."""
+        with self._lock:
+            now = self.clock()
+            self._opened[game_id] = (evidence_index, now)
+            self._schedule_next(game_id, now, now)
+
+    def close(self, game_id: str, forget_policy: bool = False):
+        """Stop timing a game (its evidence phase ended, or the game is gone)."""
+        with self._lock:
+            self._opened.pop(game_id, None)
+            self._timers.cancel(game_id)
+            if forget_policy:
+                self._policies.pop(game_id, None)
+
+    def seconds_open(self, game_id: str) -> Optional[float]:
+        opened = self._opened.get(game_id)
+        return self.clock() - opened[1] if opened else None
+
+    def should_advance(self, game_id: str, evidence_index: int, response_fraction: float) -> Optional[str]:
+        """
+        Why the game's open evidence should end now: 'deadline', 'quorum',
+        or None to keep waiting (also None for a stale evidence index).
+        """
+        opened = self._opened.get(game_id)
+        if opened is None or opened[0] != evidence_index:
+            return None
+        elapsed = self.clock() - opened[1]
+        policy = self.policy(game_id)
+        if policy.deadline_seconds is not None and elapsed >= policy.deadline_seconds:
+            return 'deadline'
+        if (policy.quorum is not None and elapsed >= policy.quorum_after_seconds
+                and response_fraction >= policy.quorum):
+            return 'quorum'
+        return None
+
+    def due(self) -> List[Tuple[str, int]]:
+        """
+        Games reaching a checkpoint, as (game_id, evidence index). Each is
+        re-armed for its next checkpoint, so check should_advance and close
+        the ones that advance.
+        """
+        with self._lock:
+            now = self.clock()
+            fired = []
+            for game_id in self._timers.pop_due(now):
+                opened = self._opened.get(game_id)
+                if opened is None:
+                    continue
+                fired.append((game_id, opened[0]))
+                self._schedule_next(game_id, opened[1], now)
+            return fired
+
+    def _schedule_next(self, game_id: str, opened_at: float, now: float):
+        for offset in self.policy(game_id).checkpoints():
+            if opened_at + offset > now:
+                self._timers.schedule(game_id, opened_at + offset)
+                return
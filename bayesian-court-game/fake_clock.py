@@ -0,0 +1,15 @@
+# fake_clock.py
+"""
+Manually advanced clock shared by the test suites of components that take
+a clock callable (rate limits, game TTLs, matchmaking, evidence deadlines).
+"""
+
+
+class FakeClock:
+    """Returns self.now; tests move time by assigning or adding to it."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
@@ -4,22 +4,49 @@ Flask web server for the Bayesian Court Game.
 Provides REST API endpoints and real-time WebSocket communication.
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session, send_file
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import uuid
 import json
+import math
+import os
+import time
+import functools
+import inspect
+import itertools
+import secrets
+import threading
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
+import atexit
 
 # Import our core game logic
 from bayesian_core import (
     BayesianGame, 
     BayesianCalculator,
+    CaseStore,
     GamePhase,
     list_case_files,
     validate_case_file
 )
+from game_lifecycle import GameLifecycleManager, ARCHIVED_PHASES
+from rate_limiter import RateLimitPolicy, AdmissionController
+from case_cache import CaseCache
+from metrics import MetricsRegistry, CONTENT_TYPE, DEFAULT_SIZE_BUCKETS
+from handler_profiler import HandlerProfiler
+from leaderboard import Leaderboard
+from game_index import GameIndex
+from evidence_stats import EvidenceStatsRegistry
+from classroom import parse_roster_entry, parse_roster_csv, parse_roster_list, assign_to_tables
+from matchmaking import MatchmakingQueue, Jury
+from room_events import RoomEventLogs
+from spectator_frames import SpectatorFrames
+from player_tokens import PlayerTokens
+from evidence_timers import AdvancePolicy, EvidenceTimers
+from result_writer import ResultWriter
+from result_archive import archive_from_env
+from results_store import ResultsStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,48 +62,626 @@ socketio = SocketIO(app, cors_allowed_origins="*", logger=True, engineio_logger=
 # Global game storage (in production, use Redis or database)
 active_games: Dict[str, BayesianGame] = {}
 player_sessions: Dict[str, str] = {}  # session_id -> game_id
+player_sids: Dict[str, str] = {}  # session_id -> sid of its latest connection
+
+# Lets a reconnecting client prove which player it was
+player_tokens = PlayerTokens(app.config['SECRET_KEY'])
+
+# Parsed case files shared between games
+case_cache = CaseCache()
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+metrics = MetricsRegistry()
+
+socket_events_total = metrics.counter(
+    'bayesian_court_socket_events_total', 'Socket events handled.', ['event'])
+socket_event_errors_total = metrics.counter(
+    'bayesian_court_socket_event_errors_total', 'Socket events that raised an exception.', ['event'])
+socket_event_seconds = metrics.histogram(
+    'bayesian_court_socket_event_duration_seconds', 'Socket event handler latency.', ['event'])
+rate_limited_total = metrics.counter(
+    'bayesian_court_rate_limited_total', 'Requests rejected by rate limiting.', ['action'])
+broadcasts_total = metrics.counter(
+    'bayesian_court_broadcasts_total', 'Room broadcasts sent.', ['event'])
+broadcast_bytes = metrics.histogram(
+    'bayesian_court_broadcast_payload_bytes',
+    'JSON size of sampled room broadcast payloads.', ['event'], buckets=DEFAULT_SIZE_BUCKETS)
+result_save_seconds = metrics.histogram(
+    'bayesian_court_result_save_duration_seconds', 'Time taken to save game results.')
+
+# Only every Nth broadcast is serialized again to measure its size
+BROADCAST_SIZE_SAMPLE_EVERY = 20
+_broadcast_sequence = itertools.count()
+
+
+def _games_by_phase():
+    return {(phase,): count for phase, count in game_index.phase_counts().items()}
+
+
+def _players_by_phase():
+    counts = {}
+    for game in list(active_games.values()):
+        for player in list(game.players.values()):
+            key = (game.phase.value, 'true' if player.is_connected else 'false')
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+metrics.callback_gauge('bayesian_court_games', 'Active games by phase.', ['phase'], _games_by_phase)
+metrics.callback_gauge('bayesian_court_players', 'Players in active games by game phase and connection.',
+                       ['phase', 'connected'], _players_by_phase)
+metrics.callback_gauge('bayesian_court_player_sessions', 'Sessions mapped to a game.', [],
+                       lambda: {(): len(player_sessions)})
+metrics.callback_counter('bayesian_court_case_cache_requests_total', 'Case cache lookups by result.',
+                         ['result'], lambda: {('hit',): case_cache.hits, ('miss',): case_cache.misses})
+metrics.callback_gauge('bayesian_court_spectators', 'Connected spectators across all games.', [],
+                       lambda: {(): spectators.total()})
+metrics.callback_counter('bayesian_court_spectator_frames_encoded_total',
+                         'Spectator frames serialized (each is shared by all of a game\'s spectators).',
+                         [], lambda: {(): spectators.frames_encoded})
+
+
+def timed_socket_event(event: str):
+    """Count a socket event and record its handler latency."""
+    count = socket_events_total.labels(event)
+    errors = socket_event_errors_total.labels(event)
+    latency = socket_event_seconds.labels(event)
+
+    def decorator(handler):
+        # Socket.IO may pass optional arguments (e.g. connect auth) the handler does not take
+        accepted_args = len(inspect.signature(handler).parameters)
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return handler(*args[:accepted_args], **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                count.inc()
+                latency.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+# Recent events per game room, replayed to clients that reconnect (see rejoin_game)
+room_events = RoomEventLogs(capacity=256)
+
+# Read-only viewers of a game, in a room of their own (see spectate_game)
+spectators = SpectatorFrames()
+
+
+def spectator_room(game_id: str) -> str:
+    return f"spectate:{game_id}"
+
+
+def spectator_state(game: BayesianGame) -> Dict:
+    """The game state shown to spectators, without player session ids."""
+    state = game.get_game_state()
+    state['players'] = list(state['players'].values())
+    return state
+
+
+def spectator_frame(game: BayesianGame, event: str = None) -> bytes:
+    """The encoded frame for the game's current revision, built at most once per revision."""
+    revision = room_events.revision(game.game_id)
+    return spectators.frame(game.game_id, revision, lambda: {
+        'game_id': game.game_id,
+        'revision': revision,
+        'event': event,
+        'game_state': spectator_state(game)
+    })
+
+
+def broadcast(event: str, payload: Dict, room: str, skip_sid: str = None):
+    """
+    Emit an event to every client in a room, recording broadcast metrics.
+    Events for an active game's room are numbered with the room's next
+    revision and kept for replay.
+    """
+    game = active_games.get(room)
+    if game is not None:
+        payload = dict(payload)
+        payload['revision'] = room_events.record(room, event, payload)
+    broadcasts_total.labels(event).inc()
+    if next(_broadcast_sequence) % BROADCAST_SIZE_SAMPLE_EVERY == 0:
+        broadcast_bytes.labels(event).observe(len(json.dumps(payload, default=str)))
+    socketio.emit(event, payload, room=room, skip_sid=skip_sid)
+    
+    if game is not None and spectators.count(room):
+        frame = spectator_frame(game, event)
+        broadcasts_total.labels('spectator_frame').inc()
+        broadcast_bytes.labels('spectator_frame').observe(len(frame))
+        socketio.emit('spectator_frame', frame, room=spectator_room(room))
+
+
+# Results are serialized and written off the request path, then loaded
+# into the SQLite results warehouse one batch at a time.
+# Set BAYESIAN_COURT_RESULT_ARCHIVE=gzip|zstd to append to a rolling
+# compressed archive instead of writing one JSON file per game.
+# Results reference their case by content hash; each case version is stored once.
+case_store = CaseStore(os.path.join('game_results', 'cases'))
+result_archive = archive_from_env(os.path.join('game_results', 'archive'))
+results_store = ResultsStore(os.path.join('game_results', 'results.db'), case_store=case_store)
+
+
+def _record_result_save(filename: str, seconds: float):
+    result_save_seconds.observe(seconds)
+
+
+result_writer = ResultWriter(on_written=_record_result_save, on_batch=results_store.insert_many,
+                             archive=result_archive)
+atexit.register(result_writer.close)
+
+
+# On-demand profiling of socket handlers (see /api/admin/profile)
+profiler = HandlerProfiler(output_dir='profiles', async_mode=socketio.async_mode)
+PROFILED_EVENTS = ('join_game', 'claim_seat', 'enqueue_match', 'cancel_match', 'rejoin_game',
+                   'spectate_game', 'stop_spectating', 'leave_game', 'start_game',
+                   'advance_to_evidence', 'submit_evidence_response', 'get_game_state')
+
+
+# Live calibration standings across active games (lower mean dB error ranks higher)
+leaderboard = Leaderboard()
+LEADERBOARD_SIZE = 10
+
+
+def leaderboard_key(game_id: str, player_id: str) -> str:
+    return f"{game_id}:{player_id}"
+
+
+def update_leaderboard(game: BayesianGame):
+    """Re-rank a game's players after an evidence item is scored and tell the room."""
+    keys = {}
+    for player_id, player in game.players.items():
+        mean_error = player.mean_abs_error_db()
+        if mean_error is None:
+            continue
+        key = leaderboard_key(game.game_id, player_id)
+        leaderboard.update(key, mean_error, name=player.name, game_id=game.game_id,
+                           scored_responses=player.scored_responses,
+                           mean_log_score=player.mean_log_score())
+        keys[player_id] = key
+    if not keys:
+        return
+
+    ranks = leaderboard.ranks(list(keys.values()))
+    broadcast('leaderboard_update', {
+        'top': leaderboard.top(LEADERBOARD_SIZE),
+        'total': len(leaderboard),
+        'ranks': {player_id: ranks[key] for player_id, key in keys.items()}
+    }, room=game.game_id)
+
+
+def _remove_from_leaderboard(game_id: str, game: BayesianGame):
+    for player_id in list(game.players):
+        leaderboard.remove(leaderboard_key(game_id, player_id))
+
+
+# Game list entries by phase, case and joinability for /api/games and the admin page.
+# Call game_index.update(game) wherever a game's phase or players change.
+game_index = GameIndex()
+BULK_ADMIN_MAX_GAMES = 500
+
+
+# Pre-registered classroom seats waiting for a student to claim them:
+# seat code -> (game_id, seat player_id)
+CLASSROOM_MAX_GAMES = 100
+roster_seats: Dict[str, Tuple[str, str]] = {}
+roster_seats_by_game: Dict[str, List[str]] = {}
+
+
+def _release_roster_seats(game_id: str):
+    for seat_code in roster_seats_by_game.pop(game_id, []):
+        roster_seats.pop(seat_code, None)
+
+
+# Serializes checking and advancing a game's evidence between the socket
+# handlers and the evidence timer task, so an item is scored only once
+game_locks: Dict[str, threading.RLock] = {}
+_game_locks_guard = threading.Lock()
+
+
+def game_lock(game_id: str) -> threading.RLock:
+    with _game_locks_guard:
+        lock = game_locks.get(game_id)
+        if lock is None:
+            lock = game_locks[game_id] = threading.RLock()
+        return lock
+
+
+def _on_game_dropped(game_id: str, game: BayesianGame):
+    game_index.remove(game_id)
+    with _game_locks_guard:
+        game_locks.pop(game_id, None)
+    room_events.drop(game_id)
+    evidence_timers.close(game_id, forget_policy=True)
+    if spectators.drop(game_id):
+        socketio.emit('game_deleted', {'game_id': game_id}, room=spectator_room(game_id))
+        socketio.close_room(spectator_room(game_id))
+    _release_roster_seats(game_id)
+    _remove_from_leaderboard(game_id, game)
+
+
+# Running dB update statistics per evidence item across all games.
+# Each worker snapshots its own totals here; reads merge every worker's.
+evidence_stats = EvidenceStatsRegistry(snapshot_dir=os.path.join('game_results', 'evidence_stats'))
+STATS_FLUSH_INTERVAL_SECONDS = 10
+# A snapshot this old belongs to a worker that has stopped
+STATS_SNAPSHOT_STALE_SECONDS = 3600
+_stats_flusher_started = False
+atexit.register(evidence_stats.flush)
+
+
+def score_evidence(game: BayesianGame) -> bool:
+    """Advance past the current evidence, folding its responses into the statistics."""
+    evidence_index = game.current_evidence_index
+    db_updates = [response.db_update for response in game.responses_for_current_evidence.values()]
+    has_more_evidence = game.advance_evidence()
+    if has_more_evidence:
+        evidence_timers.open(game.game_id, game.current_evidence_index)
+    else:
+        evidence_timers.close(game.game_id)
+    evidence_stats.record_many(game.case_data.content_hash, evidence_index, db_updates)
+    update_leaderboard(game)
+    game_index.update(game)
+    return has_more_evidence
+
+
+def complete_evidence(game: BayesianGame, evidence_index: int, auto_advance: str = None) -> bool:
+    """
+    Score evidence_index and tell the room what comes next. Returns False,
+    doing nothing, if the game has already moved past that evidence.
+    auto_advance names the rule ('deadline' or 'quorum') that ended it early.
+    """
+    with game_lock(game.game_id):
+        if game.phase != GamePhase.EVIDENCE_REVIEW or game.current_evidence_index != evidence_index:
+            return False
+        has_more_evidence = score_evidence(game)
+        game_state = game.get_game_state()
+        
+        if has_more_evidence:
+            # Move to next evidence
+            event = 'evidence_completed'
+            payload = {
+                'game_state': game_state,
+                'next_evidence_index': game.current_evidence_index
+            }
+        else:
+            # Move to verdict phase
+            event = 'all_evidence_completed'
+            payload = {
+                'game_state': game_state
+            }
+        if auto_advance:
+            payload['auto_advance'] = auto_advance
+        broadcast(event, payload, room=game.game_id)
+    
+    if not has_more_evidence:
+        lifecycle.archive_game(game)
+    return True
+
+
+def advance_if_ready(game: BayesianGame, evidence_index: int) -> bool:
+    """
+    Complete evidence_index if every connected player has answered it, or
+    if the game's quorum or deadline rule says enough time has passed.
+    """
+    with game_lock(game.game_id):
+        if game.phase != GamePhase.EVIDENCE_REVIEW or game.current_evidence_index != evidence_index:
+            return False
+        anyone_connected = any(player.is_connected for player in game.players.values())
+        if anyone_connected and game.response_fraction() >= 1.0:
+            return complete_evidence(game, evidence_index)
+        reason = evidence_timers.should_advance(game.game_id, evidence_index, game.response_fraction())
+        return complete_evidence(game, evidence_index, auto_advance=reason) if reason else False
+
+
+# Per-evidence deadlines and quorum rules. Every game's next checkpoint sits
+# in one timer heap that a single background task checks each tick.
+evidence_timers = EvidenceTimers(AdvancePolicy(deadline_seconds=180.0, quorum=0.9, quorum_after_seconds=45.0))
+EVIDENCE_TIMER_TICK_SECONDS = 0.5
+_evidence_timer_started = False
+
+
+def start_evidence_timer():
+    """Start the background task that enforces evidence deadlines (once per process)."""
+    global _evidence_timer_started
+    if _evidence_timer_started:
+        return
+    _evidence_timer_started = True
+    socketio.start_background_task(_evidence_timer_loop)
+
+
+def _evidence_timer_loop():
+    """Advance games whose open evidence has reached its deadline or quorum."""
+    while True:
+        socketio.sleep(EVIDENCE_TIMER_TICK_SECONDS)
+        try:
+            for game_id, evidence_index in evidence_timers.due():
+                game = active_games.get(game_id)
+                if game is None:
+                    continue
+                # Re-checked under the game's lock, in case a player's answer got there first
+                if advance_if_ready(game, evidence_index):
+                    logger.info(f"Advanced game {game_id} past evidence {evidence_index} on its timer")
+        except Exception as e:
+            logger.error(f"Error checking evidence deadlines: {e}")
+
+
+def advance_policy_from(data) -> Optional[AdvancePolicy]:
+    """Parse an optional 'advance_policy' object from request data. Raises ValueError."""
+    policy_data = data.get('advance_policy')
+    if policy_data is None:
+        return None
+    if isinstance(policy_data, str):
+        policy_data = json.loads(policy_data)
+    if not isinstance(policy_data, dict):
+        raise ValueError("advance_policy must be an object")
+    return AdvancePolicy.from_dict(policy_data, evidence_timers.default_policy)
+
+
+def start_stats_flusher():
+    """Start the background task that snapshots evidence statistics (once per process)."""
+    global _stats_flusher_started
+    if _stats_flusher_started:
+        return
+    _stats_flusher_started = True
+    socketio.start_background_task(_stats_flush_loop)
+
+
+def _stats_flush_loop():
+    while True:
+        socketio.sleep(STATS_FLUSH_INTERVAL_SECONDS)
+        try:
+            evidence_stats.flush()
+            evidence_stats.compact(STATS_SNAPSHOT_STALE_SECONDS)
+        except Exception as e:
+            logger.error(f"Error writing evidence statistics: {e}")
+
+
+# Idle eviction, game cap and archival of finished games
+lifecycle = GameLifecycleManager(active_games, player_sessions, archive_dir='game_results',
+                                 writer=result_writer, case_store=case_store,
+                                 on_dropped=_on_game_dropped)
+SWEEP_INTERVAL_SECONDS = 60
+_sweeper_started = False
+
+
+def start_lifecycle_sweeper():
+    """Start the background task that evicts idle games (once per process)."""
+    global _sweeper_started
+    if _sweeper_started:
+        return
+    _sweeper_started = True
+    socketio.start_background_task(_lifecycle_sweep_loop)
+
+
+def _lifecycle_sweep_loop():
+    """Periodically evict expired games and tell their rooms."""
+    while True:
+        socketio.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            for game_id in lifecycle.sweep():
+                broadcast('game_deleted', {'game_id': game_id, 'reason': 'expired'}, room=game_id)
+        except Exception as e:
+            logger.error(f"Error sweeping idle games: {e}")
+
+
+# Players waiting to be matched into a new game of a case (see enqueue_match)
+matchmaking = MatchmakingQueue(jury_size=6, max_wait=30.0)
+MATCHMAKING_POLL_SECONDS = 1
+_matchmaker_started = False
+
+
+def start_matchmaker():
+    """Start the background task that seats players who have waited too long (once per process)."""
+    global _matchmaker_started
+    if _matchmaker_started:
+        return
+    _matchmaker_started = True
+    socketio.start_background_task(_matchmaking_loop)
+
+
+def _matchmaking_loop():
+    """Periodically form juries for cases whose oldest player reached the wait limit."""
+    while True:
+        socketio.sleep(MATCHMAKING_POLL_SECONDS)
+        try:
+            for jury in matchmaking.poll():
+                seat_jury(jury)
+        except Exception as e:
+            logger.error(f"Error polling matchmaking queue: {e}")
+
+
+def seat_jury(jury: Jury):
+    """Create a game for a matched jury and move every player's socket into it."""
+    live_games = sum(1 for game in active_games.values() if game.phase not in ARCHIVED_PHASES)
+    # A player who joined another game while queued keeps that game
+    jury_players = [player for player in jury.players if player['player_id'] not in player_sessions]
+    if not jury_players:
+        return
+    
+    is_admitted, error_msg = admission.can_admit_game(live_games)
+    game_id = GameManager.create_game(jury.case_key, matchmaking.jury_size) if is_admitted else None
+    if not game_id:
+        for player in jury_players:
+            broadcast('match_failed', {'message': error_msg or 'Failed to create game'}, room=player['sid'])
+        return
+    
+    game = active_games[game_id]
+    for player_id in game.add_players(jury_players):
+        lifecycle.add_session(game_id, player_id)
+    game_index.update(game)
+    logger.info(f"Matched {len(jury_players)} player(s) into game {game_id}")
+    
+    game_state = game.get_game_state()
+    for player in jury_players:
+        join_room(game_id, sid=player['sid'], namespace='/')
+        broadcast('join_success', {
+            'game_id': game_id,
+            'player_id': player['player_id'],
+            'game_state': game_state,
+            'revision': room_events.revision(game_id),
+            'matched': True
+        }, room=player['sid'])
+
+
+# Per-session/per-IP token buckets and global caps on games and players
+# Set BAYESIAN_COURT_DISABLE_RATE_LIMITS=1 for local load testing
+rate_limits = RateLimitPolicy({} if os.environ.get('BAYESIAN_COURT_DISABLE_RATE_LIMITS') else None)
+admission = AdmissionController(max_games=500, max_players=5000)
+
+
+def socket_rate_limited(action: str):
+    """Reject a socket event when its session or IP is over the limit."""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            if not rate_limits.allow(action, session.get('session_id'), request.remote_addr):
+                rate_limited_total.labels(action).inc()
+                emit('error', {'message': 'Too many requests, please slow down', 'code': 'rate_limited'})
+                return
+            return handler(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def route_rate_limited(action: str):
+    """Reject a REST request when its session or IP is over the limit."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not rate_limits.allow(action, session.get('session_id'), request.remote_addr):
+                rate_limited_total.labels(action).inc()
+                return jsonify({
+                    'success': False,
+                    'error': 'Too many requests, please slow down'
+                }), 429
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class GameManager:
     """Manages active games and player sessions."""
     
     @staticmethod
-    def create_game(case_file: str, max_players: int = 12) -> Optional[str]:
+    def create_game(case_file: str, max_players: int = 12,
+                    advance_policy: AdvancePolicy = None) -> Optional[str]:
         """Create a new game and return game_id."""
+        game_ids = GameManager.create_games(case_file, 1, max_players, advance_policy)
+        return game_ids[0] if game_ids else None
+    
+    @staticmethod
+    def create_games(case_file: str, count: int, max_players: int = 12,
+                     advance_policy: AdvancePolicy = None) -> List[str]:
+        """Create count games sharing one parsed case. Returns their ids (empty on failure)."""
         try:
             # Ensure case file path is correct
             if not case_file.startswith('case_files/'):
                 case_file = f'case_files/{case_file}'
             
-            # Validate case file first
-            is_valid, error_msg = validate_case_file(case_file)
-            if not is_valid:
-                logger.error(f"Invalid case file {case_file}: {error_msg}")
-                return None
+            # Load (or reuse) the validated case once for the whole batch
+            try:
+                case_data = case_cache.get(case_file)
+            except (FileNotFoundError, ValueError) as e:
+                logger.error(f"Invalid case file {case_file}: {e}")
+                return []
             
-            # Create game
-            game_id = f"game_{uuid.uuid4().hex[:8]}"
-            game = BayesianGame(case_file, game_id)
-            game.max_players = max_players
-            
-            active_games[game_id] = game
-            logger.info(f"Created game {game_id} with case file {case_file}")
-            return game_id
+            start_lifecycle_sweeper()
+            start_stats_flusher()
+            start_evidence_timer()
+            game_ids = []
+            for _ in range(count):
+                game_id = f"game_{uuid.uuid4().hex[:8]}"
+                game = BayesianGame(case_file, game_id, case_data=case_data)
+                game.max_players = max_players
+                
+                for evicted_id in lifecycle.register_game(game_id, game):
+                    broadcast('game_deleted', {'game_id': evicted_id, 'reason': 'evicted'}, room=evicted_id)
+                if advance_policy:
+                    evidence_timers.set_policy(game_id, advance_policy)
+                game_index.update(game)
+                game_ids.append(game_id)
+            logger.info(f"Created {len(game_ids)} game(s) {game_ids} with case file {case_file}")
+            return game_ids
             
         except Exception as e:
             logger.error(f"Error creating game: {e}")
+            return []
+    
+    @staticmethod
+    def seat_roster(game_id: str, roster: List[Dict]) -> List[Dict]:
+        """
+        Pre-register roster entries as disconnected players of a game, each
+        under a seat code a student later claims with the claim_seat event.
+        Returns the seated entries with their seat codes.
+        """
+        game = GameManager.get_game(game_id)
+        if not game:
+            return []
+        
+        seats = {}
+        for entry in roster:
+            seat_code = secrets.token_urlsafe(6)
+            seats[f"seat_{seat_code}"] = (seat_code, entry)
+        added = game.add_players(
+            [dict(entry, player_id=player_id) for player_id, (_, entry) in seats.items()],
+            is_connected=False
+        )
+        
+        seated = []
+        for player_id in added:
+            seat_code, entry = seats[player_id]
+            roster_seats[seat_code] = (game_id, player_id)
+            roster_seats_by_game.setdefault(game_id, []).append(seat_code)
+            seated.append(dict(entry, seat_code=seat_code))
+        game_index.update(game)
+        return seated
+    
+    @staticmethod
+    def claim_seat(seat_code: str, session_id: str) -> Optional[BayesianGame]:
+        """Hand a pre-registered seat to a connecting session. Returns its game."""
+        seat = roster_seats.get(seat_code)
+        if not seat or session_id in player_sessions:
             return None
+        
+        game_id, seat_player_id = seat
+        game = GameManager.get_game(game_id)
+        if not game or not game.reassign_player(seat_player_id, session_id):
+            return None
+        
+        del roster_seats[seat_code]
+        codes = roster_seats_by_game.get(game_id)
+        if codes:
+            codes.remove(seat_code)
+        leaderboard.remove(leaderboard_key(game_id, seat_player_id))
+        game.set_player_connection_status(session_id, True)
+        lifecycle.add_session(game_id, session_id)
+        matchmaking.cancel(session_id)
+        game_index.update(game)
+        logger.info(f"Session {session_id} claimed seat of {game.players[session_id].name} in game {game_id}")
+        return game
     
     @staticmethod
     def get_game(game_id: str) -> Optional[BayesianGame]:
         """Get game by ID."""
-        return active_games.get(game_id)
+        game = active_games.get(game_id)
+        if game:
+            lifecycle.touch(game_id)
+        return game
     
     @staticmethod
     def delete_game(game_id: str) -> bool:
-        """Delete a game."""
-        if game_id in active_games:
-            del active_games[game_id]
+        """Delete a game and the player sessions attached to it."""
+        if lifecycle.drop_game(game_id, archive=False):
             logger.info(f"Deleted game {game_id}")
             return True
         return False
@@ -92,7 +697,9 @@ class GameManager:
         # Use session_id as player_id for uniqueness
         success = game.add_player(session_id, player_name, guilt_tolerance, use_rating_scale)
         if success:
-            player_sessions[session_id] = game_id
+            lifecycle.add_session(game_id, session_id)
+            matchmaking.cancel(session_id)
+            game_index.update(game)
             logger.info(f"Added player {player_name} ({session_id}) to game {game_id}")
         
         return success
@@ -106,9 +713,11 @@ class GameManager:
         game_id = player_sessions[session_id]
         game = GameManager.get_game(game_id)
         
+        lifecycle.remove_session(session_id)
         if game:
             game.remove_player(session_id)
-            del player_sessions[session_id]
+            game_index.update(game)
+            leaderboard.remove(leaderboard_key(game_id, session_id))
             logger.info(f"Removed player {session_id} from game {game_id}")
             return True
         
@@ -134,6 +743,11 @@ def admin():
     """Admin page for managing games."""
     return render_template('admin.html')
 
+@app.route('/spectate/<game_id>')
+def spectate(game_id):
+    """Read-only courtroom view for projectors and observers."""
+    return render_template('spectate.html', game_id=game_id)
+
 @app.route('/api/case-files')
 def get_case_files():
     """Get list of available case files."""
@@ -161,25 +775,30 @@ def get_case_files():
         }), 500
 
 @app.route('/api/games', methods=['GET'])
+@route_rate_limited('list_games')
 def get_active_games():
-    """Get list of active games."""
+    """Get a page of active games (?phase=&case=&joinable=true|false&cursor=&limit=)."""
     try:
-        games_info = []
-        for game_id, game in active_games.items():
-            game_info = {
-                'game_id': game_id,
-                'case_name': game.case_data.case_info['name'],
-                'phase': game.phase.value,
-                'player_count': len(game.players),
-                'max_players': game.max_players,
-                'created_at': game.created_at.isoformat(),
-                'can_join': len(game.players) < game.max_players and game.phase == GamePhase.SETUP
-            }
-            games_info.append(game_info)
+        joinable = request.args.get('joinable')
+        if joinable is not None:
+            joinable = joinable.lower() in ('1', 'true', 'yes')
+        try:
+            games_info, next_cursor = game_index.query(
+                phase=request.args.get('phase') or None,
+                case=request.args.get('case') or None,
+                joinable=joinable,
+                cursor=request.args.get('cursor') or None,
+                limit=int(request.args.get('limit', 50))
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         return jsonify({
             'success': True,
-            'games': games_info
+            'games': games_info,
+            'next_cursor': next_cursor,
+            'total': len(game_index),
+            'phase_counts': game_index.phase_counts()
         })
     
     except Exception as e:
@@ -189,6 +808,7 @@ def get_active_games():
         }), 500
 
 @app.route('/api/games', methods=['POST'])
+@route_rate_limited('create_game')
 def create_game():
     """Create a new game."""
     try:
@@ -202,7 +822,23 @@ def create_game():
                 'error': 'Case file is required'
             }), 400
         
-        game_id = GameManager.create_game(case_file, max_players)
+        try:
+            advance_policy = advance_policy_from(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        live_games = sum(1 for game in active_games.values() if game.phase not in ARCHIVED_PHASES)
+        is_admitted, error_msg = admission.can_admit_game(live_games)
+        if not is_admitted:
+            return jsonify({
+                'success': False,
+                'error': error_msg
+            }), 503
+        
+        game_id = GameManager.create_game(case_file, max_players, advance_policy)
         
         if game_id:
             return jsonify({
@@ -221,7 +857,98 @@ def create_game():
             'error': str(e)
         }), 500
 
+@app.route('/api/classrooms', methods=['POST'])
+@route_rate_limited('create_classroom')
+def create_classroom():
+    """
+    Create game_count games from one case and seat a roster across them.
+    Takes JSON {case_file, game_count, max_players, roster_csv | roster} or a
+    form with those fields and the CSV uploaded as 'roster'.
+    """
+    try:
+        if request.files.get('roster'):
+            data = request.form
+            roster_source = request.files['roster'].read().decode('utf-8-sig')
+        else:
+            data = request.get_json() or {}
+            roster_source = data.get('roster_csv', data.get('roster'))
+        case_file = data.get('case_file')
+        
+        try:
+            game_count = int(data.get('game_count', 1))
+            max_players = int(data.get('max_players', 12))
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'game_count and max_players must be integers'
+            }), 400
+        
+        if not case_file or roster_source is None:
+            return jsonify({
+                'success': False,
+                'error': 'Case file and roster are required'
+            }), 400
+        
+        if not 1 <= game_count <= CLASSROOM_MAX_GAMES or max_players < 1:
+            return jsonify({
+                'success': False,
+                'error': f'game_count must be between 1 and {CLASSROOM_MAX_GAMES}'
+            }), 400
+        
+        try:
+            if isinstance(roster_source, str):
+                roster = parse_roster_csv(roster_source)
+            else:
+                roster = parse_roster_list(roster_source)
+            tables = assign_to_tables(roster, game_count, max_players)
+            advance_policy = advance_policy_from(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        live_games = sum(1 for game in active_games.values() if game.phase not in ARCHIVED_PHASES)
+        is_admitted, error_msg = admission.can_admit_game(live_games + game_count - 1)
+        if not is_admitted:
+            return jsonify({
+                'success': False,
+                'error': error_msg
+            }), 503
+        
+        game_ids = GameManager.create_games(case_file, game_count, max_players, advance_policy)
+        if not game_ids:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to create games'
+            }), 500
+        
+        games = []
+        for game_id, table in zip(game_ids, tables):
+            seated = GameManager.seat_roster(game_id, table)
+            games.append({
+                'game_id': game_id,
+                'players': [{
+                    'name': entry['name'],
+                    'guilt_tolerance': entry['guilt_tolerance'],
+                    'use_rating_scale': entry['use_rating_scale'],
+                    'seat_code': entry['seat_code']
+                } for entry in seated]
+            })
+        
+        return jsonify({
+            'success': True,
+            'games': games
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/games/<game_id>')
+@route_rate_limited('game_info')
 def get_game_info(game_id):
     """Get detailed information about a specific game."""
     try:
@@ -244,27 +971,76 @@ def get_game_info(game_id):
             'error': str(e)
         }), 500
 
+@app.route('/api/leaderboard')
+@route_rate_limited('leaderboard')
+def get_leaderboard():
+    """Get calibration standings across active games (?limit=&offset=)."""
+    try:
+        limit = min(int(request.args.get('limit', LEADERBOARD_SIZE)), 100)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit and offset must be integers'}), 400
+    
+    return jsonify({
+        'success': True,
+        'total': len(leaderboard),
+        'entries': leaderboard.page(offset + 1, limit)
+    })
+
+@app.route('/api/stats/evidence/<case_hash>/<int:evidence_index>')
+@route_rate_limited('evidence_stats')
+def get_evidence_stats(case_hash, evidence_index):
+    """Get the spread of dB updates for one evidence item (?value= for its percentile)."""
+    value = request.args.get('value')
+    try:
+        value = float(value) if value is not None else None
+        if value is not None and not math.isfinite(value):
+            raise ValueError(value)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'value must be a number'}), 400
+    
+    summary = evidence_stats.summary(case_hash, evidence_index, value)
+    if summary is None:
+        return jsonify({'success': False, 'error': 'No responses recorded for this evidence'}), 404
+    
+    return jsonify({'success': True, 'stats': summary})
+
+@app.route('/metrics')
+def get_metrics():
+    """Server metrics in the Prometheus text format."""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
 
 # ============================================================================
 # WebSocket Event Handlers
 # ============================================================================
 
 @socketio.on('connect')
-def handle_connect():
-    """Handle client connection."""
-    session_id = session.get('session_id')
+@timed_socket_event('connect')
+def handle_connect(auth=None):
+    """
+    Handle client connection. A client that was connected before sends the
+    player token it was given in the handshake auth and keeps its player id.
+    """
+    claimed = player_tokens.verify(auth.get('player_token')) if isinstance(auth, dict) else None
+    session_id = claimed or session.get('session_id')
     if not session_id:
         session_id = str(uuid.uuid4())
-        session['session_id'] = session_id
+    session['session_id'] = session_id
+    player_sids[session_id] = request.sid
     
     logger.info(f"Client connected: {session_id}")
-    emit('connected', {'session_id': session_id})
+    emit('connected', {'session_id': session_id, 'player_token': player_tokens.issue(session_id)})
 
 @socketio.on('disconnect')
+@timed_socket_event('disconnect')
 def handle_disconnect():
     """Handle client disconnection."""
     session_id = session.get('session_id')
-    if session_id:
+    # A connection the player has already replaced (e.g. one timing out
+    # after they reconnected) must not mark them as gone
+    if session_id and player_sids.get(session_id) == request.sid:
+        del player_sids[session_id]
         # Update player connection status
         game_id = GameManager.get_player_game(session_id)
         if game_id:
@@ -272,13 +1048,21 @@ def handle_disconnect():
             if game:
                 game.set_player_connection_status(session_id, False)
                 # Notify other players
-                socketio.emit('player_disconnected', {
+                broadcast('player_disconnected', {
                     'player_id': session_id
                 }, room=game_id)
+                # The players still here may now be everyone, or a quorum
+                if game.phase == GamePhase.EVIDENCE_REVIEW:
+                    advance_if_ready(game, game.current_evidence_index)
         
+        matchmaking.cancel(session_id)
         logger.info(f"Client disconnected: {session_id}")
+    spectators.remove(request.sid)
 
 @socketio.on('join_game')
+@timed_socket_event('join_game')
+@profiler.profiled('join_game')
+@socket_rate_limited('join_game')
 def handle_join_game(data):
     """Handle player joining a game."""
     try:
@@ -293,6 +1077,11 @@ def handle_join_game(data):
             emit('error', {'message': 'Missing required fields'})
             return
         
+        is_admitted, error_msg = admission.can_admit_player(len(player_sessions))
+        if not is_admitted:
+            emit('join_failed', {'message': error_msg, 'code': 'server_busy'})
+            return
+        
         # Add player to game
         success = GameManager.add_player_to_game(
             game_id, session_id, player_name, guilt_tolerance, use_rating_scale
@@ -310,15 +1099,16 @@ def handle_join_game(data):
             emit('join_success', {
                 'game_id': game_id,
                 'player_id': session_id,
-                'game_state': game_state
+                'game_state': game_state,
+                'revision': room_events.revision(game_id)
             })
             
             # Notify other players
-            emit('player_joined', {
+            broadcast('player_joined', {
                 'player_id': session_id,
                 'player_name': player_name,
                 'game_state': game_state
-            }, room=game_id, include_self=False)
+            }, room=game_id, skip_sid=request.sid)
             
         else:
             emit('join_failed', {'message': 'Failed to join game'})
@@ -327,7 +1117,217 @@ def handle_join_game(data):
         logger.error(f"Error in join_game: {e}")
         emit('error', {'message': str(e)})
 
+@socketio.on('claim_seat')
+@timed_socket_event('claim_seat')
+@profiler.profiled('claim_seat')
+@socket_rate_limited('claim_seat')
+def handle_claim_seat(data):
+    """Handle a student taking the roster seat a classroom set up for them."""
+    try:
+        session_id = session.get('session_id')
+        seat_code = (data.get('seat_code') or '').strip()
+        
+        if not session_id or not seat_code:
+            emit('error', {'message': 'Missing required fields'})
+            return
+        
+        is_admitted, error_msg = admission.can_admit_player(len(player_sessions))
+        if not is_admitted:
+            emit('join_failed', {'message': error_msg, 'code': 'server_busy'})
+            return
+        
+        game = GameManager.claim_seat(seat_code, session_id)
+        if not game:
+            emit('join_failed', {'message': 'Unknown or already claimed seat code'})
+            return
+        
+        join_room(game.game_id)
+        game_state = game.get_game_state()
+        
+        emit('join_success', {
+            'game_id': game.game_id,
+            'player_id': session_id,
+            'game_state': game_state,
+            'revision': room_events.revision(game.game_id)
+        })
+        
+        broadcast('player_joined', {
+            'player_id': session_id,
+            'player_name': game.players[session_id].name,
+            'game_state': game_state
+        }, room=game.game_id, skip_sid=request.sid)
+    
+    except Exception as e:
+        logger.error(f"Error in claim_seat: {e}")
+        emit('error', {'message': str(e)})
+
+@socketio.on('enqueue_match')
+@timed_socket_event('enqueue_match')
+@profiler.profiled('enqueue_match')
+@socket_rate_limited('enqueue_match')
+def handle_enqueue_match(data):
+    """Handle a player asking to be matched into a new game of a case."""
+    try:
+        session_id = session.get('session_id')
+        case_file = data.get('case_file')
+        player_name = data.get('player_name')
+        guilt_tolerance = data.get('guilt_tolerance')
+        use_rating_scale = data.get('use_rating_scale', True)
+        
+        if not all([session_id, case_file, player_name, guilt_tolerance]):
+            emit('error', {'message': 'Missing required fields'})
+            return
+        
+        if session_id in player_sessions:
+            emit('match_failed', {'message': 'Leave your current game first'})
+            return
+        
+        is_admitted, error_msg = admission.can_admit_player(len(player_sessions) + len(matchmaking))
+        if not is_admitted:
+            emit('match_failed', {'message': error_msg, 'code': 'server_busy'})
+            return
+        
+        try:
+            # Same rules as a classroom roster entry, so tolerance is a whole number > 1
+            entry = parse_roster_entry({'name': player_name, 'tolerance': guilt_tolerance,
+                                        'rating_scale': use_rating_scale}, 'Match request')
+        except ValueError as e:
+            emit('match_failed', {'message': str(e)})
+            return
+        
+        if not case_file.startswith('case_files/'):
+            case_file = f'case_files/{case_file}'
+        try:
+            case_cache.get(case_file)
+        except (FileNotFoundError, ValueError) as e:
+            emit('match_failed', {'message': str(e)})
+            return
+        
+        start_matchmaker()
+        juries = matchmaking.enqueue(session_id, case_file, entry['name'], entry['guilt_tolerance'],
+                                     entry['use_rating_scale'], sid=request.sid)
+        emit('match_queued', {
+            'case_file': case_file,
+            'waiting': matchmaking.waiting(case_file),
+            'jury_size': matchmaking.jury_size,
+            'max_wait_seconds': matchmaking.max_wait
+        })
+        for jury in juries:
+            seat_jury(jury)
+    
+    except Exception as e:
+        logger.error(f"Error in enqueue_match: {e}")
+        emit('error', {'message': str(e)})
+
+@socketio.on('cancel_match')
+@timed_socket_event('cancel_match')
+@profiler.profiled('cancel_match')
+@socket_rate_limited('cancel_match')
+def handle_cancel_match():
+    """Handle a player leaving the matchmaking queue."""
+    try:
+        session_id = session.get('session_id')
+        if matchmaking.cancel(session_id):
+            emit('match_cancelled')
+    
+    except Exception as e:
+        logger.error(f"Error in cancel_match: {e}")
+        emit('error', {'message': str(e)})
+
+@socketio.on('rejoin_game')
+@timed_socket_event('rejoin_game')
+@profiler.profiled('rejoin_game')
+@socket_rate_limited('rejoin_game')
+def handle_rejoin_game(data):
+    """
+    Handle a player coming back after a dropped connection. The client
+    sends the last room revision it saw and gets only the events since then;
+    if those are no longer buffered it gets the full game state instead.
+    """
+    try:
+        session_id = session.get('session_id')
+        game_id = data.get('game_id')
+        last_revision = data.get('last_revision')
+        
+        if not session_id or not game_id or not isinstance(last_revision, int):
+            emit('error', {'message': 'Missing required fields'})
+            return
+        
+        game = GameManager.get_game(game_id)
+        if not game or GameManager.get_player_game(session_id) != game_id or session_id not in game.players:
+            emit('rejoin_failed', {'message': 'No seat in that game to return to'})
+            return
+        
+        game.set_player_connection_status(session_id, True)
+        join_room(game_id)
+        
+        missed = room_events.replay(game_id, last_revision)
+        payload = {
+            'game_id': game_id,
+            'player_id': session_id,
+            'player_state': game.get_player_state(session_id),
+            'revision': room_events.revision(game_id)
+        }
+        if missed is None:
+            payload['game_state'] = game.get_game_state()
+        else:
+            payload['events'] = [{'revision': revision, 'event': event, 'payload': event_payload}
+                                 for revision, event, event_payload in missed]
+        emit('rejoin_success', payload)
+        
+        broadcast('player_reconnected', {
+            'player_id': session_id
+        }, room=game_id, skip_sid=request.sid)
+    
+    except Exception as e:
+        logger.error(f"Error in rejoin_game: {e}")
+        emit('error', {'message': str(e)})
+
+@socketio.on('spectate_game')
+@timed_socket_event('spectate_game')
+@profiler.profiled('spectate_game')
+@socket_rate_limited('spectate_game')
+def handle_spectate_game(data):
+    """Handle an observer starting to watch a game without playing in it."""
+    try:
+        game_id = data.get('game_id')
+        game = GameManager.get_game(game_id) if game_id else None
+        if not game:
+            emit('spectate_failed', {'message': 'Game not found'})
+            return
+        
+        previous_game_id = spectators.add(request.sid, game_id)
+        if previous_game_id and previous_game_id != game_id:
+            leave_room(spectator_room(previous_game_id))
+        join_room(spectator_room(game_id))
+        
+        # The current frame is cached, so a crowd arriving at once shares one encode
+        emit('spectator_frame', spectator_frame(game))
+    
+    except Exception as e:
+        logger.error(f"Error in spectate_game: {e}")
+        emit('error', {'message': str(e)})
+
+@socketio.on('stop_spectating')
+@timed_socket_event('stop_spectating')
+@profiler.profiled('stop_spectating')
+@socket_rate_limited('stop_spectating')
+def handle_stop_spectating():
+    """Handle an observer leaving a game they were watching."""
+    try:
+        game_id = spectators.remove(request.sid)
+        if game_id:
+            leave_room(spectator_room(game_id))
+        emit('spectate_stopped')
+    
+    except Exception as e:
+        logger.error(f"Error in stop_spectating: {e}")
+        emit('error', {'message': str(e)})
+
 @socketio.on('leave_game')
+@timed_socket_event('leave_game')
+@profiler.profiled('leave_game')
+@socket_rate_limited('leave_game')
 def handle_leave_game():
     """Handle player leaving a game."""
     try:
@@ -347,7 +1347,7 @@ def handle_leave_game():
                 game_state = game.get_game_state()
                 
                 # Notify other players
-                emit('player_left', {
+                broadcast('player_left', {
                     'player_id': session_id,
                     'game_state': game_state
                 }, room=game_id)
@@ -359,6 +1359,9 @@ def handle_leave_game():
         emit('error', {'message': str(e)})
 
 @socketio.on('start_game')
+@timed_socket_event('start_game')
+@profiler.profiled('start_game')
+@socket_rate_limited('start_game')
 def handle_start_game(data):
     """Handle starting a game."""
     try:
@@ -377,10 +1380,11 @@ def handle_start_game(data):
         
         # Start the game
         if game.start_game():
+            game_index.update(game)
             game_state = game.get_game_state()
             
             # Notify all players
-            socketio.emit('game_started', {
+            broadcast('game_started', {
                 'game_state': game_state
             }, room=game_id)
         else:
@@ -391,6 +1395,9 @@ def handle_start_game(data):
         emit('error', {'message': str(e)})
 
 @socketio.on('advance_to_evidence')
+@timed_socket_event('advance_to_evidence')
+@profiler.profiled('advance_to_evidence')
+@socket_rate_limited('advance_to_evidence')
 def handle_advance_to_evidence(data):
     """Handle advancing from case presentation to evidence review."""
     try:
@@ -407,20 +1414,29 @@ def handle_advance_to_evidence(data):
             emit('error', {'message': 'You are not in this game'})
             return
         
-        # Advance to evidence review
-        game.advance_to_evidence_review()
-        game_state = game.get_game_state()
-        
-        # Notify all players
-        socketio.emit('evidence_phase_started', {
-            'game_state': game_state
-        }, room=game_id)
+        # Advance to evidence review; only the first request starts the clock
+        with game_lock(game_id):
+            if game.phase != GamePhase.CASE_PRESENTATION:
+                emit('error', {'message': 'Evidence review can only start once the case has been presented'})
+                return
+            game.advance_to_evidence_review()
+            evidence_timers.open(game_id, game.current_evidence_index)
+            game_index.update(game)
+            game_state = game.get_game_state()
+            
+            # Notify all players
+            broadcast('evidence_phase_started', {
+                'game_state': game_state
+            }, room=game_id)
     
     except Exception as e:
         logger.error(f"Error in advance_to_evidence: {e}")
         emit('error', {'message': str(e)})
 
 @socketio.on('submit_evidence_response')
+@timed_socket_event('submit_evidence_response')
+@profiler.profiled('submit_evidence_response')
+@socket_rate_limited('submit_evidence_response')
 def handle_submit_evidence_response(data):
     """Handle player submitting evidence response."""
     try:
@@ -443,43 +1459,33 @@ def handle_submit_evidence_response(data):
         innocent_rating = data.get('innocent_rating')
         
         # Submit response
-        success = game.submit_evidence_response(
-            session_id, prob_guilty, prob_innocent, guilty_rating, innocent_rating
-        )
+        with game_lock(game_id):
+            success = game.submit_evidence_response(
+                session_id, prob_guilty, prob_innocent, guilty_rating, innocent_rating
+            )
+            evidence_index = game.current_evidence_index
         
         if success:
             # Notify player of successful submission
             emit('response_submitted', {
-                'evidence_index': game.current_evidence_index
+                'evidence_index': evidence_index,
+                'db_update': game.players[session_id].responses[-1].db_update
             })
             
             # Get updated game state
             game_state = game.get_game_state()
             
             # Notify all players of response count update
-            socketio.emit('response_received', {
+            broadcast('response_received', {
                 'player_id': session_id,
                 'responses_received': len(game.responses_for_current_evidence),
                 'total_players': len([p for p in game.players.values() if p.is_connected]),
                 'all_responded': game.all_players_responded()
             }, room=game_id)
             
-            # If all players have responded, automatically advance
-            if game.all_players_responded():
-                has_more_evidence = game.advance_evidence()
-                game_state = game.get_game_state()
-                
-                if has_more_evidence:
-                    # Move to next evidence
-                    socketio.emit('evidence_completed', {
-                        'game_state': game_state,
-                        'next_evidence_index': game.current_evidence_index
-                    }, room=game_id)
-                else:
-                    # Move to verdict phase
-                    socketio.emit('all_evidence_completed', {
-                        'game_state': game_state
-                    }, room=game_id)
+            # If all players have responded, automatically advance;
+            # after the grace period a quorum of responses is enough
+            advance_if_ready(game, evidence_index)
         else:
             emit('error', {'message': 'Failed to submit response'})
     
@@ -488,6 +1494,9 @@ def handle_submit_evidence_response(data):
         emit('error', {'message': str(e)})
 
 @socketio.on('get_game_state')
+@timed_socket_event('get_game_state')
+@profiler.profiled('get_game_state')
+@socket_rate_limited('get_game_state')
 def handle_get_game_state(data):
     """Handle request for current game state."""
     try:
@@ -508,7 +1517,8 @@ def handle_get_game_state(data):
         
         emit('game_state_update', {
             'game_state': game_state,
-            'player_state': player_state
+            'player_state': player_state,
+            'revision': room_events.revision(game_id)
         })
     
     except Exception as e:
@@ -520,6 +1530,24 @@ def handle_get_game_state(data):
 # Admin Routes (for testing and management)
 # ============================================================================
 
+def _force_advance(game: BayesianGame):
+    """Move a game to its next phase on an admin's behalf and tell the room."""
+    has_more_evidence = True
+    with game_lock(game.game_id):
+        if game.phase == GamePhase.CASE_PRESENTATION:
+            game.advance_to_evidence_review()
+            evidence_timers.open(game.game_id, game.current_evidence_index)
+            game_index.update(game)
+        elif game.phase == GamePhase.EVIDENCE_REVIEW:
+            has_more_evidence = score_evidence(game)
+        
+        broadcast('admin_force_advance', {
+            'game_state': game.get_game_state()
+        }, room=game.game_id)
+    
+    if not has_more_evidence:
+        lifecycle.archive_game(game)
+
 @app.route('/api/admin/games/<game_id>', methods=['DELETE'])
 def admin_delete_game(game_id):
     """Admin endpoint to delete a game."""
@@ -527,7 +1555,7 @@ def admin_delete_game(game_id):
         success = GameManager.delete_game(game_id)
         if success:
             # Notify players that game was deleted
-            socketio.emit('game_deleted', {'game_id': game_id}, room=game_id)
+            broadcast('game_deleted', {'game_id': game_id}, room=game_id)
             return jsonify({'success': True})
         else:
             return jsonify({'success': False, 'error': 'Game not found'}), 404
@@ -543,23 +1571,124 @@ def admin_force_advance(game_id):
         if not game:
             return jsonify({'success': False, 'error': 'Game not found'}), 404
         
-        if game.phase == GamePhase.CASE_PRESENTATION:
-            game.advance_to_evidence_review()
-        elif game.phase == GamePhase.EVIDENCE_REVIEW:
-            game.advance_evidence()
-        
-        game_state = game.get_game_state()
-        
-        # Notify all players
-        socketio.emit('admin_force_advance', {
-            'game_state': game_state
-        }, room=game_id)
-        
+        _force_advance(game)
         return jsonify({'success': True, 'new_phase': game.phase.value})
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/admin/games/bulk', methods=['POST'])
+def admin_bulk_games():
+    """Delete or force-advance many games: {"action": "delete"|"force_advance", "game_ids": [...]}."""
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    game_ids = data.get('game_ids')
+    if action not in ('delete', 'force_advance'):
+        return jsonify({'success': False, 'error': "action must be 'delete' or 'force_advance'"}), 400
+    if not isinstance(game_ids, list) or not game_ids:
+        return jsonify({'success': False, 'error': 'game_ids must be a non-empty list'}), 400
+    if len(game_ids) > BULK_ADMIN_MAX_GAMES:
+        return jsonify({'success': False, 'error': f'At most {BULK_ADMIN_MAX_GAMES} games per request'}), 400
+    
+    results = {}
+    for game_id in dict.fromkeys(map(str, game_ids)):
+        try:
+            if action == 'delete':
+                if GameManager.delete_game(game_id):
+                    broadcast('game_deleted', {'game_id': game_id}, room=game_id)
+                    results[game_id] = {'success': True}
+                else:
+                    results[game_id] = {'success': False, 'error': 'Game not found'}
+            else:
+                game = GameManager.get_game(game_id)
+                if not game:
+                    results[game_id] = {'success': False, 'error': 'Game not found'}
+                    continue
+                _force_advance(game)
+                results[game_id] = {'success': True, 'new_phase': game.phase.value}
+        except Exception as e:
+            results[game_id] = {'success': False, 'error': str(e)}
+    
+    return jsonify({
+        'success': True,
+        'succeeded': sum(1 for result in results.values() if result['success']),
+        'results': results
+    })
+
+@app.route('/api/admin/profile', methods=['GET'])
+def admin_profile_status():
+    """Admin endpoint to see the running profile session and finished reports."""
+    return jsonify({'success': True, 'profiling': profiler.status()})
+
+@app.route('/api/admin/profile', methods=['POST'])
+def admin_start_profile():
+    """
+    Admin endpoint to profile socket handlers for N seconds and/or N calls.
+    Body: {"events": [...], "mode": "cprofile"|"sampling", "seconds": N, "calls": N}
+    """
+    try:
+        data = request.get_json() or {}
+        events = data.get('events') or ['submit_evidence_response', 'join_game', 'get_game_state']
+        unknown = [event for event in events if event not in PROFILED_EVENTS]
+        if unknown:
+            return jsonify({
+                'success': False,
+                'error': f"Cannot profile {unknown}; choose from {list(PROFILED_EVENTS)}"
+            }), 400
+        
+        session_info = profiler.start(
+            events,
+            mode=data.get('mode', 'cprofile'),
+            seconds=data.get('seconds'),
+            calls=data.get('calls'),
+            sample_interval=data.get('sample_interval', 0.005)
+        )
+        return jsonify({'success': True, 'session': session_info})
+    
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/admin/profile', methods=['DELETE'])
+def admin_stop_profile():
+    """Admin endpoint to stop the running profile session early."""
+    report = profiler.stop()
+    if report is None:
+        return jsonify({'success': False, 'error': 'No profiling session is running'}), 404
+    return jsonify({'success': True, 'report': report})
+
+@app.route('/api/admin/profiles/<profile_id>/download')
+def admin_download_profile(profile_id):
+    """Admin endpoint to download a profile report (?format=txt|prof|collapsed)."""
+    path = profiler.report_path(profile_id, request.args.get('format', 'txt'))
+    if not path or not os.path.exists(path):
+        return jsonify({'success': False, 'error': 'Profile report not found'}), 404
+    return send_file(os.path.abspath(path), as_attachment=True)
+
+@app.route('/api/admin/results/games/<game_id>')
+def admin_archived_game(game_id):
+    """Admin endpoint to fetch one game's results from the compressed archive."""
+    if result_archive is None:
+        return jsonify({'success': False, 'error': 'Result archive is not enabled'}), 404
+    results = result_archive.get(game_id)
+    if results is None:
+        return jsonify({'success': False, 'error': 'Game not found in archive'}), 404
+    return jsonify({'success': True, 'results': results})
+
+@app.route('/api/admin/results/cases')
+def admin_results_cases():
+    """Admin endpoint to summarize stored game results per case."""
+    return jsonify({'success': True, 'cases': results_store.case_summary()})
+
+@app.route('/api/admin/results/cases/<case_key>/evidence')
+def admin_results_evidence(case_key):
+    """Admin endpoint for mean player dB per evidence item of a case."""
+    evidence = results_store.evidence_summary(case_key)
+    if not evidence:
+        return jsonify({'success': False, 'error': 'No stored results for this case'}), 404
+    return jsonify({'success': True, 'case_key': case_key, 'evidence': evidence})
+
 
 # ============================================================================
 # Error Handlers
@@ -590,6 +1719,7 @@ if __name__ == '__main__':
     print("  GET  /api/games            - List active games")
     print("  POST /api/games            - Create new game")
     print("  GET  /api/games/<id>       - Get game info")
+    print("  GET  /metrics              - Prometheus metrics")
     print("\nWebSocket events:")
     print("  join_game, leave_game, start_game")
     print("  advance_to_evidence, submit_evidence_response")
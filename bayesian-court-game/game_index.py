@@ -0,0 +1,147 @@
+# game_index.py
+"""
+Secondary index over the server's active games for listing and admin.
+
+Each game's list entry is built once when the game changes rather than on
+every request, and game ids are kept in creation order per phase, per
+case and per joinability. A filtered page walks the smallest matching
+bucket from the cursor, so listing costs O(log n + page size) instead of
+a pass over every game.
+"""
+
+import bisect
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from bayesian_core import BayesianGame, GamePhase
+
+MAX_PAGE_SIZE = 200
+
+
+def game_summary(game: BayesianGame) -> Dict:
+    """The list entry for a game, as returned by /api/games."""
+    return {
+        'game_id': game.game_id,
+        'case_name': game.case_data.case_info['name'],
+        'case_key': os.path.splitext(os.path.basename(game.case_data.case_file))[0],
+        'phase': game.phase.value,
+        'player_count': len(game.players),
+        'max_players': game.max_players,
+        'created_at': game.created_at.isoformat(),
+        'can_join': len(game.players) < game.max_players and game.phase == GamePhase.SETUP
+    }
+
+
+def encode_cursor(sort_key: Tuple[str, str]) -> str:
+    return f"{sort_key[0]}|{sort_key[1]}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    created_at, separator, game_id = cursor.partition('|')
+    if not separator or not game_id:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return created_at, game_id
+
+
+class GameIndex:
+    """Game summaries kept sorted by creation time, bucketed by phase, case and joinability."""
+
+    def __init__(self):
+        self._summaries: Dict[str, Dict] = {}
+        self._sort_keys: Dict[str, Tuple[str, str]] = {}
+        # ('all', None) / ('phase', value) / ('case', case_key) / ('joinable', bool) -> sorted keys
+        self._buckets: Dict[Tuple[str, object], List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._summaries
+
+    @staticmethod
+    def _bucket_names(summary: Dict) -> List[Tuple[str, object]]:
+        return [('all', None), ('phase', summary['phase']), ('case', summary['case_key']),
+                ('joinable', summary['can_join'])]
+
+    def update(self, game: BayesianGame):
+        """Add a game or re-index it after its phase or players changed."""
+        summary = game_summary(game)
+        with self._lock:
+            previous = self._summaries.get(game.game_id)
+            sort_key = self._sort_keys.get(game.game_id) or (summary['created_at'], game.game_id)
+            old_buckets = set(self._bucket_names(previous)) if previous else set()
+            new_buckets = set(self._bucket_names(summary))
+            for name in old_buckets - new_buckets:
+                self._discard(name, sort_key)
+            for name in new_buckets - old_buckets:
+                bisect.insort(self._buckets.setdefault(name, []), sort_key)
+            self._summaries[game.game_id] = summary
+            self._sort_keys[game.game_id] = sort_key
+
+    def remove(self, game_id: str) -> bool:
+        with self._lock:
+            summary = self._summaries.pop(game_id, None)
+            if summary is None:
+                return False
+            sort_key = self._sort_keys.pop(game_id)
+            for name in self._bucket_names(summary):
+                self._discard(name, sort_key)
+            return True
+
+    def get(self, game_id: str) -> Optional[Dict]:
+        summary = self._summaries.get(game_id)
+        return dict(summary) if summary else None
+
+    def phase_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {phase.value: len(self._buckets.get(('phase', phase.value), ())) for phase in GamePhase}
+
+    def query(self, phase: str = None, case: str = None, joinable: bool = None,
+              cursor: str = None, limit: int = 50) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get up to limit games matching every given filter, oldest first,
+        starting after cursor. Returns (summaries, next cursor or None).
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        after = decode_cursor(cursor) if cursor else None
+        filters = [name for name in (('phase', phase), ('case', case), ('joinable', joinable))
+                   if name[1] is not None]
+
+        with self._lock:
+            buckets = [self._buckets.get(name, []) for name in filters] or [self._buckets.get(('all', None), [])]
+            # Walk the smallest bucket and check the remaining filters on each entry
+            keys = min(buckets, key=len)
+            start = bisect.bisect_right(keys, after) if after else 0
+
+            page = []
+            position = start
+            while position < len(keys) and len(page) < limit:
+                summary = self._summaries[keys[position][1]]
+                if all(self._matches(summary, name) for name in filters):
+                    page.append(dict(summary))
+                position += 1
+
+            # A full page that stopped before the end of the bucket may have more after it
+            next_cursor = encode_cursor(keys[position - 1]) if len(page) == limit and position < len(keys) else None
+        return page, next_cursor
+
+    @staticmethod
+    def _matches(summary: Dict, name: Tuple[str, object]) -> bool:
+        field, value = name
+        if field == 'phase':
+            return summary['phase'] == value
+        if field == 'case':
+            return summary['case_key'] == value
+        return summary['can_join'] == value
+
+    def _discard(self, name: Tuple[str, object], sort_key: Tuple[str, str]):
+        keys = self._buckets.get(name)
+        if not keys:
+            return
+        position = bisect.bisect_left(keys, sort_key)
+        if position < len(keys) and keys[position] == sort_key:
+            del keys[position]
+        if not keys:
+            del self._buckets[name]
@@ -0,0 +1,203 @@
+# game_lifecycle.py
+"""
+Lifecycle management for active games on the web server.
+Tracks game activity, expires idle games per phase, caps the number of
+games held in memory and archives finished games before dropping them.
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from bayesian_core import BayesianGame, GamePhase
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds a game may sit idle in each phase before it is evicted
+DEFAULT_PHASE_TTLS = {
+    GamePhase.SETUP: 30 * 60,
+    GamePhase.CASE_PRESENTATION: 60 * 60,
+    GamePhase.EVIDENCE_REVIEW: 2 * 60 * 60,
+    GamePhase.VERDICT: 15 * 60,
+    GamePhase.COMPLETED: 5 * 60,
+}
+
+# Phases whose results are written to disk before the game is dropped
+ARCHIVED_PHASES = (GamePhase.VERDICT, GamePhase.COMPLETED)
+
+
+class GameLifecycleManager:
+    """
+    Owns eviction for the server's game and session tables.
+
+    Games are kept in least-recently-used order, so idle sweeps only look
+    at the oldest entries and the game-count cap evicts from the front.
+    A reverse index of game -> sessions lets a dropped game clear its
+    player sessions without scanning the whole session table.
+    """
+
+    def __init__(self, games: Dict[str, BayesianGame], sessions: Dict[str, str],
+                 archive_dir: str = 'game_results', max_games: int = 1000,
+                 phase_ttls: Optional[Dict[GamePhase, float]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 on_archived: Optional[Callable[[BayesianGame, str, float], None]] = None,
+                 writer=None, case_store=None,
+                 on_dropped: Optional[Callable[[str, BayesianGame], None]] = None):
+        self.games = games
+        self.sessions = sessions
+        self.archive_dir = archive_dir
+        self.max_games = max_games
+        self.phase_ttls = dict(DEFAULT_PHASE_TTLS)
+        if phase_ttls:
+            self.phase_ttls.update(phase_ttls)
+        self.clock = clock
+        # Called with (game, filename, seconds taken) after each archive
+        self.on_archived = on_archived
+        # Optional background ResultWriter; archives are written synchronously without one
+        self.writer = writer
+        # Optional CaseStore; archived results then reference their case by hash
+        self.case_store = case_store
+        # Called with (game_id, game) after a game leaves the active table
+        self.on_dropped = on_dropped
+
+        self._last_activity: "OrderedDict[str, float]" = OrderedDict()
+        self._game_sessions: Dict[str, Set[str]] = {}
+        self._archived: Set[str] = set()
+        self._lock = threading.RLock()
+
+    def register_game(self, game_id: str, game: BayesianGame) -> List[str]:
+        """
+        Add a game to the active table, evicting least recently used games
+        if the cap would be exceeded. Returns the ids of evicted games.
+        """
+        with self._lock:
+            evicted = []
+            while len(self.games) >= self.max_games and self._last_activity:
+                oldest_id = next(iter(self._last_activity))
+                self.drop_game(oldest_id)
+                evicted.append(oldest_id)
+
+            self.games[game_id] = game
+            self._last_activity[game_id] = self.clock()
+            self._game_sessions[game_id] = set()
+            return evicted
+
+    def touch(self, game_id: str):
+        """Record activity on a game, moving it to the back of the LRU order."""
+        with self._lock:
+            if game_id in self._last_activity:
+                self._last_activity[game_id] = self.clock()
+                self._last_activity.move_to_end(game_id)
+
+    def add_session(self, game_id: str, session_id: str):
+        """Map a player session to a game."""
+        with self._lock:
+            previous_game_id = self.sessions.get(session_id)
+            if previous_game_id and previous_game_id in self._game_sessions:
+                self._game_sessions[previous_game_id].discard(session_id)
+
+            self.sessions[session_id] = game_id
+            self._game_sessions.setdefault(game_id, set()).add(session_id)
+
+    def remove_session(self, session_id: str) -> Optional[str]:
+        """Remove a player session. Returns the game_id it pointed at."""
+        with self._lock:
+            game_id = self.sessions.pop(session_id, None)
+            if game_id and game_id in self._game_sessions:
+                self._game_sessions[game_id].discard(session_id)
+            return game_id
+
+    def get_sessions(self, game_id: str) -> Set[str]:
+        """Get the player sessions attached to a game."""
+        with self._lock:
+            return set(self._game_sessions.get(game_id, ()))
+
+    def drop_game(self, game_id: str, archive: bool = True) -> bool:
+        """
+        Remove a game and every session pointing at it.
+        Finished games are archived first unless archive is False.
+        """
+        with self._lock:
+            game = self.games.pop(game_id, None)
+            self._last_activity.pop(game_id, None)
+            already_archived = game_id in self._archived
+            self._archived.discard(game_id)
+            for session_id in self._game_sessions.pop(game_id, ()):
+                if self.sessions.get(session_id) == game_id:
+                    del self.sessions[session_id]
+
+        if game is None:
+            return False
+
+        if archive and game.phase in ARCHIVED_PHASES and not already_archived:
+            self.archive_game(game)
+        if self.on_dropped:
+            self.on_dropped(game_id, game)
+        return True
+
+    def archive_game(self, game: BayesianGame) -> Optional[str]:
+        """
+        Write a game's results into the archive directory. A game is only
+        archived once, however often this is called.
+        """
+        with self._lock:
+            if game.game_id in self._archived:
+                return None
+            if game.game_id in self.games:
+                self._archived.add(game.game_id)
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base = os.path.splitext(os.path.basename(game.case_data.case_file))[0]
+            filename = os.path.join(
+                self.archive_dir, f"{base}_results_{game.game_id}_{timestamp}.json"
+            )
+            started = time.perf_counter()
+            game.save_game_results(filename, writer=self.writer, case_store=self.case_store)
+            if self.on_archived:
+                self.on_archived(game, filename, time.perf_counter() - started)
+            logger.info(f"Archived game {game.game_id} to {filename}")
+            return filename
+        except Exception as e:
+            logger.error(f"Error archiving game {game.game_id}: {e}")
+            return None
+
+    def expired_games(self) -> List[str]:
+        """Get ids of games that have been idle longer than their phase TTL."""
+        now = self.clock()
+        shortest_ttl = min(self.phase_ttls.values())
+        expired = []
+
+        with self._lock:
+            for game_id, last_activity in self._last_activity.items():
+                idle = now - last_activity
+                # Entries are in activity order, so nothing later can be older
+                if idle < shortest_ttl:
+                    break
+                game = self.games.get(game_id)
+                if game is None or idle >= self.phase_ttls.get(game.phase, shortest_ttl):
+                    expired.append(game_id)
+
+        return expired
+
+    def sweep(self) -> List[str]:
+        """Drop every expired game. Returns the ids of evicted games."""
+        expired = self.expired_games()
+        for game_id in expired:
+            self.drop_game(game_id)
+            logger.info(f"Evicted idle game {game_id}")
+        return expired
+
+    def stats(self) -> Dict:
+        """Get a summary of tracked games and sessions."""
+        with self._lock:
+            return {
+                'active_games': len(self.games),
+                'player_sessions': len(self.sessions),
+                'max_games': self.max_games,
+            }
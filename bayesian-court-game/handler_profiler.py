@@ -0,0 +1,311 @@
+# handler_profiler.py
+"""
+On-demand profiling of socket event handlers.
+
+An admin starts a profiling session for selected events, limited to a
+number of seconds and/or calls. Handlers run under cProfile, or are
+watched by a low-overhead stack sampler, and the aggregated stats are
+written to disk when the session ends. With no session running, the
+wrapper around each handler costs one attribute check.
+
+Sampling reads sys._current_frames(), which only sees OS threads. Under
+eventlet or gevent every handler runs in a green thread on the hub's OS
+thread, so the sampler would only ever record the hub; sampling is
+refused in those modes and cProfile must be used instead.
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+PROFILE_MODES = ('cprofile', 'sampling')
+GREEN_THREAD_MODES = ('eventlet', 'gevent', 'gevent_uwsgi')
+
+
+def green_threads_patched() -> bool:
+    """Whether eventlet or gevent has monkey-patched threading in this process."""
+    eventlet_patcher = sys.modules.get('eventlet.patcher')
+    if eventlet_patcher is not None and eventlet_patcher.is_monkey_patched('thread'):
+        return True
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    return gevent_monkey is not None and gevent_monkey.is_module_patched('threading')
+
+
+class ProfileSession:
+    """State for one running profiling session."""
+
+    def __init__(self, events: Iterable[str], mode: str, seconds: Optional[float],
+                 calls: Optional[int], sample_interval: float):
+        self.profile_id = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.events = frozenset(events)
+        self.mode = mode
+        self.seconds = seconds
+        self.max_calls = calls
+        self.sample_interval = sample_interval
+        self.started_at = datetime.now()
+        self.deadline = time.monotonic() + seconds if seconds else None
+        self.calls = 0
+        self.calls_by_event: Counter = Counter()
+        self.skipped_calls = 0
+
+        # cProfile mode: one profiler, entered by one handler at a time
+        self.profile = cProfile.Profile() if mode == 'cprofile' else None
+        self.profile_lock = threading.Lock()
+
+        # Sampling mode: threads currently inside a profiled handler
+        self.active_threads: Dict[int, str] = {}
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+
+    def info(self) -> Dict:
+        return {
+            'profile_id': self.profile_id,
+            'mode': self.mode,
+            'events': sorted(self.events),
+            'seconds': self.seconds,
+            'max_calls': self.max_calls,
+            'started_at': self.started_at.isoformat(),
+            'calls': self.calls,
+            'calls_by_event': dict(self.calls_by_event),
+            'skipped_calls': self.skipped_calls,
+        }
+
+
+class HandlerProfiler:
+    """Wraps handlers and runs at most one profiling session at a time."""
+
+    def __init__(self, output_dir: str = 'profiles', max_reports: int = 50, async_mode: str = None):
+        self.output_dir = output_dir
+        self.max_reports = max_reports
+        # The server's Socket.IO async mode; sampling is unavailable in green-thread modes
+        self.async_mode = async_mode
+        self._session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._finisher: Optional[threading.Thread] = None
+        self.reports: List[Dict] = []
+
+    @property
+    def active(self) -> bool:
+        return self._session is not None
+
+    def profiled(self, event: str):
+        """Decorator that profiles a handler while a session selects its event."""
+        def decorator(handler: Callable):
+            @functools.wraps(handler)
+            def wrapper(*args, **kwargs):
+                session = self._session
+                if session is None or event not in session.events:
+                    return handler(*args, **kwargs)
+                return self._run_profiled(session, event, handler, args, kwargs)
+            return wrapper
+        return decorator
+
+    def start(self, events: Iterable[str], mode: str = 'cprofile', seconds: float = None,
+              calls: int = None, sample_interval: float = 0.005) -> Dict:
+        """
+        Start a profiling session.
+        Raises ValueError for bad arguments or if a session is already running.
+        """
+        events = list(events)
+        if not events:
+            raise ValueError("At least one event must be selected")
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        if not seconds and not calls:
+            raise ValueError("Either seconds or calls must be given")
+        try:
+            seconds = float(seconds) if seconds else None
+            calls = int(calls) if calls else None
+            sample_interval = float(sample_interval)
+        except (TypeError, ValueError):
+            raise ValueError("seconds, calls and sample_interval must be numbers")
+        if (seconds is not None and seconds <= 0) or (calls is not None and calls <= 0) or sample_interval <= 0:
+            raise ValueError("seconds, calls and sample_interval must be positive")
+        if mode == 'sampling' and (self.async_mode in GREEN_THREAD_MODES or green_threads_patched()):
+            raise ValueError("Sampling cannot see green threads (eventlet/gevent); use cprofile mode")
+
+        with self._lock:
+            if self._session is not None:
+                raise ValueError(f"Profiling session {self._session.profile_id} is already running")
+            session = ProfileSession(events, mode, seconds, calls, sample_interval)
+            self._session = session
+
+        if seconds:
+            self._timer = threading.Timer(seconds, self._stop_session, args=(session,))
+            self._timer.daemon = True
+            self._timer.start()
+        if mode == 'sampling':
+            self._sampler = threading.Thread(target=self._sample_loop, args=(session,), daemon=True)
+            self._sampler.start()
+
+        logger.info(f"Started {mode} profiling {session.profile_id} for {events}")
+        return session.info()
+
+    def stop(self) -> Optional[Dict]:
+        """Stop the running session and write its report. Returns the report info."""
+        session = self._session
+        if session is None:
+            return None
+        return self._stop_session(session)
+
+    def status(self) -> Dict:
+        session = self._session
+        return {
+            'active': session is not None,
+            'session': session.info() if session else None,
+            'reports': list(self.reports),
+        }
+
+    def wait(self, timeout: float = None):
+        """Wait for a report being written in the background to finish."""
+        finisher = self._finisher
+        if finisher is not None:
+            finisher.join(timeout)
+
+    def report_path(self, profile_id: str, kind: str) -> Optional[str]:
+        """Get the path of a written report file ('txt', 'prof' or 'collapsed')."""
+        for report in self.reports:
+            if report['profile_id'] == profile_id:
+                return report['files'].get(kind)
+        return None
+
+    def _run_profiled(self, session: ProfileSession, event: str, handler: Callable, args, kwargs):
+        session.calls += 1
+        session.calls_by_event[event] += 1
+
+        try:
+            if session.mode == 'cprofile':
+                # Handlers may interleave; only one can run under the profiler at once
+                if not session.profile_lock.acquire(blocking=False):
+                    session.skipped_calls += 1
+                    return handler(*args, **kwargs)
+                try:
+                    session.profile.enable()
+                    try:
+                        return handler(*args, **kwargs)
+                    finally:
+                        session.profile.disable()
+                finally:
+                    session.profile_lock.release()
+            else:
+                thread_id = threading.get_ident()
+                session.active_threads[thread_id] = event
+                try:
+                    return handler(*args, **kwargs)
+                finally:
+                    session.active_threads.pop(thread_id, None)
+        finally:
+            limit_reached = ((session.max_calls and session.calls >= session.max_calls)
+                             or (session.deadline and time.monotonic() >= session.deadline))
+            # Write the report off the handler's request path
+            if limit_reached and self._detach(session):
+                self._finisher = threading.Thread(target=self._finish_session, args=(session,), daemon=True)
+                self._finisher.start()
+
+    def _sample_loop(self, session: ProfileSession):
+        while self._session is session:
+            time.sleep(session.sample_interval)
+            frames = sys._current_frames()
+            for thread_id, event in list(session.active_threads.items()):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(event)
+                session.samples[tuple(reversed(stack))] += 1
+                session.sample_count += 1
+
+    def _detach(self, session: ProfileSession) -> bool:
+        """End a session so no new calls are profiled. False if it already ended."""
+        with self._lock:
+            if self._session is not session:
+                return False
+            self._session = None
+            return True
+
+    def _stop_session(self, session: ProfileSession) -> Optional[Dict]:
+        if not self._detach(session):
+            return None
+        return self._finish_session(session)
+
+    def _finish_session(self, session: ProfileSession) -> Optional[Dict]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Let the sampler and any handler still inside the profiler finish
+        if self._sampler is not None:
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+        if session.profile is not None:
+            with session.profile_lock:
+                pass
+
+        try:
+            report = self._write_report(session)
+        except Exception as e:
+            logger.error(f"Error writing profile {session.profile_id}: {e}")
+            return None
+
+        self.reports.append(report)
+        del self.reports[:-self.max_reports]
+        logger.info(f"Finished profiling {session.profile_id} after {session.calls} calls")
+        return report
+
+    def _write_report(self, session: ProfileSession) -> Dict:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, session.profile_id)
+        files = {}
+        summary = io.StringIO()
+
+        summary.write(f"Profile {session.profile_id} ({session.mode})\n")
+        summary.write(f"Events: {', '.join(sorted(session.events))}\n")
+        summary.write(f"Calls: {dict(session.calls_by_event)} (skipped {session.skipped_calls})\n\n")
+
+        if session.mode == 'cprofile':
+            files['prof'] = f"{base}.prof"
+            session.profile.dump_stats(files['prof'])
+            if session.calls > session.skipped_calls:
+                stats = pstats.Stats(session.profile, stream=summary)
+                stats.sort_stats('cumulative').print_stats(50)
+        else:
+            files['collapsed'] = f"{base}.collapsed.txt"
+            with open(files['collapsed'], 'w') as file:
+                for stack, count in session.samples.most_common():
+                    file.write(f"{';'.join(stack)} {count}\n")
+
+            # Self time: how often each function was the innermost frame
+            leaf_counts: Counter = Counter()
+            for stack, count in session.samples.items():
+                leaf_counts[stack[-1]] += count
+            summary.write(f"Samples: {session.sample_count} every {session.sample_interval}s\n\n")
+            for function, count in leaf_counts.most_common(50):
+                share = count / session.sample_count * 100 if session.sample_count else 0
+                summary.write(f"{share:6.1f}%  {count:6d}  {function}\n")
+
+        files['txt'] = f"{base}.txt"
+        with open(files['txt'], 'w') as file:
+            file.write(summary.getvalue())
+
+        report = session.info()
+        report['finished_at'] = datetime.now().isoformat()
+        report['files'] = files
+        return report
@@ -0,0 +1,183 @@
+# leaderboard.py
+"""
+Cross-game leaderboard of juror calibration.
+
+Entries are ordered by score (lower is better, e.g. mean absolute dB
+error) in an indexable skip list. Each link records how many entries it
+skips, so changing a score, looking up a rank and jumping to a rank are
+O(log n), and reading the top k costs O(log n + k). That keeps live
+standings cheap to recompute after every evidence item, even with
+hundreds of jurors.
+"""
+
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+
+MAX_LEVEL = 32
+LEVEL_PROBABILITY = 0.25
+
+
+class _Node:
+    __slots__ = ('sort_key', 'info', 'forward', 'span')
+
+    def __init__(self, sort_key: Optional[Tuple[float, str]], info: Optional[Dict], level: int):
+        self.sort_key = sort_key
+        self.info = info
+        self.forward: List[Optional['_Node']] = [None] * level
+        self.span: List[int] = [0] * level
+
+
+class Leaderboard:
+    """Ranked entries keyed by a unique string; ties are broken by key."""
+
+    def __init__(self, seed: int = None):
+        self._head = _Node(None, None, MAX_LEVEL)
+        self._level = 1
+        self._length = 0
+        self._nodes: Dict[str, _Node] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._nodes
+
+    def update(self, key: str, score: float, **info) -> int:
+        """Set an entry's score (and display info). Returns its new 1-based rank."""
+        with self._lock:
+            node = self._nodes.pop(key, None)
+            if node is not None:
+                self._delete(node.sort_key)
+            sort_key = (score, key)
+            node = self._insert(sort_key, dict(info, key=key, score=score))
+            self._nodes[key] = node
+            return self._rank(sort_key)
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            node = self._nodes.pop(key, None)
+            if node is None:
+                return False
+            self._delete(node.sort_key)
+            return True
+
+    def rank(self, key: str) -> Optional[int]:
+        """Get an entry's 1-based rank, or None if it is not on the board."""
+        with self._lock:
+            node = self._nodes.get(key)
+            return self._rank(node.sort_key) if node is not None else None
+
+    def ranks(self, keys: List[str]) -> Dict[str, Optional[int]]:
+        """Get the ranks of several entries under one lock."""
+        with self._lock:
+            return {key: self._rank(self._nodes[key].sort_key) if key in self._nodes else None
+                    for key in keys}
+
+    def top(self, count: int = 10) -> List[Dict]:
+        """Get the best entries, each with its rank."""
+        return self.page(1, count)
+
+    def page(self, start_rank: int, count: int) -> List[Dict]:
+        """Get up to count entries starting at a 1-based rank."""
+        with self._lock:
+            if start_rank < 1 or count <= 0:
+                return []
+            node = self._node_at(start_rank)
+            entries = []
+            rank = start_rank
+            while node is not None and len(entries) < count:
+                entries.append(dict(node.info, rank=rank))
+                node = node.forward[0]
+                rank += 1
+            return entries
+
+    def around(self, key: str, radius: int = 2) -> List[Dict]:
+        """Get an entry and its neighbours above and below."""
+        rank = self.rank(key)
+        if rank is None:
+            return []
+        start = max(1, rank - radius)
+        return self.page(start, rank - start + radius + 1)
+
+    # ------------------------------------------------------------------
+    # Skip list internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self._random.random() < LEVEL_PROBABILITY:
+            level += 1
+        return level
+
+    def _insert(self, sort_key: Tuple[float, str], info: Dict) -> _Node:
+        update = [self._head] * MAX_LEVEL
+        rank = [0] * MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            rank[i] = 0 if i == self._level - 1 else rank[i + 1]
+            while node.forward[i] is not None and node.forward[i].sort_key < sort_key:
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                rank[i] = 0
+                update[i] = self._head
+                self._head.span[i] = self._length
+            self._level = level
+
+        new_node = _Node(sort_key, info, level)
+        for i in range(level):
+            new_node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new_node
+            new_node.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self._level):
+            update[i].span[i] += 1
+
+        self._length += 1
+        return new_node
+
+    def _delete(self, sort_key: Tuple[float, str]):
+        update = [self._head] * MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].sort_key < sort_key:
+                node = node.forward[i]
+            update[i] = node
+
+        target = node.forward[0]
+        for i in range(self._level):
+            if update[i].forward[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].span[i] -= 1
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._length -= 1
+
+    def _rank(self, sort_key: Tuple[float, str]) -> int:
+        rank = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].sort_key <= sort_key:
+                rank += node.span[i]
+                node = node.forward[i]
+        return rank
+
+    def _node_at(self, rank: int) -> Optional[_Node]:
+        traversed = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and traversed + node.span[i] <= rank:
+                traversed += node.span[i]
+                node = node.forward[i]
+            if traversed == rank:
+                return node
+        return None
@@ -0,0 +1,416 @@
+# load_generator.py
+"""
+Load generator for the Bayesian Court Game server.
+
+Runs many headless jurors against a locally started server. Each simulated
+game is created through POST /api/games, its jurors join over Socket.IO,
+the first juror starts the game and opens evidence review, and every juror
+answers each piece of evidence after a log-normal think time.
+
+The key latency is measured per evidence round: from the moment the last
+juror submits to the moment that juror receives 'evidence_completed' (or
+'all_evidence_completed'), i.e. the time the server takes to process the
+final response, advance the game and broadcast the new state.
+
+Usage:
+    python load_generator.py --games 5,10,25,50 --jurors 12
+    python load_generator.py --spawn-server --games 100 --max-p95-ms 250
+
+Requires: python-socketio[asyncio_client], aiohttp
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import socketio
+
+
+COMPLETION_EVENTS = ('evidence_completed', 'all_evidence_completed')
+
+# Same mapping the browser client and BayesianCalculator use
+RATING_TO_PROBABILITY = {
+    0: 0.001, 1: 0.02, 2: 0.1, 3: 0.2, 4: 0.35, 5: 0.5,
+    6: 0.65, 7: 0.8, 8: 0.9, 9: 0.98, 10: 0.999,
+}
+
+
+@dataclass
+class LevelResult:
+    """Aggregated measurements for one concurrency level."""
+    games: int
+    jurors_per_game: int
+    duration_seconds: float = 0.0
+    games_completed: int = 0
+    rounds_completed: int = 0
+    submits: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    advance_latencies_ms: List[float] = field(default_factory=list)
+    ack_latencies_ms: List[float] = field(default_factory=list)
+
+    @property
+    def error_rate(self) -> float:
+        attempted = self.submits + self.errors + self.timeouts
+        return (self.errors + self.timeouts) / attempted if attempted else 0.0
+
+    def summary(self) -> Dict:
+        """Get throughput and latency percentiles for reporting."""
+        advance = sorted(self.advance_latencies_ms)
+        ack = sorted(self.ack_latencies_ms)
+        duration = self.duration_seconds or 1e-9
+        return {
+            'games': self.games,
+            'jurors_per_game': self.jurors_per_game,
+            'duration_seconds': round(self.duration_seconds, 2),
+            'games_completed': self.games_completed,
+            'rounds_completed': self.rounds_completed,
+            'submits': self.submits,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'error_rate': round(self.error_rate, 4),
+            'submits_per_second': round(self.submits / duration, 2),
+            'rounds_per_second': round(self.rounds_completed / duration, 2),
+            'advance_latency_ms': {
+                'p50': percentile(advance, 50),
+                'p95': percentile(advance, 95),
+                'p99': percentile(advance, 99),
+                'max': round(advance[-1], 2) if advance else None,
+            },
+            'ack_latency_ms': {
+                'p50': percentile(ack, 50),
+                'p95': percentile(ack, 95),
+                'p99': percentile(ack, 99),
+            },
+        }
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1], 2)
+
+
+class ThinkTime:
+    """Log-normal think-time distribution parameterised by its median."""
+
+    def __init__(self, median: float, sigma: float, minimum: float = 0.0):
+        self.mu = math.log(median) if median > 0 else None
+        self.sigma = sigma
+        self.minimum = minimum
+
+    def sample(self) -> float:
+        if self.mu is None:
+            return self.minimum
+        return max(self.minimum, random.lognormvariate(self.mu, self.sigma))
+
+
+class SyntheticJuror:
+    """A headless Socket.IO client that plays the game like a browser tab."""
+
+    def __init__(self, base_url: str, name: str, timeout: float):
+        self.base_url = base_url
+        self.name = name
+        self.timeout = timeout
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.queues: Dict[str, asyncio.Queue] = {}
+
+        for event in ('connected', 'join_success', 'join_failed', 'game_started',
+                      'evidence_phase_started', 'response_submitted', 'error') + COMPLETION_EVENTS:
+            self._listen(event)
+
+    def _listen(self, event: str):
+        queue = self.queues.setdefault(event, asyncio.Queue())
+
+        async def handler(data=None):
+            queue.put_nowait((time.perf_counter(), data))
+
+        self.sio.on(event, handler)
+
+    async def connect(self):
+        await self.sio.connect(self.base_url, transports=['websocket'])
+        await self.wait_for(('connected',))
+
+    async def disconnect(self):
+        if self.sio.connected:
+            await self.sio.disconnect()
+
+    async def emit(self, event: str, data: Optional[Dict] = None):
+        await self.sio.emit(event, data or {})
+
+    async def wait_for(self, events: Tuple[str, ...]) -> Tuple[str, float, Dict]:
+        """
+        Wait for the first of the given events (or an error).
+        Returns (event_name, receive_time, data).
+        """
+        watched = tuple(events) + ('error', 'join_failed')
+        getters = {asyncio.ensure_future(self.queues[event].get()): event for event in watched}
+        try:
+            done, _ = await asyncio.wait(getters, timeout=self.timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for future in getters:
+                if not future.done():
+                    future.cancel()
+
+        if not done:
+            raise asyncio.TimeoutError(f"{self.name} timed out waiting for {events}")
+
+        # Put back anything else that arrived in the same tick
+        first = next(iter(done))
+        for future in done:
+            if future is not first:
+                self.queues[getters[future]].put_nowait(future.result())
+
+        event = getters[first]
+        received_at, data = first.result()
+        if event not in events:
+            raise RuntimeError(f"{self.name} received {event}: {data}")
+        return event, received_at, data
+
+
+class SimulatedGame:
+    """Drives one full game with a table of synthetic jurors."""
+
+    def __init__(self, base_url: str, http: aiohttp.ClientSession, case_file: str,
+                 jurors: int, think: ThinkTime, read: ThinkTime, timeout: float,
+                 result: LevelResult):
+        self.base_url = base_url
+        self.http = http
+        self.case_file = case_file
+        self.juror_count = jurors
+        self.think = think
+        self.read = read
+        self.timeout = timeout
+        self.result = result
+        self.jurors: List[SyntheticJuror] = []
+
+    async def create(self) -> str:
+        async with self.http.post(f"{self.base_url}/api/games", json={
+            'case_file': self.case_file,
+            'max_players': self.juror_count,
+        }) as response:
+            payload = await response.json()
+        if not payload.get('success'):
+            raise RuntimeError(f"Failed to create game: {payload.get('error')}")
+        return payload['game_id']
+
+    async def run(self):
+        try:
+            game_id = await self.create()
+
+            self.jurors = [
+                SyntheticJuror(self.base_url, f"juror_{i}", self.timeout)
+                for i in range(self.juror_count)
+            ]
+            await asyncio.gather(*(juror.connect() for juror in self.jurors))
+            await asyncio.gather(*(self._join(juror, game_id) for juror in self.jurors))
+
+            host = self.jurors[0]
+            await host.emit('start_game', {'game_id': game_id})
+            _, _, data = await host.wait_for(('game_started',))
+            evidence_count = data['game_state']['total_evidence_count']
+
+            await asyncio.sleep(self.read.sample())
+            await host.emit('advance_to_evidence', {'game_id': game_id})
+            await asyncio.gather(*(j.wait_for(('evidence_phase_started',)) for j in self.jurors))
+
+            for _ in range(evidence_count):
+                await self._play_round()
+
+            self.result.games_completed += 1
+        except asyncio.TimeoutError:
+            self.result.timeouts += 1
+        except Exception as e:
+            self.result.errors += 1
+            print(f"  game error: {e}", file=sys.stderr)
+        finally:
+            await asyncio.gather(*(juror.disconnect() for juror in self.jurors),
+                                 return_exceptions=True)
+
+    async def _join(self, juror: SyntheticJuror, game_id: str):
+        await juror.emit('join_game', {
+            'game_id': game_id,
+            'player_name': juror.name,
+            'guilt_tolerance': random.choice([20, 100, 200, 1000, 10000]),
+            'use_rating_scale': True,
+        })
+        await juror.wait_for(('join_success',))
+
+    async def _play_round(self):
+        submitted_at: Dict[str, float] = {}
+        completed_at: Dict[str, float] = {}
+
+        async def take_turn(juror: SyntheticJuror):
+            await asyncio.sleep(self.think.sample())
+            guilty_rating = random.randint(0, 10)
+            innocent_rating = random.randint(1, 10)
+            submitted_at[juror.name] = time.perf_counter()
+            await juror.emit('submit_evidence_response', {
+                'prob_guilty': RATING_TO_PROBABILITY[guilty_rating],
+                'prob_innocent': RATING_TO_PROBABILITY[innocent_rating],
+                'guilty_rating': guilty_rating,
+                'innocent_rating': innocent_rating,
+            })
+            _, acked_at, _ = await juror.wait_for(('response_submitted',))
+            self.result.submits += 1
+            self.result.ack_latencies_ms.append((acked_at - submitted_at[juror.name]) * 1000)
+            _, completed_at[juror.name], _ = await juror.wait_for(COMPLETION_EVENTS)
+
+        await asyncio.gather(*(take_turn(juror) for juror in self.jurors))
+
+        last = max(submitted_at, key=submitted_at.get)
+        self.result.advance_latencies_ms.append((completed_at[last] - submitted_at[last]) * 1000)
+        self.result.rounds_completed += 1
+
+
+async def run_level(args, games: int) -> LevelResult:
+    """Run one concurrency level: `games` simultaneous courtrooms."""
+    result = LevelResult(games=games, jurors_per_game=args.jurors)
+    think = ThinkTime(args.think_median, args.think_sigma, minimum=0.2)
+    read = ThinkTime(args.read_median, args.think_sigma, minimum=0.5)
+
+    async with aiohttp.ClientSession() as http:
+        async def start_after(delay: float, game: SimulatedGame):
+            await asyncio.sleep(delay)
+            await game.run()
+
+        started = time.perf_counter()
+        tasks = []
+        for i in range(games):
+            game = SimulatedGame(args.url, http, random.choice(args.case_files), args.jurors,
+                                 think, read, args.timeout, result)
+            delay = args.ramp * i / games if games else 0
+            tasks.append(start_after(delay, game))
+        await asyncio.gather(*tasks)
+        result.duration_seconds = time.perf_counter() - started
+
+    return result
+
+
+def is_saturated(summary: Dict, args) -> bool:
+    """Check a level's summary against the configured saturation point."""
+    p95 = summary['advance_latency_ms']['p95']
+    if p95 is None or p95 > args.max_p95_ms:
+        return True
+    return summary['error_rate'] > args.max_error_rate
+
+
+def wait_for_server(url: str, timeout: float = 30.0):
+    """Poll the server until it answers HTTP requests."""
+    import urllib.request
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{url}/api/case-files", timeout=1)
+            return
+        except Exception:
+            time.sleep(0.5)
+    raise RuntimeError(f"Server at {url} did not start within {timeout} seconds")
+
+
+def spawn_server() -> subprocess.Popen:
+    """Start flask_app.py with rate limiting disabled."""
+    env = dict(os.environ, BAYESIAN_COURT_DISABLE_RATE_LIMITS='1')
+    # New session so the debug reloader's child is stopped along with it
+    return subprocess.Popen(
+        [sys.executable, 'flask_app.py'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Bayesian Court Game server")
+    parser.add_argument('--url', default='http://localhost:5000', help="Server base URL")
+    parser.add_argument('--games', default='5,10,25,50',
+                        help="Comma-separated concurrent game counts to step through")
+    parser.add_argument('--jurors', type=int, default=12, help="Jurors per game")
+    parser.add_argument('--case-files', default='sample_case_file.json',
+                        help="Comma-separated case files to pick from")
+    parser.add_argument('--think-median', type=float, default=3.0,
+                        help="Median seconds a juror spends on each evidence item")
+    parser.add_argument('--think-sigma', type=float, default=0.6,
+                        help="Log-normal sigma of think times")
+    parser.add_argument('--read-median', type=float, default=5.0,
+                        help="Median seconds spent reading the case before evidence review")
+    parser.add_argument('--ramp', type=float, default=10.0,
+                        help="Seconds over which game starts are spread")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="Seconds to wait for any single server event")
+    parser.add_argument('--max-p95-ms', type=float, default=250.0,
+                        help="Saturation point: p95 advance latency in milliseconds")
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help="Saturation point: fraction of failed or timed-out operations")
+    parser.add_argument('--keep-going', action='store_true',
+                        help="Run every level even after saturation is reached")
+    parser.add_argument('--spawn-server', action='store_true',
+                        help="Start flask_app.py locally with rate limits disabled")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    args.levels = [int(level) for level in args.games.split(',') if level.strip()]
+    args.case_files = [name.strip() for name in args.case_files.split(',') if name.strip()]
+    args.url = args.url.rstrip('/')
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    server = spawn_server() if args.spawn_server else None
+
+    try:
+        wait_for_server(args.url)
+        report = {'config': {k: v for k, v in vars(args).items() if k != 'levels'}, 'levels': []}
+        saturation_point = None
+
+        for games in args.levels:
+            print(f"Running {games} concurrent games x {args.jurors} jurors...")
+            result = asyncio.run(run_level(args, games))
+            summary = result.summary()
+            report['levels'].append(summary)
+
+            latency = summary['advance_latency_ms']
+            print(f"  {summary['submits_per_second']} submits/s, "
+                  f"{summary['rounds_per_second']} rounds/s, "
+                  f"advance p50/p95/p99 = {latency['p50']}/{latency['p95']}/{latency['p99']} ms, "
+                  f"errors {summary['errors']}, timeouts {summary['timeouts']}")
+
+            if saturation_point is None and is_saturated(summary, args):
+                saturation_point = games
+                print(f"  Saturated at {games} games "
+                      f"(p95 > {args.max_p95_ms} ms or error rate > {args.max_error_rate})")
+                if not args.keep_going:
+                    break
+
+        report['saturation_point_games'] = saturation_point
+        if saturation_point is None:
+            print("Saturation point not reached")
+
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump(report, file, indent=2)
+            print(f"Report written to {args.output}")
+        return 0
+    finally:
+        if server:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
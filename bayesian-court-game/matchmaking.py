@@ -0,0 +1,178 @@
+# matchmaking.py
+"""
+Matchmaking queue that forms juries from players waiting for a case.
+
+Waiting players are kept per case in an indexable skip list ordered by
+log tolerance (the Leaderboard structure), plus one arrival heap across
+all cases. A jury is formed as soon as a case has jury_size players: the
+queue is cut into jury_size equal rank bands and the median player of
+each band is picked, so every jury spans the queue's range of conviction
+standards. The longest-waiting player always takes the seat of their own
+band. Once the oldest player has waited max_wait seconds, poll() forms a
+smaller jury from whoever is waiting for that case, which bounds every
+player's wait. Enqueue, cancel and each seat picked cost O(log n).
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from leaderboard import Leaderboard
+
+
+@dataclass
+class Jury:
+    """Players matched together for one new game of a case."""
+    case_key: str
+    players: List[Dict]
+
+
+class MatchmakingQueue:
+    """Players waiting per case, matched into tolerance-balanced juries."""
+
+    def __init__(self, jury_size: int = 6, max_wait: float = 30.0, min_jury_size: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        if not 1 <= min_jury_size <= jury_size:
+            raise ValueError("min_jury_size must be between 1 and jury_size")
+        self.jury_size = jury_size
+        self.max_wait = max_wait
+        self.min_jury_size = min_jury_size
+        self.clock = clock
+
+        self._queues: Dict[str, Leaderboard] = {}
+        # case_key -> (sequence, player_id) heap, so each case's longest waiter is O(log n) to find
+        self._case_arrivals: Dict[str, List[Tuple[int, str]]] = {}
+        # player_id -> (case_key, enqueued_at, sequence)
+        self._waiting: Dict[str, Tuple[str, float, int]] = {}
+        # (enqueued_at, sequence, player_id); entries for players who left are skipped lazily
+        self._arrivals: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._waiting
+
+    def waiting(self, case_key: str) -> int:
+        """Number of players waiting for a case."""
+        queue = self._queues.get(case_key)
+        return len(queue) if queue else 0
+
+    def enqueue(self, player_id: str, case_key: str, name: str, guilt_tolerance: int,
+                use_rating_scale: bool = True, **info) -> List[Jury]:
+        """
+        Add a player to a case's queue (moving them if already waiting).
+        Extra keyword info is handed back with the player in their Jury.
+        Returns any jury this completes. Raises ValueError for a tolerance
+        that is not greater than 1.
+        """
+        if not guilt_tolerance > 1:
+            raise ValueError("guilt_tolerance must be greater than 1")
+        with self._lock:
+            self._remove(player_id)
+            now = self.clock()
+            sequence = next(self._sequence)
+            self._waiting[player_id] = (case_key, now, sequence)
+            heapq.heappush(self._arrivals, (now, sequence, player_id))
+            heapq.heappush(self._case_arrivals.setdefault(case_key, []), (sequence, player_id))
+            queue = self._queues.setdefault(case_key, Leaderboard())
+            queue.update(player_id, math.log10(guilt_tolerance), player_id=player_id, name=name,
+                         guilt_tolerance=guilt_tolerance, use_rating_scale=use_rating_scale, **info)
+
+            juries = []
+            while len(queue) >= self.jury_size:
+                juries.append(self._form_jury(case_key, self.jury_size))
+            return juries
+
+    def cancel(self, player_id: str) -> bool:
+        """Take a player out of the queue. Returns False if they were not waiting."""
+        with self._lock:
+            return self._remove(player_id)
+
+    def poll(self) -> List[Jury]:
+        """Form juries for every case whose oldest player has waited max_wait."""
+        with self._lock:
+            juries = []
+            short = []
+            cutoff = self.clock() - self.max_wait
+            while self._arrivals:
+                enqueued_at, sequence, player_id = self._arrivals[0]
+                if not self._is_current(player_id, sequence):
+                    heapq.heappop(self._arrivals)
+                    continue
+                if enqueued_at > cutoff:
+                    break
+                case_key = self._waiting[player_id][0]
+                size = min(len(self._queues[case_key]), self.jury_size)
+                if size < self.min_jury_size:
+                    # Not enough players for this case yet; look again on a later poll
+                    short.append(heapq.heappop(self._arrivals))
+                    continue
+                juries.append(self._form_jury(case_key, size))
+            for arrival in short:
+                heapq.heappush(self._arrivals, arrival)
+            return juries
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the oldest waiting player reaches max_wait, or None if nobody waits."""
+        with self._lock:
+            while self._arrivals and not self._is_current(self._arrivals[0][2], self._arrivals[0][1]):
+                heapq.heappop(self._arrivals)
+            if not self._arrivals:
+                return None
+            return max(0.0, self._arrivals[0][0] + self.max_wait - self.clock())
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _is_current(self, player_id: str, sequence: int) -> bool:
+        entry = self._waiting.get(player_id)
+        return entry is not None and entry[2] == sequence
+
+    def _remove(self, player_id: str) -> bool:
+        entry = self._waiting.pop(player_id, None)
+        if entry is None:
+            return False
+        queue = self._queues[entry[0]]
+        queue.remove(player_id)
+        if not len(queue):
+            del self._queues[entry[0]]
+            del self._case_arrivals[entry[0]]
+        return True
+
+    def _form_jury(self, case_key: str, size: int) -> Jury:
+        queue = self._queues[case_key]
+        count = len(queue)
+        # Median rank of each of `size` equal bands of the tolerance order
+        ranks = [(band * count // size + (band + 1) * count // size) // 2 + 1 for band in range(size)]
+
+        # The longest-waiting player takes the seat of the band they fall in
+        oldest_rank = queue.rank(self._oldest_waiting(case_key))
+        ranks[(oldest_rank * size - 1) // count] = oldest_rank
+
+        now = self.clock()
+        players = []
+        for rank in ranks:
+            info = queue.page(rank, 1)[0]
+            info.pop('rank')
+            info.pop('key')
+            info.pop('score')
+            info['waited'] = now - self._waiting[info['player_id']][1]
+            players.append(info)
+        for info in players:
+            self._remove(info['player_id'])
+        return Jury(case_key, players)
+
+    def _oldest_waiting(self, case_key: str) -> str:
+        """The earliest-queued player still waiting for a case."""
+        arrivals = self._case_arrivals[case_key]
+        while not self._is_current(arrivals[0][1], arrivals[0][0]):
+            heapq.heappop(arrivals)
+        return arrivals[0][1]
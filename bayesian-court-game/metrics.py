@@ -0,0 +1,215 @@
+# metrics.py
+"""
+Minimal in-process metrics for the game server, rendered in the
+Prometheus text exposition format.
+
+Recording is a lock, a dict lookup and an addition (plus a bisect for
+histograms), so instruments can stay on under full load. Labelled
+children should be looked up once and kept rather than per observation.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers sub-millisecond handlers up to multi-second saves
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bytes; covers a small ack up to the state of a very large room
+DEFAULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """Base class for a metric family with optional labels."""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Get (creating if needed) the child for a set of label values."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}",
+                f"# TYPE {self.name} {self.metric_type}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    metric_type = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in list(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(child.value)}")
+        return lines
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets."""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total, observations = child.sum, child.count
+
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {observations}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    A gauge or counter whose samples are computed when the metrics are
+    scraped, for values the server already tracks elsewhere.
+    The callback returns {label values tuple: value}.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str],
+                 callback: Callable[[], Dict[Tuple[str, ...], float]],
+                 metric_type: str = 'gauge'):
+        super().__init__(name, documentation, label_names)
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, value in self.callback().items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metric families and renders them for a scrape."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, tuple(label_names)))
+
+    def histogram(self, name: str, documentation: str, label_names: Iterable[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, tuple(label_names), buckets))
+
+    def callback_gauge(self, name: str, documentation: str, label_names: Iterable[str],
+                       callback: Callable[[], Dict[Tuple[str, ...], float]]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, tuple(label_names), callback))
+
+    def callback_counter(self, name: str, documentation: str, label_names: Iterable[str],
+                         callback: Callable[[], Dict[Tuple[str, ...], float]]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, tuple(label_names), callback,
+                                            metric_type='counter'))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,40 @@
+# player_tokens.py
+"""
+Signed tokens that let a player keep their identity across connections.
+
+A Socket.IO connection's session starts from the browser's cookie, and
+anything the connect handler stores in it never reaches that cookie, so
+a dropped connection would come back as a new player. Instead each
+connection is handed a token naming its player id, signed with the app's
+secret key; the client presents it in the handshake of every reconnect
+and is given its old id back. Player ids are visible to everyone in the
+room, so the signature is what stops one player claiming another's seat.
+"""
+
+import hashlib
+import hmac
+from typing import Optional
+
+
+class PlayerTokens:
+    """Issue and verify HMAC-signed player id tokens."""
+
+    def __init__(self, secret: str):
+        if not secret:
+            raise ValueError("A secret is required to sign player tokens")
+        self._key = secret.encode('utf-8')
+
+    def _signature(self, player_id: str) -> str:
+        return hmac.new(self._key, player_id.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def issue(self, player_id: str) -> str:
+        return f"{player_id}.{self._signature(player_id)}"
+
+    def verify(self, token) -> Optional[str]:
+        """The player id a token was issued for, or None if it is malformed or forged."""
+        if not isinstance(token, str) or '.' not in token:
+            return None
+        player_id, signature = token.rsplit('.', 1)
+        if not player_id or not hmac.compare_digest(signature, self._signature(player_id)):
+            return None
+        return player_id
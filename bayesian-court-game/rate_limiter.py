@@ -0,0 +1,150 @@
+# rate_limiter.py
+"""
+Rate limiting and admission control for the game server.
+Token buckets are kept per session and per client IP for each limited
+socket event or REST route, and global caps bound games and players.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+
+# (tokens per second, burst size) for each scope of each limited action.
+# IP limits are generous because a whole classroom often shares one address.
+DEFAULT_LIMITS: Dict[str, Dict[str, Tuple[float, int]]] = {
+    # Socket events
+    'join_game': {'session': (0.5, 5), 'ip': (10, 60)},
+    'claim_seat': {'session': (0.5, 5), 'ip': (10, 60)},
+    'enqueue_match': {'session': (0.5, 5), 'ip': (10, 60)},
+    'cancel_match': {'session': (0.5, 5), 'ip': (10, 60)},
+    'rejoin_game': {'session': (0.5, 5), 'ip': (10, 60)},
+    'spectate_game': {'session': (0.5, 5), 'ip': (20, 200)},
+    'stop_spectating': {'session': (0.5, 5), 'ip': (20, 200)},
+    'leave_game': {'session': (0.5, 5), 'ip': (10, 60)},
+    'start_game': {'session': (0.5, 5), 'ip': (10, 60)},
+    'advance_to_evidence': {'session': (0.5, 5), 'ip': (10, 60)},
+    'submit_evidence_response': {'session': (2, 10), 'ip': (50, 200)},
+    'get_game_state': {'session': (2, 10), 'ip': (50, 200)},
+    # REST routes
+    'create_game': {'session': (0.2, 5), 'ip': (1, 30)},
+    'create_classroom': {'session': (0.05, 2), 'ip': (0.2, 5)},
+    'list_games': {'session': (2, 10), 'ip': (20, 100)},
+    'game_info': {'session': (2, 10), 'ip': (20, 100)},
+    'leaderboard': {'session': (2, 10), 'ip': (20, 100)},
+    'evidence_stats': {'session': (2, 10), 'ip': (20, 100)},
+}
+
+
+class TokenBucket:
+    """A single token bucket refilled continuously at a fixed rate."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: int, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def consume(self, now: float, cost: float = 1.0) -> bool:
+        """Take tokens from the bucket. Returns False if not enough are left."""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
+class KeyedRateLimiter:
+    """
+    Token buckets indexed by key (session id or IP address).
+    The table is bounded: once max_keys is reached the least recently
+    used bucket is discarded, which only ever makes a client less limited.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_keys: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, cost: float = 1.0) -> bool:
+        """Check and consume the rate limit for a key."""
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity, now)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.consume(now, cost)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimitPolicy:
+    """Per-action limits applied to both the session and the client IP."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Tuple[float, int]]]] = None,
+                 max_keys: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self._limiters: Dict[str, Dict[str, KeyedRateLimiter]] = {}
+        for action, scopes in (limits if limits is not None else DEFAULT_LIMITS).items():
+            self._limiters[action] = {
+                scope: KeyedRateLimiter(rate, burst, max_keys, clock)
+                for scope, (rate, burst) in scopes.items()
+            }
+
+    def allow(self, action: str, session_id: Optional[str] = None,
+              ip_address: Optional[str] = None) -> bool:
+        """
+        Check an action against its session and IP limits.
+        Actions without configured limits are always allowed.
+        """
+        scopes = self._limiters.get(action)
+        if not scopes:
+            return True
+
+        if session_id and 'session' in scopes and not scopes['session'].allow(session_id):
+            return False
+        if ip_address and 'ip' in scopes and not scopes['ip'].allow(ip_address):
+            return False
+        return True
+
+
+class AdmissionController:
+    """Global caps on concurrent games and players."""
+
+    def __init__(self, max_games: int = 500, max_players: int = 5000):
+        self.max_games = max_games
+        self.max_players = max_players
+
+    def can_admit_game(self, live_games: int) -> Tuple[bool, str]:
+        """
+        Check whether another game may be created.
+        Returns (is_admitted, error_message)
+        """
+        if live_games >= self.max_games:
+            return False, f"Server busy: the limit of {self.max_games} running games has been reached"
+        return True, ""
+
+    def can_admit_player(self, connected_players: int) -> Tuple[bool, str]:
+        """
+        Check whether another player may join a game.
+        Returns (is_admitted, error_message)
+        """
+        if connected_players >= self.max_players:
+            return False, f"Server busy: the limit of {self.max_players} players has been reached"
+        return True, ""
@@ -0,0 +1,228 @@
+# result_archive.py
+"""
+Rolling compressed JSONL archive of game results.
+
+Instead of one JSON file per game, results are appended as compact JSON
+lines to segment files (results-00001.jsonl.gz, ...) that rotate once they
+pass a size limit. Each appended batch is compressed as its own gzip member
+or zstd frame, and concatenated members still form a valid stream, so
+segments can be read with zcat / zstdcat as well.
+
+A sidecar index.jsonl maps each game_id to its segment, the byte offset and
+length of its compressed block and its line within the block, so one game is
+fetched by decompressing a single block rather than the whole archive.
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+COMPRESSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+INDEX_FILENAME = 'index.jsonl'
+SEGMENT_PATTERN = re.compile(r'^results-(\d+)\.jsonl\.(gz|zst)$')
+
+
+class ResultArchive:
+    """Append-only, size-rotated archive of results records keyed by game_id."""
+
+    def __init__(self, directory: str = 'game_results/archive', compression: str = 'gzip',
+                 max_segment_bytes: int = 64 * 1024 * 1024, fsync: bool = True):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}', expected one of {tuple(COMPRESSIONS)}")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+
+        self.directory = directory
+        self.compression = compression
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        # game_id -> (segment, offset, length, line)
+        self._index: Dict[str, Tuple[str, int, int, int]] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, INDEX_FILENAME)
+        self._load_index()
+        self._segment_number = self._last_segment_number() or 1
+        self._recover_segment()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._index
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, results: Dict) -> Tuple[str, int]:
+        """Append one results record. Returns (segment, offset)."""
+        return self.append_many([results])[0]
+
+    def append_many(self, records: List[Dict]) -> List[Tuple[str, int]]:
+        """
+        Append records as one compressed block and index them.
+        Every record needs a 'game_id'. Returns (segment, offset) per record.
+        """
+        if not records:
+            return []
+        lines = [json.dumps(record, separators=(',', ':'), default=str) for record in records]
+        block = self._compress(('\n'.join(lines) + '\n').encode('utf-8'))
+
+        with self._lock:
+            segment = self._current_segment()
+            path = os.path.join(self.directory, segment)
+            with open(path, 'ab') as file:
+                offset = file.tell()
+                file.write(block)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+
+            entries = []
+            for line_number, record in enumerate(records):
+                entry = (segment, offset, len(block), line_number)
+                self._index[record['game_id']] = entry
+                entries.append({'game_id': record['game_id'], 'segment': segment, 'offset': offset,
+                                'length': len(block), 'line': line_number})
+            with open(self._index_path, 'a') as index_file:
+                index_file.write(''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries))
+                index_file.flush()
+                if self.fsync:
+                    os.fsync(index_file.fileno())
+
+            if offset + len(block) >= self.max_segment_bytes:
+                self._segment_number += 1
+
+        return [(segment, offset)] * len(records)
+
+    def submit(self, filename: str, results: Dict):
+        """Writer interface for BayesianGame.save_game_results; the filename is not used."""
+        self.append(results)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, game_id: str) -> Optional[Dict]:
+        """Fetch one game's results by decompressing only the block holding it."""
+        entry = self._index.get(game_id)
+        if entry is None:
+            return None
+        segment, offset, length, line = entry
+        with open(os.path.join(self.directory, segment), 'rb') as file:
+            file.seek(offset)
+            block = file.read(length)
+        lines = self._decompress(block).decode('utf-8').splitlines()
+        return json.loads(lines[line])
+
+    def game_ids(self) -> List[str]:
+        return list(self._index)
+
+    def segments(self) -> List[str]:
+        """Segment file names in write order."""
+        names = [name for name in os.listdir(self.directory) if SEGMENT_PATTERN.match(name)]
+        return sorted(names, key=lambda name: int(SEGMENT_PATTERN.match(name).group(1)))
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Stream every indexed record in write order, one block at a time."""
+        order = {name: number for number, name in enumerate(self.segments())}
+        blocks = sorted({entry[:3] for entry in self._index.values()},
+                        key=lambda block: (order.get(block[0], -1), block[1]))
+        for segment, offset, length in blocks:
+            with open(os.path.join(self.directory, segment), 'rb') as file:
+                file.seek(offset)
+                block = file.read(length)
+            for line in self._decompress(block).decode('utf-8').splitlines():
+                yield json.loads(line)
+
+    def stats(self) -> Dict:
+        segments = self.segments()
+        return {
+            'games': len(self._index),
+            'segments': len(segments),
+            'bytes': sum(os.path.getsize(os.path.join(self.directory, name)) for name in segments),
+            'compression': self.compression,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(block: bytes) -> bytes:
+        if block[:2] == b'\x1f\x8b':
+            return gzip.decompress(block)
+        if zstandard is None:
+            raise ValueError("Reading zstd segments requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(block)
+
+    def _current_segment(self) -> str:
+        return f"results-{self._segment_number:05d}{COMPRESSIONS[self.compression]}"
+
+    def _last_segment_number(self) -> int:
+        numbers = [int(SEGMENT_PATTERN.match(name).group(1)) for name in self.segments()]
+        return max(numbers) if numbers else 0
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, 'r') as index_file:
+            for line in index_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash; that block was never acknowledged
+                    continue
+                self._index[entry['game_id']] = (entry['segment'], entry['offset'],
+                                                 entry['length'], entry['line'])
+
+    def _recover_segment(self):
+        """Cut off a block that was written but never indexed (crash mid-append)."""
+        segment = self._current_segment()
+        segments = self.segments()
+        if segments and segments[-1] != segment:
+            # The last segment used the other compression; start a new one
+            self._segment_number += 1
+            return
+        path = os.path.join(self.directory, segment)
+        if not os.path.exists(path):
+            return
+        indexed_end = max((offset + length for seg, offset, length, _ in self._index.values()
+                           if seg == segment), default=0)
+        if os.path.getsize(path) > indexed_end:
+            logger.warning(f"Truncating unindexed data at the end of {segment}")
+            with open(path, 'r+b') as file:
+                file.truncate(indexed_end)
+        if indexed_end >= self.max_segment_bytes:
+            self._segment_number += 1
+
+
+def archive_from_env(directory: str) -> Optional[ResultArchive]:
+    """
+    Build the server's archive from BAYESIAN_COURT_RESULT_ARCHIVE
+    ('gzip' or 'zstd'); returns None when per-game JSON files are wanted.
+    """
+    compression = os.environ.get('BAYESIAN_COURT_RESULT_ARCHIVE')
+    if not compression:
+        return None
+    max_mb = float(os.environ.get('BAYESIAN_COURT_ARCHIVE_SEGMENT_MB', 64))
+    return ResultArchive(directory, compression=compression, max_segment_bytes=int(max_mb * 1024 * 1024))
@@ -0,0 +1,260 @@
+# result_writer.py
+"""
+Background writer for game result files.
+
+BayesianGame.save_game_results(filename, writer=result_writer) builds the
+results snapshot and hands it to this writer, which serializes it on a
+worker thread. Each batch is written to temporary files, fsynced together,
+renamed into place atomically and followed by one fsync per directory.
+An optional on_batch callback then receives the written batch, e.g. to
+load it into the results warehouse in one transaction.
+
+With an archive (see result_archive.py) each batch is instead appended to
+the rolling compressed archive as one block, and no per-game files are made.
+"""
+
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_STOP = object()
+# Queued after an overflow so an idle worker wakes up to drain it
+_WAKE = object()
+
+
+class ResultWriter:
+    """A bounded queue of result files drained by one worker thread."""
+
+    def __init__(self, max_queue: int = 1000, batch_size: int = 64, fsync: bool = True,
+                 on_written: Optional[Callable[[str, float], None]] = None,
+                 on_batch: Optional[Callable[[List[Tuple[str, Dict]]], None]] = None,
+                 archive=None):
+        self.batch_size = batch_size
+        self.fsync = fsync
+        # Called with (filename, seconds from submit to durable) for each write
+        self.on_written = on_written
+        # Called with [(filename, results), ...] after each batch is durable
+        self.on_batch = on_batch
+        # Optional ResultArchive that replaces per-game files
+        self.archive = archive
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Jobs submitted while the queue was full, drained by the worker
+        self._overflow: List[Tuple[str, Dict, float]] = []
+        self._overflow_in_flight = 0
+
+        self.written = 0
+        self.failed = 0
+        self.overflowed = 0
+
+    def start(self):
+        """Start the worker thread (once)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='result-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, filename: str, results: Dict) -> bool:
+        """
+        Queue a results snapshot for writing and return immediately. If the
+        queue is full the job goes on an overflow list the worker drains
+        after its current batch, so the caller never waits and results are
+        never dropped. Returns True if the write fit in the queue.
+        """
+        self.start()
+        job = (filename, results, time.perf_counter())
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            pass
+        with self._lock:
+            self._overflow.append(job)
+            self._overflow_in_flight += 1
+            self.overflowed += 1
+        logger.warning(f"Result writer queue full, {filename} is waiting in the overflow list")
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass  # The worker has queued jobs to take, and checks the overflow after them
+        return False
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._queue.qsize() + len(self._overflow)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every queued result has been written."""
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self._queue.unfinished_tasks or self._overflow_in_flight:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Write everything still queued and stop the worker."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict:
+        pending = self.pending
+        with self._lock:
+            return {
+                'pending': pending,
+                'written': self.written,
+                'failed': self.failed,
+                'overflowed': self.overflowed,
+            }
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Take whatever else is already waiting, up to one batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(entry is _STOP for entry in batch)
+            jobs = [entry for entry in batch if entry is not _STOP and entry is not _WAKE]
+            try:
+                if jobs:
+                    self._write_batch(jobs)
+                self._drain_overflow()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _drain_overflow(self):
+        with self._lock:
+            overflow, self._overflow = self._overflow, []
+        for start in range(0, len(overflow), self.batch_size):
+            jobs = overflow[start:start + self.batch_size]
+            try:
+                self._write_batch(jobs)
+            finally:
+                with self._lock:
+                    self._overflow_in_flight -= len(jobs)
+
+    def _write_batch(self, jobs: List[Tuple[str, Dict, float]]):
+        if self.archive is not None:
+            self._append_batch(jobs)
+            return
+
+        staged = []
+        results_by_file = {}
+        for filename, results, submitted_at in jobs:
+            staged_file = self._stage(filename, results)
+            if staged_file:
+                staged.append((filename, staged_file[0], staged_file[1], submitted_at))
+                results_by_file[filename] = results
+
+        directories = set()
+        written = []
+        for filename, temp_path, file, submitted_at in staged:
+            try:
+                if self.fsync:
+                    os.fsync(file.fileno())
+                file.close()
+                os.replace(temp_path, filename)
+                directories.add(os.path.dirname(os.path.abspath(filename)))
+                self._count('written')
+                written.append((filename, results_by_file[filename]))
+                if self.on_written:
+                    self.on_written(filename, time.perf_counter() - submitted_at)
+            except Exception as e:
+                self._count('failed')
+                logger.error(f"Error writing results {filename}: {e}")
+                if not file.closed:
+                    file.close()
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+
+        # Make the renames durable with one fsync per directory
+        if self.fsync:
+            for directory in directories:
+                _fsync_directory(directory)
+
+        self._batch_written(written)
+
+    def _append_batch(self, jobs: List[Tuple[str, Dict, float]]):
+        try:
+            self.archive.append_many([results for _, results, _ in jobs])
+        except Exception as e:
+            self._count('failed', len(jobs))
+            logger.error(f"Error appending {len(jobs)} results to the archive: {e}")
+            return
+
+        self._count('written', len(jobs))
+        if self.on_written:
+            for filename, _, submitted_at in jobs:
+                self.on_written(filename, time.perf_counter() - submitted_at)
+        self._batch_written([(filename, results) for filename, results, _ in jobs])
+
+    def _batch_written(self, written: List[Tuple[str, Dict]]):
+        if self.on_batch and written:
+            try:
+                self.on_batch(written)
+            except Exception as e:
+                logger.error(f"Error in result batch callback: {e}")
+
+    def _stage(self, filename: str, results: Dict):
+        """Serialize results into a temporary file next to the target. Returns (temp_path, file)."""
+        temp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(filename))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=directory)
+            file = os.fdopen(fd, 'w')
+            try:
+                json.dump(results, file, separators=(',', ':'), default=str)
+                file.flush()
+            except Exception:
+                file.close()
+                raise
+            return temp_path, file
+        except Exception as e:
+            self._count('failed')
+            logger.error(f"Error writing results {filename}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return None
+
+
+def _fsync_directory(directory: str):
+    """Flush a directory entry to disk (no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
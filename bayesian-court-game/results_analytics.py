@@ -0,0 +1,346 @@
+# results_analytics.py
+"""
+Batch analytics over historical game results.
+
+Reads every results format in one pass: command-line *_played_*.json files,
+server *_results_*.json files and rolling archive segments
+(results-*.jsonl.gz / .jsonl.zst). Files are split into chunks that worker
+processes parse into columnar NumPy arrays and reduce to fixed-size sums
+per (case, evidence item) and per tolerance decade. Only those sums come
+back to the parent, so memory stays bounded however many files are read.
+
+Reports per-evidence calibration (player dB vs. the case's dB), bias,
+variance and error, an overall calibration fit, and conviction rates by
+the players' false-conviction tolerance:
+    python results_analytics.py .. game_results --case-store game_results/cases
+"""
+
+import argparse
+import gzip
+import io
+import json
+import math
+import os
+import sys
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from bayesian_core import CaseStore
+from results_store import RESULT_FILE_PATTERN, normalize_file
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+SEGMENT_SUFFIXES = ('.jsonl.gz', '.jsonl.zst')
+
+# Sums kept per (case_key, evidence_index). The "ref" columns only cover
+# responses whose evidence item has reference probabilities in the case.
+EVIDENCE_COLUMNS = ('n', 'sum_player', 'sum_player_sq', 'n_ref', 'sum_ref_player', 'sum_ref_player_sq',
+                    'sum_actual', 'sum_actual_sq', 'sum_cross', 'sum_abs_error')
+# Sums kept per tolerance decade (10, 100, 1000, ...)
+TOLERANCE_COLUMNS = ('players', 'convictions')
+
+
+class Aggregate:
+    """Mergeable sums for a set of results files."""
+
+    def __init__(self):
+        self.evidence: Dict[Tuple[str, int], np.ndarray] = {}
+        self.evidence_names: Dict[Tuple[str, int], str] = {}
+        self.tolerance: Dict[int, np.ndarray] = {}
+        self.files = 0
+        self.games = 0
+        self.failed = 0
+
+    @staticmethod
+    def _accumulate(table: Dict, keys: Iterable, rows: Iterable[np.ndarray]):
+        for key, row in zip(keys, rows):
+            if key in table:
+                table[key] += row
+            else:
+                table[key] = np.array(row, dtype=np.float64)
+
+    def add_evidence(self, keys: List[Tuple[str, int]], sums: np.ndarray):
+        self._accumulate(self.evidence, keys, sums)
+
+    def add_tolerance(self, decades: np.ndarray, sums: np.ndarray):
+        self._accumulate(self.tolerance, decades.tolist(), sums)
+
+    def merge(self, other: 'Aggregate'):
+        self._accumulate(self.evidence, other.evidence.keys(), other.evidence.values())
+        self._accumulate(self.tolerance, other.tolerance.keys(), other.tolerance.values())
+        for key, name in other.evidence_names.items():
+            self.evidence_names.setdefault(key, name)
+        self.files += other.files
+        self.games += other.games
+        self.failed += other.failed
+
+
+class _Columns:
+    """Row-at-a-time buffers turned into NumPy columns once per chunk."""
+
+    def __init__(self):
+        self.key_codes: Dict[Tuple[str, int], int] = {}
+        self.keys: List[Tuple[str, int]] = []
+        self.codes: List[int] = []
+        self.player_db: List[float] = []
+        self.actual_db: List[float] = []
+        self.tolerances: List[float] = []
+        self.convicted: List[int] = []
+
+    def add_game(self, game: Dict, aggregate: Aggregate):
+        actual_by_index = {}
+        for case_key, index, name, _, _, actual_db in game['evidence']:
+            actual_by_index[index] = actual_db if actual_db is not None else math.nan
+            aggregate.evidence_names.setdefault((case_key, index), name)
+
+        case_key = game['case_key']
+        for player in game['players']:
+            _, _, threshold, tolerance, _, would_convict, _ = player['row']
+            if tolerance is None and threshold is not None:
+                tolerance = 10 ** (threshold / 10)
+            if tolerance:
+                self.tolerances.append(tolerance)
+                self.convicted.append(int(bool(would_convict)))
+
+            for response in player['responses']:
+                key = (case_key, response[0])
+                code = self.key_codes.get(key)
+                if code is None:
+                    code = self.key_codes[key] = len(self.keys)
+                    self.keys.append(key)
+                self.codes.append(code)
+                self.player_db.append(response[3])
+                self.actual_db.append(actual_by_index.get(response[0], math.nan))
+
+    def reduce_into(self, aggregate: Aggregate):
+        if self.codes:
+            codes = np.asarray(self.codes, dtype=np.int64)
+            player = np.asarray(self.player_db, dtype=np.float64)
+            actual = np.asarray(self.actual_db, dtype=np.float64)
+            has_ref = np.isfinite(actual)
+            ref_player = np.where(has_ref, player, 0.0)
+            ref_actual = np.where(has_ref, actual, 0.0)
+
+            size = len(self.keys)
+            columns = [
+                np.ones_like(player), player, player * player,
+                has_ref.astype(np.float64), ref_player, ref_player * ref_player,
+                ref_actual, ref_actual * ref_actual, ref_player * ref_actual,
+                np.abs(ref_player - ref_actual),
+            ]
+            sums = np.stack([np.bincount(codes, weights=column, minlength=size) for column in columns], axis=1)
+            aggregate.add_evidence(self.keys, sums)
+
+        if self.tolerances:
+            decades = np.floor(np.log10(np.asarray(self.tolerances, dtype=np.float64)) + 1e-9).astype(np.int64)
+            convicted = np.asarray(self.convicted, dtype=np.float64)
+            unique, inverse = np.unique(decades, return_inverse=True)
+            sums = np.stack([np.bincount(inverse, minlength=len(unique)).astype(np.float64),
+                             np.bincount(inverse, weights=convicted, minlength=len(unique))], axis=1)
+            aggregate.add_tolerance(unique, sums)
+
+
+def _read_records(path: str) -> Iterator[Dict]:
+    """Yield the results records in one file (one for .json, many for segments)."""
+    if path.endswith('.jsonl.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.endswith('.jsonl.zst'):
+        if zstandard is None:
+            raise ValueError("Reading zstd segments requires the 'zstandard' package")
+        with open(path, 'rb') as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            for line in io.TextIOWrapper(reader, encoding='utf-8'):
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, 'r') as file:
+            yield json.load(file)
+
+
+def aggregate_files(paths: List[str], case_store_dir: Optional[str] = None) -> Aggregate:
+    """Parse and reduce one chunk of files (runs in a worker process)."""
+    aggregate = Aggregate()
+    columns = _Columns()
+    case_store = CaseStore(case_store_dir) if case_store_dir else None
+
+    for path in paths:
+        aggregate.files += 1
+        try:
+            for record in _read_records(path):
+                columns.add_game(normalize_file(record, os.path.abspath(path), case_store), aggregate)
+                aggregate.games += 1
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping {path}: {e}")
+            aggregate.failed += 1
+
+    columns.reduce_into(aggregate)
+    return aggregate
+
+
+def find_result_files(paths: Iterable[str]) -> Iterator[str]:
+    """Walk files and directories for results files and archive segments."""
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for directory, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if filename.startswith('.tmp_'):
+                    continue
+                if RESULT_FILE_PATTERN.search(filename) or filename.endswith(SEGMENT_SUFFIXES):
+                    yield os.path.join(directory, filename)
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze(paths: Iterable[str], case_store_dir: Optional[str] = None,
+            workers: Optional[int] = None, chunk_size: int = 500) -> Aggregate:
+    """
+    Aggregate every results file under paths. Chunks are handed to a
+    process pool with a bounded number in flight; workers=1 runs inline.
+    """
+    total = Aggregate()
+    chunks = _chunks(find_result_files(paths), chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for chunk in chunks:
+            total.merge(aggregate_files(chunk, case_store_dir))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(aggregate_files, chunk, case_store_dir))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge(future.result())
+        for future in pending:
+            total.merge(future.result())
+    return total
+
+
+def summarize(aggregate: Aggregate) -> Dict:
+    """Turn accumulated sums into per-evidence, calibration and tolerance statistics."""
+    evidence = []
+    for key in sorted(aggregate.evidence):
+        n, sum_p, sum_p2, m, sum_rp, sum_rp2, sum_a, sum_a2, sum_pa, sum_abs = aggregate.evidence[key].tolist()
+        mean_player = sum_p / n
+        row = {
+            'case_key': key[0],
+            'evidence_index': key[1],
+            'name': aggregate.evidence_names.get(key),
+            'responses': int(n),
+            'mean_player_db': mean_player,
+            'variance_player_db': max(sum_p2 / n - mean_player ** 2, 0.0),
+            'actual_db': None, 'bias_db': None, 'mae_db': None, 'rmse_db': None,
+        }
+        if m:
+            row['actual_db'] = sum_a / m
+            row['bias_db'] = (sum_rp - sum_a) / m
+            row['mae_db'] = sum_abs / m
+            row['rmse_db'] = math.sqrt(max((sum_rp2 - 2 * sum_pa + sum_a2) / m, 0.0))
+        evidence.append(row)
+
+    calibration = None
+    if aggregate.evidence:
+        totals = np.sum(np.array(list(aggregate.evidence.values())), axis=0).tolist()
+        m, sum_rp, sum_rp2, sum_a, sum_a2, sum_pa = totals[3:9]
+        var_a = m * sum_a2 - sum_a ** 2
+        var_p = m * sum_rp2 - sum_rp ** 2
+        if m and var_a > 0:
+            slope = (m * sum_pa - sum_rp * sum_a) / var_a
+            calibration = {
+                'responses': int(m),
+                # Player dB regressed on the case's dB; a calibrated jury has slope 1, intercept 0
+                'slope': slope,
+                'intercept': (sum_rp - slope * sum_a) / m,
+                'correlation': (m * sum_pa - sum_rp * sum_a) / math.sqrt(var_a * var_p) if var_p > 0 else None,
+            }
+
+    tolerance = []
+    for decade in sorted(aggregate.tolerance):
+        players, convictions = aggregate.tolerance[decade].tolist()
+        tolerance.append({'tolerance_from': 10 ** decade, 'tolerance_to': 10 ** (decade + 1),
+                          'players': int(players), 'conviction_rate': convictions / players})
+
+    return {
+        'files': aggregate.files,
+        'games': aggregate.games,
+        'failed': aggregate.failed,
+        'evidence': evidence,
+        'calibration': calibration,
+        'conviction_by_tolerance': tolerance,
+    }
+
+
+def print_report(summary: Dict):
+    print(f"Read {summary['games']} games from {summary['files']} files ({summary['failed']} failed)")
+
+    print("\n=== Evidence calibration (player dB vs. case dB) ===")
+    current_case = None
+    for row in summary['evidence']:
+        if row['case_key'] != current_case:
+            current_case = row['case_key']
+            print(f"\n{current_case}")
+        line = (f"  {row['evidence_index']:>3} {(row['name'] or '')[:36]:<36} n={row['responses']:<7} "
+                f"player {row['mean_player_db']:+7.2f} (var {row['variance_player_db']:6.2f})")
+        if row['actual_db'] is not None:
+            line += (f"  case {row['actual_db']:+7.2f}  bias {row['bias_db']:+6.2f}"
+                     f"  mae {row['mae_db']:5.2f}  rmse {row['rmse_db']:5.2f}")
+        print(line)
+
+    calibration = summary['calibration']
+    if calibration:
+        correlation = calibration['correlation']
+        print(f"\nOverall: player dB = {calibration['slope']:.3f} x case dB "
+              f"{calibration['intercept']:+.2f} over {calibration['responses']} responses"
+              + (f" (r = {correlation:.3f})" if correlation is not None else ""))
+
+    print("\n=== Conviction rate by tolerance ===")
+    for row in summary['conviction_by_tolerance']:
+        print(f"  1 in {row['tolerance_from']:>8,} - {row['tolerance_to']:>9,}: "
+              f"{row['conviction_rate'] * 100:5.1f}% of {row['players']} players")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Calibration and conviction analytics over game results")
+    parser.add_argument('paths', nargs='+', help="Results files, archive segments or directories")
+    parser.add_argument('--case-store', help="Case store directory for results that reference cases by hash")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="Files per worker task")
+    parser.add_argument('--json', dest='json_output', help="Also write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    summary = summarize(analyze(args.paths, args.case_store, args.workers, args.chunk_size))
+    print_report(summary)
+    if args.json_output:
+        with open(args.json_output, 'w') as file:
+            json.dump(summary, file, indent=2)
+    return 0 if summary['games'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+# results_store.py
+"""
+SQLite warehouse of finished games.
+
+Server results (*_results_*.json) and games played with the command-line
+version (*_played_*.json) are loaded into games, players, evidence and
+responses tables, indexed by case, evidence index and completion time, so
+questions across many games are answered by one indexed query instead of
+opening every file.
+
+The server feeds it from the result writer in batches; existing files are
+loaded with the backfill importer:
+    python results_store.py import game_results ..
+    python results_store.py evidence biker_bar_murder_case
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bayesian_core import BayesianCalculator, CaseStore
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    source_file TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    game_id TEXT,
+    case_key TEXT NOT NULL,
+    case_name TEXT,
+    prior_db REAL,
+    created_at TEXT,
+    completed_at TEXT,
+    final_verdict TEXT,
+    player_count INTEGER NOT NULL,
+    guilty_votes INTEGER NOT NULL,
+    average_evidence_db REAL
+);
+CREATE INDEX IF NOT EXISTS idx_games_case_completed ON games (case_key, completed_at);
+CREATE INDEX IF NOT EXISTS idx_games_completed ON games (completed_at);
+
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    player_id TEXT,
+    name TEXT,
+    guilt_threshold_db REAL,
+    prior_guilt_tolerance INTEGER,
+    final_evidence_db REAL,
+    would_convict INTEGER,
+    use_rating_scale INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_players_game ON players (game_id);
+
+CREATE TABLE IF NOT EXISTS evidence (
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    case_key TEXT NOT NULL,
+    evidence_index INTEGER NOT NULL,
+    name TEXT,
+    prob_guilty REAL,
+    prob_innocent REAL,
+    actual_db_update REAL,
+    PRIMARY KEY (game_id, evidence_index)
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_case ON evidence (case_key, evidence_index);
+
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL REFERENCES players (id) ON DELETE CASCADE,
+    case_key TEXT NOT NULL,
+    evidence_index INTEGER NOT NULL,
+    prob_guilty REAL,
+    prob_innocent REAL,
+    db_update REAL NOT NULL,
+    used_rating_scale INTEGER,
+    guilty_rating INTEGER,
+    innocent_rating INTEGER,
+    answered_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_responses_case_evidence ON responses (case_key, evidence_index, db_update);
+CREATE INDEX IF NOT EXISTS idx_responses_player ON responses (player_id);
+"""
+
+# Files the backfill importer picks up when given a directory
+RESULT_FILE_PATTERN = re.compile(r'_(results|played)_.*\.json$')
+# Scripted (answer sheet) plays carry the sheet id after the timestamp
+PLAYED_TIMESTAMP_PATTERN = re.compile(r'_played_(\d{8}_\d{6})(?:_([^.]*))?\.json$')
+
+
+def case_key_for(case_file: str) -> str:
+    """Identify a case by its file name without directory or extension."""
+    return os.path.splitext(os.path.basename(case_file))[0]
+
+
+def _evidence_rows(case_key: str, evidence: List[Dict]) -> List[Tuple]:
+    rows = []
+    for index, item in enumerate(evidence):
+        prob_guilty = item.get('prob_guilty')
+        prob_innocent = item.get('prob_innocent')
+        try:
+            actual_db = BayesianCalculator.calculate_db_update(prob_guilty, prob_innocent)
+        except (TypeError, ValueError, ZeroDivisionError):
+            actual_db = None
+        rows.append((case_key, index, item.get('name'), prob_guilty, prob_innocent, actual_db))
+    return rows
+
+
+def resolve_case(data: Dict, source_file: str, case_store: Optional[CaseStore] = None) -> Dict:
+    """
+    Get the case a results record was played on. Older files embed it;
+    newer ones reference it by case_hash in a case store (by default the
+    case_store directory the command-line game keeps next to its files).
+    """
+    if 'case_data' in data:
+        return data['case_data']
+    if 'evidence' in data:
+        return data
+    case_hash = data.get('case_hash')
+    if not case_hash:
+        return {}
+    if case_store is None:
+        case_store = CaseStore(os.path.join(os.path.dirname(source_file), 'case_store'))
+    try:
+        return case_store.get(case_hash)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Case for {source_file} is unavailable: {e}")
+        return {}
+
+
+def normalize_server_results(results: Dict, source_file: str, case_store: Optional[CaseStore] = None) -> Dict:
+    """Convert a BayesianGame.build_results() snapshot into table rows."""
+    case_data = resolve_case(results, source_file, case_store)
+    case_key = case_key_for(results['case_file'])
+    stats = results.get('final_statistics') or {}
+    players = []
+    for player in results.get('players', {}).values():
+        responses = [
+            (response['evidence_index'], response['prob_guilty'], response['prob_innocent'],
+             response['db_update'], response.get('used_rating_scale'), response.get('guilty_rating'),
+             response.get('innocent_rating'), response.get('timestamp'))
+            for response in player.get('responses', [])
+        ]
+        players.append({
+            'row': (player.get('player_id'), player.get('name'), player.get('guilt_threshold_db'),
+                    player.get('prior_guilt_tolerance'), player.get('current_evidence_db'),
+                    int(player.get('current_evidence_db', 0) >= player.get('guilt_threshold_db', 0)),
+                    player.get('use_rating_scale')),
+            'responses': responses,
+        })
+
+    return {
+        'game': (source_file, 'server', results.get('game_id'), case_key,
+                 results.get('case_name') or case_data.get('case', {}).get('name'),
+                 case_data.get('prior', {}).get('db'), results.get('created_at'),
+                 results.get('completed_at'), results.get('final_verdict'),
+                 len(players), stats.get('guilty_votes', 0), stats.get('average_evidence_db')),
+        'case_key': case_key,
+        'evidence': _evidence_rows(case_key, case_data.get('evidence', [])),
+        'players': players,
+    }
+
+
+def normalize_played_file(data: Dict, source_file: str, case_store: Optional[CaseStore] = None) -> Dict:
+    """Convert a command-line *_played_*.json record (one player) into table rows."""
+    case_data = resolve_case(data, source_file, case_store)
+    basename = os.path.basename(source_file)
+    case_key = basename.split('_played_')[0]
+    match = PLAYED_TIMESTAMP_PATTERN.search(basename)
+    sheet_id = match.group(2) if match else None
+    if match:
+        completed_at = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat()
+    else:
+        completed_at = datetime.fromtimestamp(os.path.getmtime(source_file)).isoformat()
+
+    final_db = data.get('final_evidence_db')
+    threshold = data.get('guilt_threshold_db')
+    verdict = data.get('verdict')
+    responses = [
+        (response['evidence_index'], response.get('player_prob_guilty'),
+         response.get('player_prob_innocent'), response['db_update'], response.get('used_rating_scale'),
+         response.get('player_guilty_rating'), response.get('player_innocent_rating'), None)
+        for response in data.get('player_responses', [])
+    ]
+    tolerance = round(10 ** (threshold / 10)) if threshold is not None else None
+
+    return {
+        'game': (source_file, 'cli', None, case_key,
+                 data.get('case_name') or case_data.get('case', {}).get('name'),
+                 data.get('prior_db', case_data.get('prior', {}).get('db')), None, completed_at, verdict,
+                 1, int(verdict == 'GUILTY'), final_db),
+        'case_key': case_key,
+        'evidence': _evidence_rows(case_key, case_data.get('evidence', [])),
+        'players': [{
+            'row': ('cli', sheet_id, threshold, tolerance, final_db, int(verdict == 'GUILTY'),
+                    any(response[4] for response in responses)),
+            'responses': responses,
+        }],
+    }
+
+
+def normalize_file(data: Dict, source_file: str, case_store: Optional[CaseStore] = None) -> Dict:
+    """Pick the right conversion for a server results or command-line played file."""
+    if 'players' in data and 'case_file' in data:
+        return normalize_server_results(data, source_file, case_store)
+    if 'player_responses' in data:
+        return normalize_played_file(data, source_file, case_store)
+    raise ValueError(f"'{source_file}' is not a game results file")
+
+
+class ResultsStore:
+    """Thread-safe wrapper around the results database."""
+
+    def __init__(self, db_path: str = 'game_results/results.db', case_store: Optional[CaseStore] = None):
+        self.db_path = db_path
+        # Where results that reference their case by hash are resolved
+        self.case_store = case_store
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('PRAGMA foreign_keys=ON')
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def insert_many(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        """
+        Insert (source_file, results) pairs in one transaction, skipping
+        files that are already stored. Returns the number of games added.
+        Suitable as ResultWriter's on_batch callback.
+        """
+        normalized = []
+        for source_file, data in items:
+            try:
+                normalized.append(normalize_file(data, os.path.abspath(source_file), self.case_store))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping results {source_file}: {e}")
+
+        added = 0
+        with self._lock, self._conn:
+            for game in normalized:
+                if self._insert_game(game):
+                    added += 1
+        return added
+
+    def insert_results(self, source_file: str, results: Dict) -> bool:
+        """Insert one results snapshot. Returns False if it was already stored."""
+        return self.insert_many([(source_file, results)]) == 1
+
+    def _insert_game(self, game: Dict) -> bool:
+        cursor = self._conn.execute(
+            'INSERT OR IGNORE INTO games (source_file, source, game_id, case_key, case_name, prior_db, '
+            'created_at, completed_at, final_verdict, player_count, guilty_votes, average_evidence_db) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', game['game'])
+        if cursor.rowcount == 0:
+            return False
+        game_pk = cursor.lastrowid
+
+        self._conn.executemany(
+            'INSERT INTO evidence (game_id, case_key, evidence_index, name, prob_guilty, prob_innocent, '
+            'actual_db_update) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(game_pk,) + row for row in game['evidence']])
+
+        for player in game['players']:
+            player_pk = self._conn.execute(
+                'INSERT INTO players (game_id, player_id, name, guilt_threshold_db, prior_guilt_tolerance, '
+                'final_evidence_db, would_convict, use_rating_scale) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (game_pk,) + player['row']).lastrowid
+            self._conn.executemany(
+                'INSERT INTO responses (game_id, player_id, case_key, evidence_index, prob_guilty, '
+                'prob_innocent, db_update, used_rating_scale, guilty_rating, innocent_rating, answered_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(game_pk, player_pk, game['case_key']) + response for response in player['responses']])
+        return True
+
+    def import_paths(self, paths: Iterable[str], batch_size: int = 200) -> Dict:
+        """
+        Backfill from result files and directories (searched recursively).
+        Files already in the store are skipped without being parsed.
+        """
+        with self._lock:
+            known = {row[0] for row in self._conn.execute('SELECT source_file FROM games')}
+
+        summary = {'imported': 0, 'skipped': 0, 'failed': 0}
+        batch = []
+        for filename in _find_result_files(paths):
+            filename = os.path.abspath(filename)
+            if filename in known:
+                summary['skipped'] += 1
+                continue
+            try:
+                with open(filename, 'r') as file:
+                    batch.append((filename, json.load(file)))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read {filename}: {e}")
+                summary['failed'] += 1
+                continue
+            if len(batch) >= batch_size:
+                summary['imported'] += self.insert_many(batch)
+                batch = []
+        if batch:
+            summary['imported'] += self.insert_many(batch)
+        return summary
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def case_summary(self) -> List[Dict]:
+        """Games, players and guilty verdicts per case."""
+        return self._query(
+            'SELECT case_key, MAX(case_name) AS case_name, COUNT(*) AS games, '
+            'SUM(player_count) AS players, SUM(final_verdict = \'GUILTY\') AS guilty_verdicts, '
+            'AVG(average_evidence_db) AS mean_final_db, MAX(completed_at) AS last_played '
+            'FROM games GROUP BY case_key ORDER BY case_key')
+
+    def evidence_summary(self, case_key: str) -> List[Dict]:
+        """Mean and spread of player dB updates for each evidence item of a case."""
+        player_stats = self._query(
+            'SELECT evidence_index, COUNT(*) AS responses, AVG(db_update) AS mean_player_db, '
+            'MIN(db_update) AS min_player_db, MAX(db_update) AS max_player_db, '
+            'AVG(db_update * db_update) AS mean_square_db '
+            'FROM responses WHERE case_key = ? GROUP BY evidence_index ORDER BY evidence_index',
+            (case_key,))
+        evidence = {row['evidence_index']: row for row in self._query(
+            'SELECT evidence_index, MAX(name) AS name, AVG(actual_db_update) AS actual_db '
+            'FROM evidence WHERE case_key = ? GROUP BY evidence_index', (case_key,))}
+
+        summary = []
+        for row in player_stats:
+            variance = max(row.pop('mean_square_db') - row['mean_player_db'] ** 2, 0.0)
+            item = evidence.get(row['evidence_index'], {})
+            row['name'] = item.get('name')
+            row['actual_db'] = item.get('actual_db')
+            row['stddev_player_db'] = variance ** 0.5
+            summary.append(row)
+        return summary
+
+    def recent_games(self, limit: int = 20, case_key: str = None) -> List[Dict]:
+        """Most recently completed games, optionally for one case."""
+        columns = ('SELECT game_id, source, source_file, case_key, case_name, completed_at, '
+                   'final_verdict, player_count, guilty_votes, average_evidence_db FROM games ')
+        if case_key:
+            return self._query(columns + 'WHERE case_key = ? ORDER BY completed_at DESC LIMIT ?',
+                               (case_key, limit))
+        return self._query(columns + 'ORDER BY completed_at DESC LIMIT ?', (limit,))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {table: self._conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                    for table in ('games', 'players', 'evidence', 'responses')}
+
+
+def _find_result_files(paths: Iterable[str]) -> Iterable[str]:
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for directory, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if RESULT_FILE_PATTERN.search(filename) and not filename.startswith('.tmp_'):
+                    yield os.path.join(directory, filename)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load and query the game results warehouse")
+    parser.add_argument('--db', default='game_results/results.db', help="SQLite database path")
+    parser.add_argument('--case-store', help="Case store directory for results that reference cases by hash")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Backfill result and played files")
+    import_parser.add_argument('paths', nargs='+', help="Files or directories to import")
+
+    subparsers.add_parser('cases', help="Summarize games per case")
+
+    evidence_parser = subparsers.add_parser('evidence', help="Player dB per evidence item for a case")
+    evidence_parser.add_argument('case_key', help="Case file name without extension")
+
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.db, case_store=CaseStore(args.case_store) if args.case_store else None)
+    try:
+        if args.command == 'import':
+            summary = store.import_paths(args.paths)
+            print(f"Imported {summary['imported']} games "
+                  f"({summary['skipped']} already stored, {summary['failed']} unreadable)")
+        elif args.command == 'cases':
+            for row in store.case_summary():
+                mean_db = f"{row['mean_final_db']:+7.2f}" if row['mean_final_db'] is not None else '    n/a'
+                print(f"{row['case_key']:<40} {row['games']:>6} games {row['players']:>7} players "
+                      f"{row['guilty_verdicts']:>6} guilty  mean {mean_db} dB")
+        else:
+            rows = store.evidence_summary(args.case_key)
+            if not rows:
+                print(f"No responses stored for case '{args.case_key}'")
+                return 1
+            for row in rows:
+                actual = f"{row['actual_db']:+7.2f}" if row['actual_db'] is not None else '    n/a'
+                print(f"{row['evidence_index']:>3}  {(row['name'] or '')[:40]:<40} "
+                      f"n={row['responses']:<6} player {row['mean_player_db']:+7.2f} dB "
+                      f"(sd {row['stddev_player_db']:.2f})  actual {actual} dB")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
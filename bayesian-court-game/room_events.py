@@ -0,0 +1,89 @@
+# room_events.py
+"""
+Recent events broadcast to each game room, kept for reconnecting clients.
+
+Every event sent to a room gets the room's next revision number and is
+stored in a fixed-size ring buffer (slot = revision % capacity). A client
+that drops and comes back with the last revision it saw is sent just the
+events after it, in order, instead of rebuilding its whole view from
+get_game_state. If it has been gone so long that those events were
+overwritten, replay reports a gap and the caller falls back to full state.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CAPACITY = 256
+
+# (revision, event name, payload)
+RoomEvent = Tuple[int, str, Dict]
+
+
+class RoomEventLog:
+    """Ring buffer of one room's most recent events, numbered from 1."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.revision = 0
+        self._slots: List[Optional[RoomEvent]] = [None] * capacity
+
+    def __len__(self) -> int:
+        return min(self.revision, self.capacity)
+
+    @property
+    def oldest_revision(self) -> int:
+        """Revision of the oldest event still held (revision + 1 when empty)."""
+        return self.revision - len(self) + 1
+
+    def append(self, event: str, payload: Dict) -> int:
+        self.revision += 1
+        self._slots[self.revision % self.capacity] = (self.revision, event, payload)
+        return self.revision
+
+    def since(self, revision: int) -> Optional[List[RoomEvent]]:
+        """
+        Events after a revision, oldest first. Returns None if some of them
+        have already been overwritten (or the revision is from the future).
+        """
+        if revision > self.revision or revision + 1 < self.oldest_revision:
+            return None
+        return [self._slots[r % self.capacity] for r in range(revision + 1, self.revision + 1)]
+
+
+class RoomEventLogs:
+    """Event logs for every room, created on first event."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._logs: Dict[str, RoomEventLog] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, room: str) -> bool:
+        return room in self._logs
+
+    def record(self, room: str, event: str, payload: Dict) -> int:
+        """Store an event sent to a room. Returns its revision."""
+        with self._lock:
+            log = self._logs.get(room)
+            if log is None:
+                log = self._logs[room] = RoomEventLog(self.capacity)
+            return log.append(event, payload)
+
+    def revision(self, room: str) -> int:
+        """The room's latest revision (0 before its first event)."""
+        log = self._logs.get(room)
+        return log.revision if log else 0
+
+    def replay(self, room: str, revision: int) -> Optional[List[RoomEvent]]:
+        """Events a client that last saw revision has missed, or None on a gap."""
+        with self._lock:
+            log = self._logs.get(room)
+            if log is None:
+                return [] if revision == 0 else None
+            return log.since(revision)
+
+    def drop(self, room: str):
+        with self._lock:
+            self._logs.pop(room, None)
@@ -0,0 +1,84 @@
+# spectator_frames.py
+"""
+Read-only spectators of game rooms and the frames they are sent.
+
+Spectators watch a game from their own room and never become players,
+so they do not count toward max_players or hold up all_players_responded.
+Each state change of a watched game is encoded once into a frame (UTF-8
+JSON bytes, sent as a binary Socket.IO attachment) and the same bytes go
+to every spectator; a spectator arriving later gets the cached frame of
+the current revision. Serialization cost therefore depends on how often
+games change, not on how many people are watching.
+"""
+
+import json
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+
+def encode_frame(payload: Dict) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class SpectatorFrames:
+    """Spectator connections per game and each game's latest encoded frame."""
+
+    def __init__(self):
+        self._watching: Dict[str, str] = {}  # spectator sid -> game_id
+        self._spectators: Dict[str, Set[str]] = {}  # game_id -> spectator sids
+        self._frames: Dict[str, Tuple[int, bytes]] = {}  # game_id -> (revision, frame)
+        self._lock = threading.Lock()
+        self.frames_encoded = 0
+
+    def add(self, sid: str, game_id: str) -> Optional[str]:
+        """Start a spectator watching a game. Returns the game it watched before, if any."""
+        with self._lock:
+            previous = self._remove(sid)
+            self._watching[sid] = game_id
+            self._spectators.setdefault(game_id, set()).add(sid)
+            return previous
+
+    def remove(self, sid: str) -> Optional[str]:
+        """Stop a spectator watching. Returns the game it was watching."""
+        with self._lock:
+            return self._remove(sid)
+
+    def count(self, game_id: str) -> int:
+        spectators = self._spectators.get(game_id)
+        return len(spectators) if spectators else 0
+
+    def total(self) -> int:
+        return len(self._watching)
+
+    def frame(self, game_id: str, revision: int, build: Callable[[], Dict]) -> bytes:
+        """The game's frame at a revision, encoded from build() only if not already cached."""
+        with self._lock:
+            cached = self._frames.get(game_id)
+            if cached is not None and cached[0] == revision:
+                return cached[1]
+        frame = encode_frame(build())
+        with self._lock:
+            cached = self._frames.get(game_id)
+            if cached is None or cached[0] <= revision:
+                self._frames[game_id] = (revision, frame)
+            self.frames_encoded += 1
+        return frame
+
+    def drop(self, game_id: str) -> List[str]:
+        """Forget a game that has ended. Returns the sids that were watching it."""
+        with self._lock:
+            self._frames.pop(game_id, None)
+            sids = self._spectators.pop(game_id, set())
+            for sid in sids:
+                self._watching.pop(sid, None)
+            return list(sids)
+
+    def _remove(self, sid: str) -> Optional[str]:
+        game_id = self._watching.pop(sid, None)
+        if game_id is not None:
+            spectators = self._spectators.get(game_id)
+            if spectators is not None:
+                spectators.discard(sid)
+                if not spectators:
+                    del self._spectators[game_id]
+        return game_id
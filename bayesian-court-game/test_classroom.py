@@ -0,0 +1,78 @@
+# test_classroom.py
+"""
+Test suite for classroom roster parsing and table assignment.
+Run with: python test_classroom.py
+"""
+
+import unittest
+from classroom import parse_roster_csv, parse_roster_list, assign_to_tables
+
+
+class TestRosterParsing(unittest.TestCase):
+    """Test CSV and JSON roster validation."""
+
+    def test_parse_csv(self):
+        text = ("\ufeffName,Tolerance,Rating_Scale\n"
+                "Ada,100,yes\n"
+                "\n"
+                "Ben, 20 ,no\n"
+                "Cy,1000,\n")
+        roster = parse_roster_csv(text)
+        self.assertEqual(roster, [
+            {'name': 'Ada', 'guilt_tolerance': 100, 'use_rating_scale': True},
+            {'name': 'Ben', 'guilt_tolerance': 20, 'use_rating_scale': False},
+            {'name': 'Cy', 'guilt_tolerance': 1000, 'use_rating_scale': True},
+        ])
+
+    def test_guilt_tolerance_column(self):
+        roster = parse_roster_csv("name,guilt_tolerance\nAda,10\n")
+        self.assertEqual(roster[0]['guilt_tolerance'], 10)
+
+    def test_errors_name_the_line(self):
+        with self.assertRaisesRegex(ValueError, "Line 3: tolerance must be a whole number"):
+            parse_roster_csv("name,tolerance\nAda,100\nBen,lots\n")
+        with self.assertRaisesRegex(ValueError, "Line 2: tolerance must be greater than 1"):
+            parse_roster_csv("name,tolerance\nAda,1\n")
+        with self.assertRaisesRegex(ValueError, "Line 2: rating_scale"):
+            parse_roster_csv("name,tolerance,rating_scale\nAda,100,maybe\n")
+        with self.assertRaisesRegex(ValueError, "columns"):
+            parse_roster_csv("student,standard\nAda,100\n")
+        with self.assertRaisesRegex(ValueError, "no players"):
+            parse_roster_csv("name,tolerance\n")
+
+    def test_parse_list(self):
+        roster = parse_roster_list([{'name': 'Ada', 'tolerance': 100, 'rating_scale': False}])
+        self.assertEqual(roster, [{'name': 'Ada', 'guilt_tolerance': 100, 'use_rating_scale': False}])
+        with self.assertRaisesRegex(ValueError, "Entry 2: name is required"):
+            parse_roster_list([{'name': 'Ada', 'tolerance': 100}, {'tolerance': 100}])
+
+
+class TestTableAssignment(unittest.TestCase):
+    """Test that tables are balanced in size and tolerance."""
+
+    def roster(self, tolerances):
+        return [{'name': f"P{i}", 'guilt_tolerance': t, 'use_rating_scale': True}
+                for i, t in enumerate(tolerances)]
+
+    def test_snake_draft(self):
+        tables = assign_to_tables(self.roster([10, 20, 50, 100, 200, 1000, 5000]), 3, 12)
+        tolerances = [[entry['guilt_tolerance'] for entry in table] for table in tables]
+        self.assertEqual(tolerances, [[10, 1000, 5000], [20, 200], [50, 100]])
+
+    def test_every_player_seated_once(self):
+        roster = self.roster(range(2, 40))
+        tables = assign_to_tables(roster, 4, 10)
+        seated = sorted(entry['name'] for table in tables for entry in table)
+        self.assertEqual(seated, sorted(entry['name'] for entry in roster))
+        sizes = [len(table) for table in tables]
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+    def test_over_capacity(self):
+        with self.assertRaisesRegex(ValueError, "do not fit"):
+            assign_to_tables(self.roster(range(2, 12)), 3, 3)
+        with self.assertRaises(ValueError):
+            assign_to_tables(self.roster([10]), 0, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
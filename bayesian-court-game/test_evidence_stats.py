@@ -0,0 +1,103 @@
+# test_evidence_stats.py
+"""
+Test suite for the streaming per-evidence statistics.
+Run with: python test_evidence_stats.py
+"""
+
+import unittest
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+from evidence_stats import RunningMoments, EvidenceStats, EvidenceStatsRegistry
+
+
+class TestEvidenceStats(unittest.TestCase):
+    """Test moments, quantiles and cross-worker merging against exact values."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.gauss(3.0, 4.0) for _ in range(5000)]
+
+    def test_moments_match_exact(self):
+        """Test that Welford updates and merges reproduce the exact mean and variance."""
+        whole = RunningMoments()
+        left, right = RunningMoments(), RunningMoments()
+        for i, value in enumerate(self.values):
+            whole.add(value)
+            (left if i % 3 else right).add(value)
+        left.merge(right)
+
+        for moments in (whole, left):
+            self.assertEqual(moments.count, len(self.values))
+            self.assertAlmostEqual(moments.mean, statistics.fmean(self.values), places=9)
+            self.assertAlmostEqual(moments.variance, statistics.pvariance(self.values), places=6)
+            self.assertEqual(moments.minimum, min(self.values))
+            self.assertEqual(moments.maximum, max(self.values))
+
+    def test_quantiles_within_one_bin(self):
+        """Test that sketch quantiles land within one bin width of the exact ones."""
+        stats = EvidenceStats()
+        for value in self.values:
+            stats.add(value)
+        ordered = sorted(self.values)
+        summary = stats.summary()
+        for name, q in (('p10', 0.1), ('p50', 0.5), ('p90', 0.9)):
+            exact = ordered[math.ceil(q * len(ordered)) - 1]
+            self.assertLessEqual(abs(summary['quantiles'][name] - exact), 0.1)
+        self.assertAlmostEqual(summary['stddev_db'], statistics.pstdev(self.values), places=6)
+
+    def test_percentile_and_outliers(self):
+        """Test a value's percentile and that out-of-range values stay bounded by min/max."""
+        stats = EvidenceStats()
+        for value in [-100.0, 0.0, 0.0, 1.0, 100.0]:
+            stats.add(value)
+        summary = stats.summary(value=0.5)
+        self.assertEqual(summary['percentile'], 60.0)
+        self.assertEqual(summary['quantiles']['p10'], -100.0)
+        self.assertEqual(summary['quantiles']['p90'], 100.0)
+
+    def test_registry_merges_worker_snapshots(self):
+        """Test that each worker sees its own live data plus the others' snapshots."""
+        with tempfile.TemporaryDirectory() as directory:
+            first = EvidenceStatsRegistry(directory, worker_id='a')
+            second = EvidenceStatsRegistry(directory, worker_id='b')
+            first.record_many('hash1', 0, self.values[:3000])
+            second.record_many('hash1', 0, self.values[3000:])
+            second.record('hash1', 1, 2.5)
+
+            self.assertTrue(first.flush())
+            self.assertFalse(first.flush())
+            summary = second.summary('hash1', 0)
+            self.assertEqual(summary['count'], len(self.values))
+            self.assertAlmostEqual(summary['mean_db'], statistics.fmean(self.values), places=9)
+            # Item 1 only reaches the first worker once the second has flushed
+            self.assertIsNone(first.summary('hash1', 1))
+            second.flush()
+            self.assertEqual(first.summary('hash1', 1)['count'], 1)
+            self.assertIsNone(first.summary('hash2', 0))
+
+    def test_compact_absorbs_stale_snapshots(self):
+        """Test that a stopped worker's snapshot is folded into a live one and deleted."""
+        with tempfile.TemporaryDirectory() as directory:
+            stopped = EvidenceStatsRegistry(directory, worker_id='old')
+            stopped.record_many('hash1', 0, self.values[:100])
+            stopped.flush()
+            live = EvidenceStatsRegistry(directory, worker_id='new')
+            live.record_many('hash1', 0, self.values[100:200])
+            other = EvidenceStatsRegistry(directory, worker_id='other')
+
+            self.assertEqual(live.compact(stale_seconds=3600), 0)
+            stale = time.time() - 7200
+            os.utime(os.path.join(directory, 'evidence_stats_old.json'), (stale, stale))
+            self.assertEqual(live.compact(stale_seconds=3600), 1)
+            self.assertEqual(other.compact(stale_seconds=3600), 0)
+            self.assertEqual(os.listdir(directory), ['evidence_stats_new.json'])
+            self.assertEqual(live.summary('hash1', 0)['count'], 200)
+            self.assertEqual(other.summary('hash1', 0)['count'], 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# test_evidence_timers.py
+"""
+Test suite for evidence deadlines, quorum rules and the timer heap.
+Run with: python test_evidence_timers.py
+"""
+
+import random
+import unittest
+from evidence_timers import AdvancePolicy, EvidenceTimers, TimerHeap
+from fake_clock import FakeClock
+
+
+class TestAdvancePolicy(unittest.TestCase):
+    """Test parsing policies from request data."""
+
+    def test_from_dict(self):
+        default = AdvancePolicy(deadline_seconds=120, quorum=0.9, quorum_after_seconds=30)
+        self.assertEqual(AdvancePolicy.from_dict(None, default), default)
+        policy = AdvancePolicy.from_dict({'deadline_seconds': None, 'quorum': '0.75'}, default)
+        self.assertEqual(policy, AdvancePolicy(None, 0.75, 30.0))
+        self.assertEqual(policy.checkpoints(), [30.0])
+        self.assertEqual(default.checkpoints(), [30.0, 120.0])
+
+    def test_invalid(self):
+        for data in ({'quorum': 1.5}, {'deadline_seconds': 0}, {'quorum_after_seconds': -1},
+                     {'quorum': 'most'}, {'timeout': 10}):
+            with self.assertRaises(ValueError):
+                AdvancePolicy.from_dict(data)
+
+
+class TestTimerHeap(unittest.TestCase):
+    """Test scheduling, rescheduling and cancelling keyed timers."""
+
+    def test_pop_due_in_order(self):
+        timers = TimerHeap()
+        timers.schedule('b', 5)
+        timers.schedule('a', 3)
+        timers.schedule('c', 9)
+        timers.schedule('b', 1)
+        self.assertTrue(timers.cancel('c'))
+        self.assertEqual(timers.next_due(), 1)
+        self.assertEqual(timers.pop_due(4), ['b', 'a'])
+        self.assertEqual(timers.pop_due(100), [])
+        self.assertEqual(len(timers), 0)
+        self.assertIsNone(timers.next_due())
+
+    def test_many_timers(self):
+        rng = random.Random(5)
+        timers = TimerHeap()
+        expected = {}
+        for i in range(5000):
+            key = f"game_{rng.randrange(2000)}"
+            due = rng.uniform(0, 100)
+            timers.schedule(key, due)
+            expected[key] = due
+        popped = timers.pop_due(50)
+        self.assertEqual(sorted(popped), sorted(k for k, due in expected.items() if due <= 50))
+        self.assertEqual(len(timers), sum(1 for due in expected.values() if due > 50))
+
+
+class TestEvidenceTimers(unittest.TestCase):
+    """Test deadline and quorum decisions for open evidence."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.timers = EvidenceTimers(AdvancePolicy(deadline_seconds=60, quorum=0.9, quorum_after_seconds=20),
+                                     clock=self.clock)
+
+    def test_quorum_then_deadline(self):
+        self.timers.open('game_a', 0)
+        self.assertIsNone(self.timers.should_advance('game_a', 0, 1.0))
+
+        self.clock.now = 20
+        self.assertEqual(self.timers.due(), [('game_a', 0)])
+        self.assertIsNone(self.timers.should_advance('game_a', 0, 0.8))
+        self.assertEqual(self.timers.should_advance('game_a', 0, 0.9), 'quorum')
+
+        self.clock.now = 59
+        self.assertEqual(self.timers.due(), [])
+        self.clock.now = 60
+        self.assertEqual(self.timers.due(), [('game_a', 0)])
+        self.assertEqual(self.timers.should_advance('game_a', 0, 0.0), 'deadline')
+        self.clock.now = 1000
+        self.assertEqual(self.timers.due(), [])
+
+    def test_reopen_and_close(self):
+        self.timers.open('game_a', 0)
+        self.clock.now = 10
+        self.timers.open('game_a', 1)
+        self.clock.now = 25
+        # The first item's checkpoint was replaced when the next item opened
+        self.assertEqual(self.timers.due(), [])
+        self.assertIsNone(self.timers.should_advance('game_a', 0, 1.0))
+        self.clock.now = 30
+        self.assertEqual(self.timers.due(), [('game_a', 1)])
+
+        self.timers.close('game_a')
+        self.clock.now = 100
+        self.assertEqual(self.timers.due(), [])
+        self.assertIsNone(self.timers.should_advance('game_a', 1, 1.0))
+        self.assertEqual(len(self.timers), 0)
+
+    def test_per_game_policy(self):
+        self.timers.set_policy('game_b', AdvancePolicy(deadline_seconds=None, quorum=None))
+        self.timers.open('game_a', 0)
+        self.timers.open('game_b', 0)
+        self.clock.now = 1000
+        self.assertEqual(self.timers.due(), [('game_a', 0)])
+        self.assertIsNone(self.timers.should_advance('game_b', 0, 0.0))
+
+        self.timers.close('game_b', forget_policy=True)
+        self.assertEqual(self.timers.policy('game_b'), self.timers.default_policy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# test_game_index.py
+"""
+Test suite for the active game index.
+Run with: python test_game_index.py
+"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from bayesian_core import BayesianGame
+from game_index import GameIndex
+
+
+class TestGameIndex(unittest.TestCase):
+    """Test filtering, cursor paging and re-indexing against a plain scan."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.case_files = []
+        for name in ("alpha_case", "beta_case"):
+            case_file = os.path.join(self.temp_dir, f"{name}.json")
+            with open(case_file, 'w') as f:
+                json.dump({
+                    "case": {"name": name.title(), "description": "Test"},
+                    "prior": {"db": -20, "odds": "1 in 100"},
+                    "evidence": [{"name": "Evidence 1", "description": "Test",
+                                  "prob_guilty": 0.9, "prob_innocent": 0.1}]
+                }, f)
+            self.case_files.append(case_file)
+
+        self.index = GameIndex()
+        self.games = []
+        start = datetime(2025, 1, 1)
+        for i in range(30):
+            game = BayesianGame(self.case_files[i % 2], f"game_{i:02d}")
+            game.created_at = start + timedelta(minutes=i)
+            game.max_players = 2
+            if i % 3 == 0:
+                game.add_player("p1", "Player", 100)
+                game.start_game()
+            self.games.append(game)
+            self.index.update(game)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _all_pages(self, **filters):
+        ids, cursor = [], None
+        while True:
+            page, cursor = self.index.query(cursor=cursor, limit=4, **filters)
+            ids.extend(game['game_id'] for game in page)
+            if cursor is None:
+                return ids
+
+    def test_pages_match_scan(self):
+        """Test that paging through each filter returns exactly the matching games in order."""
+        self.assertEqual(self._all_pages(), [game.game_id for game in self.games])
+        self.assertEqual(self._all_pages(phase='case_presentation'),
+                         [game.game_id for i, game in enumerate(self.games) if i % 3 == 0])
+        self.assertEqual(self._all_pages(case='beta_case', joinable=True),
+                         [game.game_id for i, game in enumerate(self.games) if i % 2 == 1 and i % 3 != 0])
+        self.assertEqual(self.index.phase_counts()['setup'], 20)
+
+    def test_update_and_remove_reindex(self):
+        """Test that phase and player changes move a game between buckets."""
+        game = self.games[1]
+        game.add_player("p1", "Player", 100)
+        game.add_player("p2", "Player", 100)
+        self.index.update(game)
+        self.assertNotIn(game.game_id, self._all_pages(joinable=True))
+        self.assertEqual(self.index.get(game.game_id)['player_count'], 2)
+
+        self.assertTrue(self.index.remove(self.games[0].game_id))
+        self.assertFalse(self.index.remove(self.games[0].game_id))
+        self.assertNotIn(self.games[0].game_id, self._all_pages(phase='case_presentation'))
+        self.assertEqual(len(self.index), 29)
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        with self.assertRaises(ValueError):
+            self.index.query(cursor="not-a-cursor")
+
+
+if __name__ == "__main__":
+    unittest.main()
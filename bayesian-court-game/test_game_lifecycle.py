@@ -0,0 +1,107 @@
+# test_game_lifecycle.py
+"""
+Test suite for game lifecycle management.
+Run with: python test_game_lifecycle.py
+"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from bayesian_core import BayesianGame, GamePhase
+from game_lifecycle import GameLifecycleManager
+from fake_clock import FakeClock
+
+
+class TestGameLifecycleManager(unittest.TestCase):
+    """Test eviction, session cleanup and archival."""
+
+    def setUp(self):
+        """Create a case file, an archive directory and an empty manager."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.case_file = os.path.join(self.temp_dir, "test_case.json")
+        with open(self.case_file, 'w') as f:
+            json.dump({
+                "case": {"name": "Test Case", "description": "Test"},
+                "prior": {"db": -40, "odds": "1 in 10,000"},
+                "evidence": [{"name": "Evidence 1", "description": "Test evidence"}]
+            }, f)
+
+        self.archive_dir = os.path.join(self.temp_dir, "archive")
+        self.games = {}
+        self.sessions = {}
+        self.clock = FakeClock()
+        self.manager = GameLifecycleManager(
+            self.games, self.sessions, archive_dir=self.archive_dir,
+            max_games=3, clock=self.clock,
+            phase_ttls={GamePhase.SETUP: 100, GamePhase.VERDICT: 10}
+        )
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def _register(self, game_id):
+        game = BayesianGame(self.case_file, game_id)
+        self.manager.register_game(game_id, game)
+        return game
+
+    def test_drop_game_clears_sessions(self):
+        """Test that dropping a game removes every session pointing at it."""
+        self._register("g1")
+        self._register("g2")
+        self.manager.add_session("g1", "s1")
+        self.manager.add_session("g1", "s2")
+        self.manager.add_session("g2", "s3")
+
+        self.assertTrue(self.manager.drop_game("g1"))
+        self.assertNotIn("g1", self.games)
+        self.assertEqual(self.sessions, {"s3": "g2"})
+        self.assertFalse(self.manager.drop_game("g1"))
+
+    def test_game_cap_evicts_least_recently_used(self):
+        """Test that the game-count cap evicts the oldest idle game."""
+        for game_id in ("g1", "g2", "g3"):
+            self._register(game_id)
+        self.manager.touch("g1")
+
+        evicted = self.manager.register_game("g4", BayesianGame(self.case_file, "g4"))
+        self.assertEqual(evicted, ["g2"])
+        self.assertEqual(set(self.games), {"g1", "g3", "g4"})
+
+    def test_sweep_uses_phase_ttl(self):
+        """Test that idle games expire according to their phase."""
+        finished = self._register("finished")
+        finished.add_player("p1", "Alice", 100)
+        finished.start_game()
+        finished.advance_to_evidence_review()
+        finished.submit_evidence_response("p1", 0.8, 0.2)
+        finished.advance_evidence()
+        self.assertEqual(finished.phase, GamePhase.VERDICT)
+        self._register("waiting")
+
+        self.clock.now = 50
+        self.assertEqual(self.manager.sweep(), ["finished"])
+        self.assertEqual(set(self.games), {"waiting"})
+
+        self.clock.now = 150
+        self.assertEqual(self.manager.sweep(), ["waiting"])
+        self.assertEqual(self.games, {})
+
+    def test_finished_games_are_archived(self):
+        """Test that games in the verdict phase are saved before dropping."""
+        game = self._register("g1")
+        game.phase = GamePhase.VERDICT
+        self._register("g2")
+
+        self.manager.drop_game("g1")
+        self.manager.drop_game("g2")
+
+        archived = os.listdir(self.archive_dir)
+        self.assertEqual(len(archived), 1)
+        self.assertIn("_results_g1_", archived[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# test_handler_profiler.py
+"""
+Test suite for on-demand handler profiling.
+Run with: python test_handler_profiler.py
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from handler_profiler import HandlerProfiler
+
+
+class TestHandlerProfiler(unittest.TestCase):
+    """Test profiling sessions and their reports."""
+
+    def setUp(self):
+        """Create a profiler writing into a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.profiler = HandlerProfiler(output_dir=self.temp_dir)
+
+        @self.profiler.profiled('submit')
+        def submit(value):
+            """Busy handler."""
+            deadline = time.perf_counter() + 0.02
+            while time.perf_counter() < deadline:
+                value += 1
+            return value
+
+        @self.profiler.profiled('other')
+        def other():
+            return 'other'
+
+        self.submit = submit
+        self.other = other
+
+    def tearDown(self):
+        """Stop any session and clean up."""
+        self.profiler.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_handlers_run_without_session(self):
+        """Test that wrapped handlers behave normally when profiling is off."""
+        self.assertFalse(self.profiler.active)
+        self.assertGreater(self.submit(0), 0)
+        self.assertEqual(self.submit.__name__, 'submit')
+        self.assertEqual(self.profiler.status()['reports'], [])
+
+    def test_cprofile_stops_after_calls(self):
+        """Test a cProfile session limited by call count."""
+        self.profiler.start(['submit'], mode='cprofile', calls=2)
+        self.other()
+        self.submit(0)
+        self.assertTrue(self.profiler.active)
+        self.submit(0)
+        self.assertFalse(self.profiler.active)
+
+        # The report is written in the background, not by the handler
+        self.profiler.wait(timeout=5)
+        report = self.profiler.status()['reports'][0]
+        self.assertEqual(report['calls_by_event'], {'submit': 2})
+        self.assertTrue(os.path.exists(report['files']['prof']))
+        with open(self.profiler.report_path(report['profile_id'], 'txt')) as f:
+            self.assertIn('submit', f.read())
+
+    def test_sampling_collects_stacks(self):
+        """Test a sampling session stopped by hand."""
+        self.profiler.start(['submit'], mode='sampling', seconds=60, sample_interval=0.001)
+        for _ in range(5):
+            self.submit(0)
+        report = self.profiler.stop()
+
+        self.assertIsNotNone(report)
+        with open(report['files']['collapsed']) as f:
+            stacks = f.read()
+        self.assertIn('submit', stacks)
+
+    def test_invalid_sessions(self):
+        """Test argument validation and the single-session rule."""
+        with self.assertRaises(ValueError):
+            self.profiler.start(['submit'])
+        with self.assertRaises(ValueError):
+            self.profiler.start(['submit'], mode='unknown', calls=1)
+
+        with self.assertRaises(ValueError):
+            self.profiler.start(['submit'], seconds='soon')
+        with self.assertRaises(ValueError):
+            self.profiler.start(['submit'], calls=-1)
+
+        green = HandlerProfiler(output_dir=self.temp_dir, async_mode='eventlet')
+        with self.assertRaises(ValueError):
+            green.start(['submit'], mode='sampling', seconds=1)
+
+        self.profiler.start(['submit'], calls=10)
+        with self.assertRaises(ValueError):
+            self.profiler.start(['other'], calls=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
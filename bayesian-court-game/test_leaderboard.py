@@ -0,0 +1,64 @@
+# test_leaderboard.py
+"""
+Test suite for the calibration leaderboard.
+Run with: python test_leaderboard.py
+"""
+
+import unittest
+import random
+from leaderboard import Leaderboard
+
+
+class TestLeaderboard(unittest.TestCase):
+    """Test ranking, updates and paging against a sorted reference."""
+
+    def test_rank_and_top(self):
+        """Test that lower scores rank first and ties fall back to the key."""
+        board = Leaderboard(seed=1)
+        board.update("carol", 3.0, name="Carol")
+        board.update("alice", 1.5, name="Alice")
+        board.update("bob", 1.5, name="Bob")
+
+        self.assertEqual(board.rank("alice"), 1)
+        self.assertEqual(board.rank("bob"), 2)
+        self.assertEqual([entry['name'] for entry in board.top(2)], ["Alice", "Bob"])
+        self.assertEqual(board.top(5)[2], {'name': "Carol", 'key': "carol", 'score': 3.0, 'rank': 3})
+        self.assertIsNone(board.rank("dave"))
+
+    def test_update_moves_entry(self):
+        """Test that re-scoring an entry moves it instead of duplicating it."""
+        board = Leaderboard(seed=2)
+        for i, score in enumerate([5.0, 4.0, 3.0]):
+            board.update(f"p{i}", score)
+        self.assertEqual(board.update("p0", 0.5), 1)
+        self.assertEqual(len(board), 3)
+        self.assertEqual([entry['key'] for entry in board.top(3)], ["p0", "p2", "p1"])
+        self.assertTrue(board.remove("p2"))
+        self.assertEqual(board.rank("p1"), 2)
+
+    def test_matches_sorted_reference(self):
+        """Test many random updates and removals against sorting a dict."""
+        rng = random.Random(42)
+        board = Leaderboard(seed=3)
+        scores = {}
+        for _ in range(3000):
+            key = f"player_{rng.randrange(300)}"
+            if key in scores and rng.random() < 0.2:
+                board.remove(key)
+                del scores[key]
+            else:
+                scores[key] = round(rng.uniform(0, 20), 1)
+                board.update(key, scores[key])
+
+        expected = sorted(scores, key=lambda key: (scores[key], key))
+        self.assertEqual(len(board), len(expected))
+        self.assertEqual([entry['key'] for entry in board.top(len(expected))], expected)
+        for rank, key in enumerate(expected, 1):
+            self.assertEqual(board.rank(key), rank)
+        self.assertEqual([entry['key'] for entry in board.page(50, 10)], expected[49:59])
+        self.assertEqual([entry['rank'] for entry in board.around(expected[100], radius=2)],
+                         [99, 100, 101, 102, 103])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# test_matchmaking.py
+"""
+Test suite for the matchmaking queue.
+Run with: python test_matchmaking.py
+"""
+
+import random
+import unittest
+from matchmaking import MatchmakingQueue
+from fake_clock import FakeClock
+
+
+class TestMatchmakingQueue(unittest.TestCase):
+    """Test jury formation, balancing and the wait bound."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.queue = MatchmakingQueue(jury_size=3, max_wait=30, clock=self.clock)
+
+    def enqueue(self, player_id, tolerance, case_key='case_a.json'):
+        self.clock.now += 1
+        return self.queue.enqueue(player_id, case_key, player_id.title(), tolerance, sid=f"sid_{player_id}")
+
+    def test_full_jury_forms_on_enqueue(self):
+        self.assertEqual(self.enqueue('ada', 100), [])
+        self.assertEqual(self.enqueue('ben', 20), [])
+        self.assertEqual(self.enqueue('cy', 10, case_key='case_b.json'), [])
+        juries = self.enqueue('dee', 1000)
+        self.assertEqual(len(juries), 1)
+        jury = juries[0]
+        self.assertEqual(jury.case_key, 'case_a.json')
+        self.assertEqual([p['player_id'] for p in jury.players], ['ben', 'ada', 'dee'])
+        self.assertEqual(jury.players[0], {'player_id': 'ben', 'name': 'Ben', 'guilt_tolerance': 20,
+                                           'use_rating_scale': True, 'sid': 'sid_ben', 'waited': 2.0})
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue.waiting('case_a.json'), 0)
+        self.assertIn('cy', self.queue)
+
+    def test_jury_spans_tolerance_range(self):
+        queue = MatchmakingQueue(jury_size=4, max_wait=30, clock=self.clock)
+        rng = random.Random(7)
+        # Fill one case's queue without forming juries, then form one from it
+        queue.jury_size = 1000
+        tolerances = {f"p{i}": rng.choice([5, 10, 20, 50, 100, 200, 500, 1000]) for i in range(200)}
+        for player_id, tolerance in tolerances.items():
+            queue.enqueue(player_id, 'case', player_id, tolerance)
+        queue.jury_size = 4
+        jury = queue.enqueue('late', 'case', 'Late', 100)[0]
+        picked = sorted(p['guilt_tolerance'] for p in jury.players)
+        self.assertLessEqual(picked[0], 20)
+        self.assertGreaterEqual(picked[-1], 200)
+        # The longest-waiting player is always seated
+        self.assertIn('p0', [p['player_id'] for p in jury.players])
+
+    def test_wait_is_bounded(self):
+        self.enqueue('ada', 100)
+        self.enqueue('ben', 20, case_key='case_b.json')
+        self.clock.now = 31.5
+        self.assertEqual(self.queue.seconds_until_due(), 0.0)
+        juries = self.queue.poll()
+        self.assertEqual([(j.case_key, [p['player_id'] for p in j.players]) for j in juries],
+                         [('case_a.json', ['ada'])])
+        self.clock.now = 40
+        self.assertEqual([j.case_key for j in self.queue.poll()], ['case_b.json'])
+        self.assertIsNone(self.queue.seconds_until_due())
+
+    def test_min_jury_size_defers_short_cases(self):
+        queue = MatchmakingQueue(jury_size=3, max_wait=10, min_jury_size=2, clock=self.clock)
+        queue.enqueue('ada', 'case_a', 'Ada', 100)
+        queue.enqueue('ben', 'case_b', 'Ben', 100)
+        queue.enqueue('cy', 'case_b', 'Cy', 10)
+        self.clock.now = 11
+        juries = queue.poll()
+        self.assertEqual([j.case_key for j in juries], ['case_b'])
+        self.assertIn('ada', queue)
+        self.assertEqual(queue.poll(), [])
+
+    def test_cancel_and_requeue(self):
+        self.enqueue('ada', 100)
+        self.assertTrue(self.queue.cancel('ada'))
+        self.assertFalse(self.queue.cancel('ada'))
+        self.enqueue('ben', 100)
+        self.enqueue('ben', 100, case_key='case_b.json')
+        self.assertEqual(self.queue.waiting('case_a.json'), 0)
+        self.assertEqual(self.queue.waiting('case_b.json'), 1)
+        self.clock.now = 100
+        juries = self.queue.poll()
+        self.assertEqual([[p['player_id'] for p in j.players] for j in juries], [['ben']])
+        self.assertEqual(len(self.queue), 0)
+
+    def test_invalid_tolerance_leaves_queue_untouched(self):
+        for tolerance in (1, 0, -5):
+            with self.assertRaises(ValueError):
+                self.enqueue('ada', tolerance)
+        self.assertEqual(len(self.queue), 0)
+        self.assertNotIn('ada', self.queue)
+
+    def test_every_player_matched_once(self):
+        rng = random.Random(3)
+        seen = []
+        for i in range(500):
+            self.clock.now += rng.random()
+            case_key = rng.choice(['a', 'b', 'c'])
+            for jury in self.queue.enqueue(f"p{i}", case_key, f"P{i}", rng.choice([10, 100, 1000])):
+                self.assertEqual(len(jury.players), 3)
+                seen.extend(p['player_id'] for p in jury.players)
+            for jury in self.queue.poll():
+                seen.extend(p['player_id'] for p in jury.players)
+        self.clock.now += 31
+        for jury in self.queue.poll():
+            seen.extend(p['player_id'] for p in jury.players)
+        self.assertEqual(sorted(seen), sorted(f"p{i}" for i in range(500)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# test_metrics.py
+"""
+Test suite for the server metrics registry.
+Run with: python test_metrics.py
+"""
+
+import unittest
+from metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test metric recording and Prometheus text rendering."""
+
+    def setUp(self):
+        """Create an empty registry."""
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        """Test that labelled counters render one sample per label set."""
+        events = self.registry.counter('events_total', 'Events.', ['event'])
+        events.labels('join_game').inc()
+        events.labels('join_game').inc()
+        events.labels('submit').inc(3)
+
+        output = self.registry.render()
+        self.assertIn('# TYPE events_total counter', output)
+        self.assertIn('events_total{event="join_game"} 2', output)
+        self.assertIn('events_total{event="submit"} 3', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket, sum and count lines."""
+        latency = self.registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            latency.observe(value)
+
+        output = self.registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', output)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', output)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', output)
+        self.assertIn('latency_seconds_sum 6.05', output)
+        self.assertIn('latency_seconds_count 4', output)
+
+    def test_callback_gauge(self):
+        """Test that callback gauges are evaluated at render time."""
+        games = {'setup': 2}
+        self.registry.callback_gauge('games', 'Games.', ['phase'],
+                                     lambda: {(phase,): count for phase, count in games.items()})
+        self.assertIn('games{phase="setup"} 2', self.registry.render())
+
+        games['verdict'] = 1
+        self.assertIn('games{phase="verdict"} 1', self.registry.render())
+
+    def test_label_values_are_escaped(self):
+        """Test escaping of quotes and backslashes in label values."""
+        counter = self.registry.counter('names_total', 'Names.', ['name'])
+        counter.labels('say "hi"\\').inc()
+        self.assertIn('names_total{name="say \\"hi\\"\\\\"} 1', self.registry.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
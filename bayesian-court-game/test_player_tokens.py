@@ -0,0 +1,37 @@
+# test_player_tokens.py
+"""
+Test suite for the signed player tokens used to rejoin after a reconnect.
+Run with: python test_player_tokens.py
+"""
+
+import unittest
+from player_tokens import PlayerTokens
+
+
+class TestPlayerTokens(unittest.TestCase):
+    """Test that a token gives back its own player id and nobody else's."""
+
+    def setUp(self):
+        self.tokens = PlayerTokens('test-secret')
+
+    def test_round_trip(self):
+        player_id = '6f1c2d9e-0b7a-4a51-9d3e-2c8f5b1a7e40'
+        token = self.tokens.issue(player_id)
+        self.assertEqual(self.tokens.verify(token), player_id)
+        # A fresh server process with the same secret accepts it too
+        self.assertEqual(PlayerTokens('test-secret').verify(token), player_id)
+
+    def test_rejects_forged_tokens(self):
+        token = self.tokens.issue('alice')
+        _, signature = token.rsplit('.', 1)
+        for forged in (f"bob.{signature}", 'alice', 'alice.', f".{signature}", '',
+                       None, 42, PlayerTokens('other-secret').issue('alice')):
+            self.assertIsNone(self.tokens.verify(forged))
+
+    def test_secret_required(self):
+        with self.assertRaises(ValueError):
+            PlayerTokens('')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# test_rate_limiter.py
+"""
+Test suite for rate limiting and admission control.
+Run with: python test_rate_limiter.py
+"""
+
+import unittest
+from rate_limiter import (
+    TokenBucket,
+    KeyedRateLimiter,
+    RateLimitPolicy,
+    AdmissionController
+)
+from fake_clock import FakeClock
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test the TokenBucket class."""
+
+    def test_burst_then_refill(self):
+        """Test that a bucket allows a burst and refills over time."""
+        bucket = TokenBucket(rate=2, capacity=3, now=0)
+        self.assertTrue(all(bucket.consume(0) for _ in range(3)))
+        self.assertFalse(bucket.consume(0))
+
+        # Half a second at 2 tokens/second refills one token
+        self.assertTrue(bucket.consume(0.5))
+        self.assertFalse(bucket.consume(0.5))
+
+        # Refill never exceeds capacity
+        bucket.consume(100)
+        self.assertAlmostEqual(bucket.tokens, 2)
+
+
+class TestRateLimitPolicy(unittest.TestCase):
+    """Test per-session and per-IP limits."""
+
+    def setUp(self):
+        """Set up a policy with one limited action."""
+        self.clock = FakeClock()
+        self.policy = RateLimitPolicy(
+            {'submit': {'session': (1, 2), 'ip': (1, 3)}}, clock=self.clock
+        )
+
+    def test_session_limit(self):
+        """Test that one session is limited independently of others."""
+        self.assertTrue(self.policy.allow('submit', 's1'))
+        self.assertTrue(self.policy.allow('submit', 's1'))
+        self.assertFalse(self.policy.allow('submit', 's1'))
+        self.assertTrue(self.policy.allow('submit', 's2'))
+
+    def test_ip_limit(self):
+        """Test that sessions sharing an IP share the IP bucket."""
+        results = [self.policy.allow('submit', f's{i}', '10.0.0.1') for i in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertTrue(self.policy.allow('submit', 's9', '10.0.0.2'))
+
+    def test_unlimited_action(self):
+        """Test that actions without limits are always allowed."""
+        for _ in range(100):
+            self.assertTrue(self.policy.allow('other', 's1', '10.0.0.1'))
+
+    def test_key_table_is_bounded(self):
+        """Test that the bucket table never grows past max_keys."""
+        limiter = KeyedRateLimiter(rate=1, capacity=1, max_keys=10, clock=self.clock)
+        for i in range(100):
+            limiter.allow(f"key{i}")
+        self.assertEqual(len(limiter), 10)
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test global game and player caps."""
+
+    def test_caps(self):
+        """Test that requests over the caps report a server busy error."""
+        admission = AdmissionController(max_games=2, max_players=10)
+
+        self.assertTrue(admission.can_admit_game(1)[0])
+        is_admitted, message = admission.can_admit_game(2)
+        self.assertFalse(is_admitted)
+        self.assertIn("Server busy", message)
+
+        self.assertTrue(admission.can_admit_player(9)[0])
+        self.assertFalse(admission.can_admit_player(10)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# test_result_archive.py
+"""
+Test suite for the rolling compressed result archive.
+Run with: python test_result_archive.py
+"""
+
+import unittest
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from result_archive import ResultArchive, INDEX_FILENAME
+from result_writer import ResultWriter
+
+
+def make_results(game_id):
+    return {'game_id': game_id, 'final_verdict': 'GUILTY', 'players': {'p1': {'name': 'Alice'}}}
+
+
+class TestResultArchive(unittest.TestCase):
+    """Test appending, rotation, lookups and crash recovery."""
+
+    def setUp(self):
+        """Create an archive directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.directory = os.path.join(self.temp_dir, "archive")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_single_game(self):
+        """Test fetching one game from a multi-record block."""
+        archive = ResultArchive(self.directory)
+        archive.append_many([make_results(f"game_{i}") for i in range(5)])
+        archive.append(make_results("game_5"))
+
+        self.assertEqual(archive.get("game_3")['game_id'], "game_3")
+        self.assertEqual(archive.get("game_5")['game_id'], "game_5")
+        self.assertIsNone(archive.get("missing"))
+        self.assertEqual(len(archive), 6)
+
+    def test_segments_are_valid_gzip_streams(self):
+        """Test that concatenated blocks read back as one JSONL stream."""
+        archive = ResultArchive(self.directory)
+        archive.append(make_results("game_1"))
+        archive.append(make_results("game_2"))
+
+        with gzip.open(os.path.join(self.directory, archive.segments()[0]), 'rt') as f:
+            ids = [json.loads(line)['game_id'] for line in f]
+        self.assertEqual(ids, ["game_1", "game_2"])
+
+    def test_rotation_and_reopen(self):
+        """Test that segments rotate by size and the index survives a restart."""
+        archive = ResultArchive(self.directory, max_segment_bytes=1)
+        for i in range(3):
+            archive.append(make_results(f"game_{i}"))
+        self.assertEqual(len(archive.segments()), 3)
+
+        reopened = ResultArchive(self.directory, max_segment_bytes=1)
+        self.assertEqual(reopened.get("game_1")['game_id'], "game_1")
+        reopened.append(make_results("game_3"))
+        self.assertEqual(len(reopened.segments()), 4)
+        self.assertEqual([r['game_id'] for r in reopened.iter_records()],
+                         ["game_0", "game_1", "game_2", "game_3"])
+
+    def test_unindexed_tail_is_truncated(self):
+        """Test recovery from a block written without its index entry."""
+        archive = ResultArchive(self.directory)
+        archive.append(make_results("game_1"))
+        segment = os.path.join(self.directory, archive.segments()[0])
+        size = os.path.getsize(segment)
+        with open(segment, 'ab') as f:
+            f.write(gzip.compress(b'{"game_id":"torn"}\n'))
+        with open(os.path.join(self.directory, INDEX_FILENAME), 'a') as f:
+            f.write('{"game_id":"torn","seg')
+
+        reopened = ResultArchive(self.directory)
+        self.assertEqual(os.path.getsize(segment), size)
+        self.assertNotIn("torn", reopened)
+        self.assertEqual(reopened.get("game_1")['game_id'], "game_1")
+
+    def test_writer_archive_mode(self):
+        """Test that the background writer appends to the archive instead of writing files."""
+        archive = ResultArchive(self.directory)
+        writer = ResultWriter(archive=archive)
+        for i in range(4):
+            writer.submit(os.path.join(self.temp_dir, f"game_{i}.json"), make_results(f"game_{i}"))
+        writer.close()
+
+        self.assertEqual(writer.stats()['written'], 4)
+        self.assertEqual(len(archive), 4)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "game_0.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
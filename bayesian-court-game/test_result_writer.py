@@ -0,0 +1,102 @@
+# test_result_writer.py
+"""
+Test suite for the background result writer.
+Run with: python test_result_writer.py
+"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from result_writer import ResultWriter
+
+
+class TestResultWriter(unittest.TestCase):
+    """Test queued, batched and atomic result writes."""
+
+    def setUp(self):
+        """Create an output directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.written = []
+        self.writer = ResultWriter(max_queue=10, batch_size=4,
+                                   on_written=lambda name, seconds: self.written.append(name))
+
+    def tearDown(self):
+        """Stop the writer and clean up."""
+        self.writer.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_writes_are_complete_and_compact(self):
+        """Test that every queued result ends up as a full JSON file."""
+        filenames = [os.path.join(self.temp_dir, "nested", f"results_{i}.json") for i in range(10)]
+        for i, filename in enumerate(filenames):
+            self.assertTrue(self.writer.submit(filename, {'game_id': f"game_{i}", 'players': {}}))
+
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(sorted(self.written), sorted(filenames))
+        self.assertEqual(self.writer.stats()['written'], 10)
+
+        with open(filenames[3]) as f:
+            content = f.read()
+        self.assertEqual(json.loads(content)['game_id'], "game_3")
+        self.assertNotIn('\n', content)
+
+        # No temporary files are left behind
+        leftovers = [name for name in os.listdir(os.path.dirname(filenames[0])) if name.startswith('.tmp_')]
+        self.assertEqual(leftovers, [])
+
+    def test_close_drains_queue(self):
+        """Test that closing the writer finishes queued writes."""
+        filename = os.path.join(self.temp_dir, "last.json")
+        self.writer.submit(filename, {'game_id': 'last'})
+        self.writer.close()
+        self.assertTrue(os.path.exists(filename))
+
+    def test_full_queue_returns_at_once(self):
+        """Test that submit never waits on a full queue and overflowed results are still written."""
+        release = threading.Event()
+        writer = ResultWriter(max_queue=1, batch_size=1,
+                              on_batch=lambda batch: batch[0][1]['n'] == 0 and release.wait(5))
+        try:
+            names = [os.path.join(self.temp_dir, f"r{i}.json") for i in range(4)]
+            self.assertTrue(writer.submit(names[0], {'n': 0}))
+            # Wait until the worker is busy with the first file
+            while writer.pending:
+                time.sleep(0.001)
+            self.assertTrue(writer.submit(names[1], {'n': 1}))
+            started = time.perf_counter()
+            self.assertFalse(writer.submit(names[2], {'n': 2}))
+            self.assertFalse(writer.submit(names[3], {'n': 3}))
+            self.assertLess(time.perf_counter() - started, 0.5)
+            # Nothing is written on the caller's thread
+            self.assertFalse(os.path.exists(names[2]))
+            self.assertEqual(writer.pending, 3)
+            self.assertFalse(writer.flush(timeout=0.05))
+
+            release.set()
+            self.assertTrue(writer.flush(timeout=5))
+            self.assertTrue(all(os.path.exists(name) for name in names))
+            self.assertEqual(writer.stats()['overflowed'], 2)
+            self.assertEqual(writer.stats()['written'], 4)
+        finally:
+            release.set()
+            writer.close()
+
+    def test_failed_write_is_counted(self):
+        """Test that unserializable results fail without breaking the writer."""
+        bad = os.path.join(self.temp_dir, "bad.json")
+        good = os.path.join(self.temp_dir, "good.json")
+        self.writer.submit(bad, {'value': float('nan'), 'nested': {1j: 'complex key'}})
+        self.writer.submit(good, {'ok': True})
+        self.writer.flush(timeout=5)
+
+        self.assertFalse(os.path.exists(bad))
+        self.assertTrue(os.path.exists(good))
+        self.assertEqual(self.writer.stats()['failed'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
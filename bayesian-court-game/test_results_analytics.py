@@ -0,0 +1,98 @@
+# test_results_analytics.py
+"""
+Test suite for the batch results analytics.
+Run with: python test_results_analytics.py
+"""
+
+import unittest
+import json
+import math
+import os
+import shutil
+import tempfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def played_file(db_updates, threshold_db):
+    """A command-line played record for a two-item case with known reference dB."""
+    evidence = [
+        {"name": "Evidence 1", "description": "Test", "prob_guilty": 0.9, "prob_innocent": 0.1},
+        {"name": "Evidence 2", "description": "Test", "prob_guilty": 0.5, "prob_innocent": 0.5},
+    ]
+    final_db = -20 + sum(db_updates)
+    return {
+        "case": {"name": "Test Case", "description": "Test"},
+        "prior": {"db": -20},
+        "evidence": evidence,
+        "player_responses": [
+            {"evidence_index": i, "evidence_name": item["name"], "db_update": db}
+            for i, (item, db) in enumerate(zip(evidence, db_updates))
+        ],
+        "final_evidence_db": final_db,
+        "guilt_threshold_db": threshold_db,
+        "verdict": "GUILTY" if final_db >= threshold_db else "NOT GUILTY",
+    }
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestResultsAnalytics(unittest.TestCase):
+    """Test aggregation and summary statistics across files and workers."""
+
+    def setUp(self):
+        """Write a directory of played files."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.plays = [([10.0, 0.0], 20.0), ([8.0, 2.0], 20.0), ([45.0, 5.0], 30.0)]
+        for i, (db_updates, threshold) in enumerate(self.plays):
+            filename = os.path.join(self.temp_dir, f"test_case_played_2025010{i + 1}_120000.json")
+            with open(filename, 'w') as f:
+                json.dump(played_file(db_updates, threshold), f)
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_evidence_statistics(self):
+        """Test per-evidence mean, variance and bias against the case's dB."""
+        from results_analytics import analyze, summarize
+
+        summary = summarize(analyze([self.temp_dir], workers=1))
+        self.assertEqual(summary['games'], 3)
+
+        first = summary['evidence'][0]
+        values = [10.0, 8.0, 45.0]
+        mean = sum(values) / 3
+        actual = 10 * math.log10(9)
+        self.assertEqual(first['responses'], 3)
+        self.assertAlmostEqual(first['mean_player_db'], mean)
+        self.assertAlmostEqual(first['variance_player_db'], sum((v - mean) ** 2 for v in values) / 3)
+        self.assertAlmostEqual(first['bias_db'], mean - actual)
+        self.assertAlmostEqual(first['mae_db'], sum(abs(v - actual) for v in values) / 3)
+
+    def test_conviction_by_tolerance(self):
+        """Test conviction rates grouped by tolerance decade."""
+        from results_analytics import analyze, summarize
+
+        rows = summarize(analyze([self.temp_dir], workers=1))['conviction_by_tolerance']
+        # Thresholds of 20 dB and 30 dB are tolerances of 100 and 1000
+        self.assertEqual([(row['tolerance_from'], row['players']) for row in rows], [(100, 2), (1000, 1)])
+        self.assertEqual(rows[0]['conviction_rate'], 0.0)
+        self.assertEqual(rows[1]['conviction_rate'], 1.0)
+
+    def test_parallel_matches_inline(self):
+        """Test that merging chunks from worker processes gives the same result."""
+        from results_analytics import analyze, summarize
+
+        inline = summarize(analyze([self.temp_dir], workers=1))
+        parallel = summarize(analyze([self.temp_dir], workers=2, chunk_size=1))
+        self.assertEqual(parallel['games'], inline['games'])
+        for a, b in zip(inline['evidence'], parallel['evidence']):
+            self.assertAlmostEqual(a['mean_player_db'], b['mean_player_db'])
+            self.assertAlmostEqual(a['rmse_db'], b['rmse_db'])
+
+
+if __name__ == "__main__":
+    unittest.main()
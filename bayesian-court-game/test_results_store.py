@@ -0,0 +1,129 @@
+# test_results_store.py
+"""
+Test suite for the SQLite results warehouse.
+Run with: python test_results_store.py
+"""
+
+import unittest
+import json
+import math
+import os
+import shutil
+import tempfile
+from bayesian_core import BayesianGame, CaseStore
+from results_store import ResultsStore
+
+
+class TestResultsStore(unittest.TestCase):
+    """Test loading server and command-line results and querying them."""
+
+    def setUp(self):
+        """Create a case file and an empty store."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.case_file = os.path.join(self.temp_dir, "test_case.json")
+        with open(self.case_file, 'w') as f:
+            json.dump({
+                "case": {"name": "Test Case", "description": "Test"},
+                "prior": {"db": -20, "odds": "1 in 100"},
+                "evidence": [
+                    {"name": "Evidence 1", "description": "Test", "prob_guilty": 0.9, "prob_innocent": 0.1},
+                    {"name": "Evidence 2", "description": "Test", "prob_guilty": 0.5, "prob_innocent": 0.5}
+                ]
+            }, f)
+        self.store = ResultsStore(os.path.join(self.temp_dir, "results.db"))
+
+    def tearDown(self):
+        """Close the store and clean up."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _played_game(self, game_id, answers):
+        """Play a game where each player gives (prob_guilty, prob_innocent) for every item."""
+        game = BayesianGame(self.case_file, game_id)
+        for player_id in answers:
+            game.add_player(player_id, player_id.title(), 100)
+        game.start_game()
+        game.advance_to_evidence_review()
+        for index in range(2):
+            for player_id, (prob_guilty, prob_innocent) in answers.items():
+                game.submit_evidence_response(player_id, prob_guilty, prob_innocent)
+            game.advance_evidence()
+        return game
+
+    def test_evidence_summary(self):
+        """Test mean player dB per evidence item across games."""
+        batch = [
+            ("a_results.json", self._played_game("game_a", {"alice": (0.9, 0.1), "bob": (0.5, 0.5)}).build_results()),
+            ("b_results.json", self._played_game("game_b", {"carol": (0.8, 0.2)}).build_results()),
+        ]
+        self.assertEqual(self.store.insert_many(batch), 2)
+
+        summary = self.store.evidence_summary("test_case")
+        self.assertEqual([row['evidence_index'] for row in summary], [0, 1])
+        first = summary[0]
+        expected = [10 * math.log10(9), 0.0, 10 * math.log10(4)]
+        self.assertEqual(first['responses'], 3)
+        self.assertEqual(first['name'], "Evidence 1")
+        self.assertAlmostEqual(first['mean_player_db'], sum(expected) / 3)
+        self.assertAlmostEqual(first['actual_db'], 10 * math.log10(9))
+
+        cases = self.store.case_summary()
+        self.assertEqual(cases[0]['games'], 2)
+        self.assertEqual(cases[0]['players'], 3)
+
+    def test_case_resolved_from_case_store(self):
+        """Test that results referencing their case by hash still get evidence rows."""
+        case_store = CaseStore(os.path.join(self.temp_dir, "cases"))
+        store = ResultsStore(":memory:", case_store=case_store)
+        results = self._played_game("game_a", {"alice": (0.9, 0.1)}).build_results(case_store)
+
+        self.assertTrue(store.insert_results("a_results.json", results))
+        summary = store.evidence_summary("test_case")
+        self.assertEqual(summary[1]['name'], "Evidence 2")
+        self.assertAlmostEqual(summary[1]['actual_db'], 0.0)
+        self.assertEqual(store.case_summary()[0]['case_name'], "Test Case")
+        store.close()
+
+    def test_insert_is_idempotent(self):
+        """Test that the same results file is only stored once."""
+        results = self._played_game("game_a", {"alice": (0.9, 0.1)}).build_results()
+        self.assertTrue(self.store.insert_results("a_results.json", results))
+        self.assertFalse(self.store.insert_results("a_results.json", results))
+        self.assertEqual(self.store.stats()['games'], 1)
+        self.assertEqual(self.store.stats()['responses'], 2)
+
+    def test_backfill_imports_both_formats(self):
+        """Test importing server results and command-line played files from a directory."""
+        archive = os.path.join(self.temp_dir, "archive")
+        os.makedirs(archive)
+        game = self._played_game("game_a", {"alice": (0.9, 0.1)})
+        game.save_game_results(os.path.join(archive, "test_case_results_game_a_20250101_120000.json"))
+
+        with open(os.path.join(archive, "test_case_played_20250102_093000_sheet7.json"), 'w') as f:
+            json.dump({
+                "case": {"name": "Test Case"},
+                "prior": {"db": -20},
+                "evidence": [{"name": "Evidence 1", "prob_guilty": 0.9, "prob_innocent": 0.1}],
+                "player_responses": [{
+                    "evidence_index": 0, "evidence_name": "Evidence 1",
+                    "player_prob_guilty": 0.5, "player_prob_innocent": 0.5,
+                    "used_rating_scale": True, "db_update": 0.0,
+                    "player_guilty_rating": 5, "player_innocent_rating": 5
+                }],
+                "final_evidence_db": -20.0,
+                "guilt_threshold_db": 20.0,
+                "verdict": "NOT GUILTY"
+            }, f)
+
+        self.assertEqual(self.store.import_paths([archive]), {'imported': 2, 'skipped': 0, 'failed': 0})
+        self.assertEqual(self.store.import_paths([archive]), {'imported': 0, 'skipped': 2, 'failed': 0})
+
+        games = self.store.recent_games(case_key="test_case")
+        self.assertEqual([row['source'] for row in games], ['server', 'cli'])
+        self.assertEqual(games[1]['completed_at'], "2025-01-02T09:30:00")
+        self.assertEqual(self.store._query("SELECT name FROM players WHERE player_id = 'cli'"), [{'name': 'sheet7'}])
+        self.assertEqual(self.store.evidence_summary("test_case")[0]['responses'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# test_room_events.py
+"""
+Test suite for per-room event replay buffers.
+Run with: python test_room_events.py
+"""
+
+import unittest
+from room_events import RoomEventLog, RoomEventLogs
+
+
+class TestRoomEventLog(unittest.TestCase):
+    """Test revision numbering and replay from the ring buffer."""
+
+    def test_replay_missed_events(self):
+        log = RoomEventLog(capacity=4)
+        self.assertEqual(log.since(0), [])
+        for i in range(3):
+            self.assertEqual(log.append('response_received', {'n': i}), i + 1)
+        self.assertEqual(log.since(1), [(2, 'response_received', {'n': 1}),
+                                        (3, 'response_received', {'n': 2})])
+        self.assertEqual(log.since(3), [])
+        self.assertIsNone(log.since(4))
+
+    def test_wraparound_reports_gap(self):
+        log = RoomEventLog(capacity=4)
+        for i in range(10):
+            log.append('event', {'n': i})
+        self.assertEqual(len(log), 4)
+        self.assertEqual(log.oldest_revision, 7)
+        self.assertEqual([revision for revision, _, _ in log.since(6)], [7, 8, 9, 10])
+        self.assertIsNone(log.since(5))
+
+    def test_registry(self):
+        logs = RoomEventLogs(capacity=2)
+        self.assertEqual(logs.replay('game_a', 0), [])
+        self.assertIsNone(logs.replay('game_a', 3))
+        logs.record('game_a', 'game_started', {})
+        logs.record('game_b', 'game_started', {})
+        self.assertEqual(logs.record('game_a', 'player_left', {'player_id': 'p1'}), 2)
+        self.assertEqual(logs.revision('game_a'), 2)
+        self.assertEqual(logs.replay('game_a', 1), [(2, 'player_left', {'player_id': 'p1'})])
+        logs.drop('game_a')
+        self.assertNotIn('game_a', logs)
+        self.assertEqual(logs.revision('game_a'), 0)
+        self.assertIn('game_b', logs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# test_spectator_frames.py
+"""
+Test suite for spectator tracking and shared frames.
+Run with: python test_spectator_frames.py
+"""
+
+import json
+import unittest
+from spectator_frames import SpectatorFrames
+
+
+class TestSpectatorFrames(unittest.TestCase):
+    """Test that frames are encoded once per revision and spectators are tracked."""
+
+    def setUp(self):
+        self.frames = SpectatorFrames()
+        self.builds = 0
+
+    def build(self, revision):
+        def build():
+            self.builds += 1
+            return {'revision': revision, 'game_state': {'phase': 'setup'}}
+        return build
+
+    def test_frame_encoded_once_per_revision(self):
+        first = self.frames.frame('game_a', 3, self.build(3))
+        again = self.frames.frame('game_a', 3, self.build(3))
+        self.assertIs(first, again)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(json.loads(first.decode('utf-8')), {'revision': 3, 'game_state': {'phase': 'setup'}})
+
+        self.frames.frame('game_a', 4, self.build(4))
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(self.frames.frames_encoded, 2)
+
+    def test_older_frame_does_not_replace_newer(self):
+        self.frames.frame('game_a', 5, self.build(5))
+        self.frames.frame('game_a', 4, self.build(4))
+        self.frames.frame('game_a', 5, self.build(5))
+        self.assertEqual(self.builds, 2)
+
+    def test_spectator_tracking(self):
+        self.assertIsNone(self.frames.add('sid1', 'game_a'))
+        self.frames.add('sid2', 'game_a')
+        self.assertEqual(self.frames.add('sid2', 'game_b'), 'game_a')
+        self.assertEqual((self.frames.count('game_a'), self.frames.count('game_b')), (1, 1))
+        self.assertEqual(self.frames.total(), 2)
+
+        self.assertEqual(self.frames.remove('sid1'), 'game_a')
+        self.assertIsNone(self.frames.remove('sid1'))
+        self.assertEqual(self.frames.count('game_a'), 0)
+
+        self.frames.frame('game_b', 1, self.build(1))
+        self.assertEqual(self.frames.drop('game_b'), ['sid2'])
+        self.assertEqual(self.frames.total(), 0)
+        self.frames.frame('game_b', 1, self.build(1))
+        self.assertEqual(self.builds, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
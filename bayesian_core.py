@@ -7,8 +7,10 @@ Extracted and refactored from the original single-player version.
 import math
 import json
 import os
+import hashlib
+import tempfile
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -35,6 +37,9 @@ class PlayerResponse:
     guilty_rating: Optional[int] = None
     innocent_rating: Optional[int] = None
     timestamp: str = None
+    # Calibration against the case's reference probabilities, if it has them
+    abs_error_db: Optional[float] = None
+    log_score: Optional[float] = None
     
     def __post_init__(self):
         if self.timestamp is None:
@@ -52,11 +57,30 @@ class PlayerState:
     responses: List[PlayerResponse]
     use_rating_scale: bool
     is_connected: bool = True
+    scored_responses: int = 0
+    total_abs_error_db: float = 0.0
+    total_log_score: float = 0.0
     
     def add_response(self, response: PlayerResponse):
-        """Add a response and update current evidence level."""
+        """Add a response and update current evidence level and calibration totals."""
         self.responses.append(response)
         self.current_evidence_db += response.db_update
+        if response.abs_error_db is not None:
+            self.scored_responses += 1
+            self.total_abs_error_db += response.abs_error_db
+            self.total_log_score += response.log_score
+    
+    def mean_abs_error_db(self) -> Optional[float]:
+        """Average distance in dB from the case's reference updates."""
+        if not self.scored_responses:
+            return None
+        return self.total_abs_error_db / self.scored_responses
+    
+    def mean_log_score(self) -> Optional[float]:
+        """Average log score per scored response (0 is perfect)."""
+        if not self.scored_responses:
+            return None
+        return self.total_log_score / self.scored_responses
     
     def get_current_guilt_probability(self) -> float:
         """Get current probability of guilt as percentage."""
@@ -118,6 +142,31 @@ class BayesianCalculator:
         """Convert integer rating (0-10) to probability."""
         return BayesianCalculator.RATING_TO_PROBABILITY.get(rating, 0.5)
     
+    @staticmethod
+    def log_score(prob: float, reference: float) -> float:
+        """
+        Expected log score (bits) of estimating prob when reference is the
+        true probability, relative to estimating reference itself.
+        This is minus the KL divergence: 0 is perfect, lower is worse.
+        """
+        prob = min(max(prob, 1e-6), 1 - 1e-6)
+        reference = min(max(reference, 1e-6), 1 - 1e-6)
+        return -(reference * math.log2(reference / prob)
+                 + (1 - reference) * math.log2((1 - reference) / (1 - prob)))
+    
+    @staticmethod
+    def score_response(prob_guilty: float, prob_innocent: float,
+                       reference_guilty: float, reference_innocent: float) -> Tuple[float, float]:
+        """
+        Score a player's assessment against the case's reference probabilities.
+        Returns: (absolute dB error, log score of both probabilities)
+        """
+        abs_error_db = abs(BayesianCalculator.calculate_db_update(prob_guilty, prob_innocent)
+                           - BayesianCalculator.calculate_db_update(reference_guilty, reference_innocent))
+        log_score = (BayesianCalculator.log_score(prob_guilty, reference_guilty)
+                     + BayesianCalculator.log_score(prob_innocent, reference_innocent))
+        return abs_error_db, log_score
+    
     @staticmethod
     def average_evidence_levels(players: List[PlayerState]) -> float:
         """Calculate average evidence level across all players."""
@@ -163,6 +212,7 @@ class CaseData:
         self.case_file = case_file
         self.data = self._load_case_file()
         self.validate_case_data()
+        self._content_hash = None
     
     def _load_case_file(self) -> Dict:
         """Load case data from JSON file."""
@@ -228,14 +278,22 @@ class CaseData:
         if 0 <= index < len(self.data['evidence']):
             return self.data['evidence'][index]
         raise IndexError(f"Evidence index {index} out of range")
+    
+    @property
+    def content_hash(self) -> str:
+        """Get the content hash identifying this version of the case."""
+        if self._content_hash is None:
+            self._content_hash = case_content_hash(self.data)
+        return self._content_hash
 
 
 class BayesianGame:
     """Main game class that manages the multi-player Bayesian jurisprudence game."""
     
-    def __init__(self, case_file: str, game_id: str = None):
+    def __init__(self, case_file: str, game_id: str = None, case_data: CaseData = None):
         self.game_id = game_id or self._generate_game_id()
-        self.case_data = CaseData(case_file)
+        # An already parsed case may be shared between games
+        self.case_data = case_data if case_data is not None else CaseData(case_file)
         self.players: Dict[str, PlayerState] = {}
         self.phase = GamePhase.SETUP
         self.current_evidence_index = 0
@@ -253,25 +311,61 @@ class BayesianGame:
         Add a player to the game.
         Returns True if successful, False if game is full or player already exists.
         """
-        if len(self.players) >= self.max_players:
-            return False
-        
-        if player_id in self.players:
+        return bool(self.add_players([{
+            'player_id': player_id,
+            'name': name,
+            'guilt_tolerance': guilt_tolerance,
+            'use_rating_scale': use_rating_scale
+        }]))
+    
+    def add_players(self, roster: Iterable[Dict], is_connected: bool = True) -> List[str]:
+        """
+        Add many players at once. Each roster entry has 'player_id', 'name',
+        'guilt_tolerance' and optionally 'use_rating_scale'. Entries that would
+        overfill the game or repeat a player_id are skipped.
+        Returns the ids of the players added.
+        """
+        prior_db = self.case_data.prior_info['db']
+        thresholds: Dict[int, float] = {}
+        added = []
+        for entry in roster:
+            if len(self.players) >= self.max_players:
+                break
+            player_id = entry['player_id']
+            if player_id in self.players:
+                continue
+            tolerance = entry['guilt_tolerance']
+            if tolerance not in thresholds:
+                thresholds[tolerance] = BayesianCalculator.calculate_guilt_threshold(tolerance)
+            self.players[player_id] = PlayerState(
+                player_id=player_id,
+                name=entry['name'],
+                guilt_threshold_db=thresholds[tolerance],
+                prior_guilt_tolerance=tolerance,
+                current_evidence_db=prior_db,
+                responses=[],
+                use_rating_scale=entry.get('use_rating_scale', True),
+                is_connected=is_connected
+            )
+            added.append(player_id)
+        return added
+    
+    def reassign_player(self, player_id: str, new_player_id: str) -> bool:
+        """
+        Move a player's seat to a new id (e.g. a pre-registered roster seat
+        claimed by a connecting session). Fails if new_player_id is taken.
+        """
+        if player_id not in self.players or new_player_id in self.players:
             return False
-        
-        guilt_threshold_db = BayesianCalculator.calculate_guilt_threshold(guilt_tolerance)
-        
-        player_state = PlayerState(
-            player_id=player_id,
-            name=name,
-            guilt_threshold_db=guilt_threshold_db,
-            prior_guilt_tolerance=guilt_tolerance,
-            current_evidence_db=self.case_data.prior_info['db'],
-            responses=[],
-            use_rating_scale=use_rating_scale
-        )
-        
-        self.players[player_id] = player_state
+        player = self.players.pop(player_id)
+        player.player_id = new_player_id
+        for response in player.responses:
+            response.player_id = new_player_id
+        self.players[new_player_id] = player
+        if player_id in self.responses_for_current_evidence:
+            response = self.responses_for_current_evidence.pop(player_id)
+            response.player_id = new_player_id
+            self.responses_for_current_evidence[new_player_id] = response
         return True
     
     def remove_player(self, player_id: str) -> bool:
@@ -347,6 +441,14 @@ class BayesianGame:
         connected_players = [pid for pid, player in self.players.items() if player.is_connected]
         return len(self.responses_for_current_evidence) == len(connected_players)
     
+    def response_fraction(self) -> float:
+        """Fraction of connected players who have responded to the current evidence."""
+        connected = [pid for pid, player in self.players.items() if player.is_connected]
+        if not connected:
+            return 1.0
+        responded = sum(1 for pid in connected if pid in self.responses_for_current_evidence)
+        return responded / len(connected)
+    
     def advance_evidence(self) -> bool:
         """
         Process current evidence responses and advance to next evidence or verdict.
@@ -355,9 +457,16 @@ class BayesianGame:
         if self.phase != GamePhase.EVIDENCE_REVIEW:
             return False
         
-        # Add responses to player states
+        # Score responses against the case's reference values, then add them to player states
+        evidence = self.case_data.get_evidence(self.current_evidence_index)
+        has_reference = 'prob_guilty' in evidence and 'prob_innocent' in evidence
         for player_id, response in self.responses_for_current_evidence.items():
             if player_id in self.players:
+                if has_reference:
+                    response.abs_error_db, response.log_score = BayesianCalculator.score_response(
+                        response.prob_guilty, response.prob_innocent,
+                        evidence['prob_guilty'], evidence['prob_innocent']
+                    )
                 self.players[player_id].add_response(response)
         
         # Clear current responses
@@ -378,6 +487,7 @@ class BayesianGame:
             'game_id': self.game_id,
             'phase': self.phase.value,
             'case_info': self.case_data.case_info,
+            'case_hash': self.case_data.content_hash,
             'prior_info': self.case_data.prior_info,
             'current_evidence_index': self.current_evidence_index,
             'total_evidence_count': self.case_data.evidence_count,
@@ -387,7 +497,9 @@ class BayesianGame:
                     'is_connected': player.is_connected,
                     'current_guilt_probability': player.get_current_guilt_probability(),
                     'current_evidence_db': player.current_evidence_db,
-                    'responses_count': len(player.responses)
+                    'responses_count': len(player.responses),
+                    'mean_abs_error_db': player.mean_abs_error_db(),
+                    'mean_log_score': player.mean_log_score()
                 }
                 for pid, player in self.players.items()
             },
@@ -426,26 +538,27 @@ class BayesianGame:
             'current_guilt_probability': player.get_current_guilt_probability(),
             'would_convict': player.would_convict(),
             'use_rating_scale': player.use_rating_scale,
+            'mean_abs_error_db': player.mean_abs_error_db(),
+            'mean_log_score': player.mean_log_score(),
             'responses': [asdict(response) for response in player.responses],
             'is_connected': player.is_connected
         }
     
-    def save_game_results(self, filename: str = None) -> str:
-        """Save game results to JSON file."""
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base, ext = os.path.splitext(self.case_data.case_file)
-            filename = f"{base}_results_{self.game_id}_{timestamp}{ext}"
-        
-        # Calculate final results
+    def build_results(self, case_store: 'CaseStore' = None) -> Dict:
+        """
+        Build a snapshot of the game results for saving.
+        With a case store the case is stored there once and referenced by
+        its content hash; otherwise the full case is embedded.
+        """
         verdict, avg_db, stats = BayesianCalculator.calculate_group_verdict(list(self.players.values()))
         
         results = {
             'game_id': self.game_id,
             'case_file': self.case_data.case_file,
+            'case_hash': self.case_data.content_hash,
+            'case_name': self.case_data.case_info['name'],
             'created_at': self.created_at.isoformat(),
             'completed_at': datetime.now().isoformat(),
-            'case_data': self.case_data.data,
             'final_verdict': verdict,
             'final_statistics': stats,
             'players': {
@@ -453,14 +566,108 @@ class BayesianGame:
             }
         }
         
+        if case_store is not None:
+            case_store.put(self.case_data.data, self.case_data.content_hash)
+        else:
+            results['case_data'] = self.case_data.data
+        
+        return results
+    
+    def save_game_results(self, filename: str = None, writer=None,
+                          case_store: 'CaseStore' = None) -> str:
+        """
+        Save game results to JSON file.
+        If a writer is given (anything with submit(filename, results)), the
+        snapshot is handed to it and written in the background.
+        If a case store is given, results reference the case by hash.
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base, ext = os.path.splitext(self.case_data.case_file)
+            filename = f"{base}_results_{self.game_id}_{timestamp}{ext}"
+        
+        results = self.build_results(case_store)
+        
+        if writer is not None:
+            writer.submit(filename, results)
+            return filename
+        
         try:
-            with open(filename, 'w') as file:
-                json.dump(results, file, indent=2, default=str)
+            write_json_atomic(filename, results)
             return filename
         except Exception as e:
             raise Exception(f"Error saving results: {e}")
 
 
+# Utility functions for result files
+def write_json_atomic(filename: str, data: Dict, fsync: bool = True):
+    """
+    Write compact JSON to a temporary file and rename it into place,
+    so a crash never leaves a truncated file behind.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file, separators=(',', ':'), default=str)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def case_content_hash(data: Dict) -> str:
+    """SHA-256 of a case's canonical JSON (sorted keys, no whitespace)."""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class CaseStore:
+    """
+    Content-addressed store of case files. Each distinct version of a case
+    is written once as <hash>.json, and saved results refer to it by hash.
+    """
+    
+    def __init__(self, directory: str = 'case_store'):
+        self.directory = directory
+        self._cases: Dict[str, Dict] = {}
+    
+    def path_for(self, case_hash: str) -> str:
+        """Get the file holding a case version."""
+        return os.path.join(self.directory, f"{case_hash}.json")
+    
+    def put(self, data: Dict, case_hash: str = None) -> str:
+        """Store a case (if not already stored) and return its hash."""
+        if case_hash is None:
+            case_hash = case_content_hash(data)
+        if case_hash in self._cases:
+            return case_hash
+        
+        path = self.path_for(case_hash)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            write_json_atomic(path, data)
+        self._cases[case_hash] = data
+        return case_hash
+    
+    def get(self, case_hash: str) -> Dict:
+        """Load a stored case by hash."""
+        if case_hash not in self._cases:
+            try:
+                with open(self.path_for(case_hash), 'r') as file:
+                    self._cases[case_hash] = json.load(file)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Case {case_hash} is not in the case store '{self.directory}'")
+        return self._cases[case_hash]
+    
+    def __contains__(self, case_hash: str) -> bool:
+        return case_hash in self._cases or os.path.exists(self.path_for(case_hash))
+
+
 # Utility functions for case file management
 def list_case_files(directory: str = '.') -> List[str]:
     """List available JSON case files, excluding result files."""
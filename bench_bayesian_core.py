@@ -0,0 +1,373 @@
+# bench_bayesian_core.py
+"""
+Micro-benchmark suite for the core Bayesian game logic.
+
+Times the hot paths of bayesian_core at 1, 12, 1,000 and 10,000 players,
+stores the results as a JSON baseline and compares later runs against it.
+
+Run with:
+    python bench_bayesian_core.py run -o bench_baseline.json
+    python bench_bayesian_core.py run -o bench_current.json
+    python bench_bayesian_core.py compare bench_baseline.json bench_current.json --threshold 10
+    python bench_bayesian_core.py check bench_baseline.json --threshold 10
+
+`compare` and `check` exit with status 1 when any benchmark is slower than
+the baseline by more than the threshold percentage, or when a baseline
+benchmark is missing from the new run (pass --allow-missing to only warn).
+
+Timings depend on the machine, so no baseline is committed: record one with
+`run -o bench_baseline.json` on the machine that will run `check`, and
+record it again after an intended change to the benchmarked code.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from bayesian_core import (
+    BayesianCalculator,
+    BayesianGame,
+    GamePhase,
+    PlayerState
+)
+
+
+PLAYER_COUNTS = [1, 12, 1000, 10000]
+DEFAULT_CASE_FILE = 'sample_case_file.json'
+DEFAULT_THRESHOLD_PERCENT = 10.0
+
+
+def measure(op: Callable, setup: Optional[Callable] = None, number: int = None,
+            repeat: int = 20) -> Dict:
+    """
+    Time an operation.
+    Each sample runs setup() untimed, then op(state) `number` times. Without a
+    setup, `number` is picked (as timeit does) so one sample takes >= 2 ms.
+    Returns per-call timings in microseconds.
+    """
+    if number is None:
+        number = 1 if setup else autorange(op)
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            for _ in range(number):
+                op(state)
+            samples.append((time.perf_counter() - start) / number * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        'min_us': round(min(samples), 3),
+        'median_us': round(statistics.median(samples), 3),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def autorange(op: Callable, min_seconds: float = 0.002) -> int:
+    """Find a loop count for which op takes at least min_seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            op(None)
+        if time.perf_counter() - start >= min_seconds or number >= 1_000_000:
+            return number
+        number *= 2
+
+
+def repeat_for(players: int) -> int:
+    """Fewer samples for larger games so a full run stays within minutes."""
+    return max(5, min(100, 20000 // players))
+
+
+class GameFactory:
+    """Builds games with a given number of players at a given point in play."""
+
+    def __init__(self, case_file: str):
+        self.case_file = case_file
+
+    def new_game(self, players: int) -> BayesianGame:
+        game = BayesianGame(self.case_file, f"bench_{players}")
+        game.max_players = players
+        for i in range(players):
+            game.add_player(f"player_{i}", f"Player {i}", 100 + i % 1000, i % 2 == 0)
+        return game
+
+    def in_evidence_review(self, players: int) -> BayesianGame:
+        game = self.new_game(players)
+        game.start_game()
+        game.advance_to_evidence_review()
+        return game
+
+    def with_round_submitted(self, players: int) -> BayesianGame:
+        game = self.in_evidence_review(players)
+        submit_round(game)
+        return game
+
+    def played_through(self, players: int) -> BayesianGame:
+        game = self.in_evidence_review(players)
+        while game.phase == GamePhase.EVIDENCE_REVIEW:
+            submit_round(game)
+            game.advance_evidence()
+        return game
+
+
+def submit_round(game: BayesianGame):
+    """Submit a response for every player on the current evidence."""
+    for i, player_id in enumerate(game.players):
+        game.submit_evidence_response(player_id, 0.5 + (i % 40) / 100, 0.3, 7, 3)
+
+
+def calculator_benchmarks() -> Dict[str, Dict]:
+    """Benchmarks for the player-independent conversions."""
+    return {
+        'decibels_to_probability': measure(
+            lambda _: BayesianCalculator.decibels_to_probability(12.5)),
+        'probability_to_decibels': measure(
+            lambda _: BayesianCalculator.probability_to_decibels(0.93)),
+        'calculate_db_update': measure(
+            lambda _: BayesianCalculator.calculate_db_update(0.8, 0.2)),
+        'calculate_guilt_threshold': measure(
+            lambda _: BayesianCalculator.calculate_guilt_threshold(200)),
+        'rating_to_probability': measure(
+            lambda _: BayesianCalculator.rating_to_probability(7)),
+    }
+
+
+def game_benchmarks(factory: GameFactory, players: int, output_dir: str) -> Dict[str, Dict]:
+    """Benchmarks for operations whose cost grows with the number of players."""
+    repeat = repeat_for(players)
+    results = {}
+
+    played = factory.played_through(players)
+    player_list: List[PlayerState] = list(played.players.values())
+    results['calculate_group_verdict'] = measure(
+        lambda _: BayesianCalculator.calculate_group_verdict(player_list), repeat=repeat)
+
+    # One call per player, as the server sees it
+    def submit_setup():
+        return factory.in_evidence_review(players)
+
+    def submit_all(game):
+        submit_round(game)
+
+    timing = measure(submit_all, setup=submit_setup, repeat=repeat)
+    results['submit_evidence_response'] = {
+        key: (round(value / players, 3) if key.endswith('_us') else value)
+        for key, value in timing.items()
+    }
+
+    results['advance_evidence'] = measure(
+        lambda game: game.advance_evidence(),
+        setup=lambda: factory.with_round_submitted(players), repeat=repeat)
+
+    reviewing = factory.with_round_submitted(players)
+    results['get_game_state[evidence_review]'] = measure(
+        lambda _: reviewing.get_game_state(), repeat=repeat)
+    results['get_game_state[verdict]'] = measure(
+        lambda _: played.get_game_state(), repeat=repeat)
+
+    player_id = next(iter(played.players))
+    results['get_player_state'] = measure(
+        lambda _: played.get_player_state(player_id), repeat=repeat)
+
+    filename = os.path.join(output_dir, f"bench_results_{players}.json")
+    results['save_game_results'] = measure(
+        lambda _: played.save_game_results(filename), repeat=max(3, repeat // 5))
+
+    return results
+
+
+def run_benchmarks(case_file: str = DEFAULT_CASE_FILE, player_counts: List[int] = None,
+                   name_filter: str = None) -> Dict:
+    """Run the full suite and return a JSON-serialisable report."""
+    player_counts = player_counts or PLAYER_COUNTS
+    factory = GameFactory(case_file)
+    results: Dict[str, Dict] = {}
+
+    for name, timing in calculator_benchmarks().items():
+        results[name] = timing
+
+    output_dir = tempfile.mkdtemp(prefix="bench_bayesian_core_")
+    try:
+        for players in player_counts:
+            print(f"Benchmarking games with {players} players...")
+            for name, timing in game_benchmarks(factory, players, output_dir).items():
+                results[f"{name}@{players}"] = timing
+    finally:
+        shutil.rmtree(output_dir)
+
+    if name_filter:
+        results = {name: timing for name, timing in results.items() if name_filter in name}
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'case_file': case_file,
+            'player_counts': player_counts,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline: Dict, current: Dict,
+                    threshold_percent: float = DEFAULT_THRESHOLD_PERCENT) -> List[Dict]:
+    """
+    Compare two reports on the best-of-N time of each benchmark.
+    Returns one row per baseline benchmark, flagged when it regressed;
+    benchmarks absent from the current run get a row with 'missing' set.
+    """
+    rows = []
+    for name, base in baseline['results'].items():
+        if name not in current['results']:
+            rows.append({
+                'name': name,
+                'baseline_us': base['min_us'],
+                'current_us': None,
+                'change_percent': None,
+                'regressed': False,
+                'missing': True,
+            })
+            continue
+        now = current['results'][name]
+        change = (now['min_us'] - base['min_us']) / base['min_us'] * 100 if base['min_us'] else 0.0
+        rows.append({
+            'name': name,
+            'baseline_us': base['min_us'],
+            'current_us': now['min_us'],
+            'change_percent': round(change, 1),
+            'regressed': change > threshold_percent,
+            'missing': False,
+        })
+    return rows
+
+
+def print_report(report: Dict):
+    print(f"\n{'Benchmark':<45} {'min (us)':>14} {'median (us)':>14}")
+    print("-" * 75)
+    for name, timing in report['results'].items():
+        print(f"{name:<45} {timing['min_us']:>14.3f} {timing['median_us']:>14.3f}")
+
+
+def print_comparison(rows: List[Dict], threshold_percent: float, allow_missing: bool = False) -> bool:
+    """
+    Print a comparison table. Returns True if nothing regressed and (unless
+    allow_missing) every baseline benchmark was run.
+    """
+    print(f"\n{'Benchmark':<45} {'baseline':>12} {'current':>12} {'change':>9}")
+    print("-" * 80)
+    for row in rows:
+        if row['missing']:
+            print(f"{row['name']:<45} {row['baseline_us']:>12.3f} {'-':>12} {'-':>9}  MISSING")
+            continue
+        marker = "  REGRESSED" if row['regressed'] else ""
+        print(f"{row['name']:<45} {row['baseline_us']:>12.3f} {row['current_us']:>12.3f} "
+              f"{row['change_percent']:>+8.1f}%{marker}")
+
+    regressions = [row for row in rows if row['regressed']]
+    missing = [row for row in rows if row['missing']]
+    print("\n" + "=" * 80)
+    passed = True
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) regressed by more than {threshold_percent}%")
+        passed = False
+    if missing:
+        if allow_missing:
+            print(f"⚠️ {len(missing)} baseline benchmark(s) were not run")
+        else:
+            print(f"❌ {len(missing)} baseline benchmark(s) were not run "
+                  f"(renamed or removed? record a new baseline, or pass --allow-missing)")
+            passed = False
+    if not rows:
+        print("❌ The baseline has no benchmarks to compare against")
+        return False
+    if passed:
+        print(f"✓ No benchmark regressed by more than {threshold_percent}%")
+    return passed
+
+
+def load_report(filename: str) -> Dict:
+    with open(filename, 'r') as file:
+        return json.load(file)
+
+
+def save_report(report: Dict, filename: str):
+    with open(filename, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults saved to {filename}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bayesian_core hot paths")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_run_options(sub):
+        sub.add_argument('--case-file', default=DEFAULT_CASE_FILE)
+        sub.add_argument('--players', default=",".join(str(n) for n in PLAYER_COUNTS),
+                         help="Comma-separated player counts")
+        sub.add_argument('--filter', help="Only keep benchmarks whose name contains this text")
+
+    run_parser = subparsers.add_parser('run', help="Run the suite")
+    add_run_options(run_parser)
+    run_parser.add_argument('-o', '--output', help="Write results to this JSON file")
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_PERCENT,
+                                help="Allowed slowdown in percent")
+    compare_parser.add_argument('--allow-missing', action='store_true',
+                                help="Only warn about baseline benchmarks missing from the current run")
+
+    check_parser = subparsers.add_parser('check', help="Run the suite and compare to a baseline")
+    check_parser.add_argument('baseline')
+    check_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_PERCENT,
+                              help="Allowed slowdown in percent")
+    check_parser.add_argument('-o', '--output', help="Also write the new results here")
+    check_parser.add_argument('--allow-missing', action='store_true',
+                              help="Only warn about baseline benchmarks the run skipped")
+    add_run_options(check_parser)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        rows = compare_results(load_report(args.baseline), load_report(args.current), args.threshold)
+        return 0 if print_comparison(rows, args.threshold, args.allow_missing) else 1
+
+    player_counts = [int(n) for n in args.players.split(',') if n.strip()]
+    report = run_benchmarks(args.case_file, player_counts, args.filter)
+    print_report(report)
+    if args.output:
+        save_report(report, args.output)
+
+    if args.command == 'check':
+        baseline = load_report(args.baseline)
+        if args.filter:
+            # Benchmarks the filter excluded on purpose are not "missing"
+            baseline['results'] = {name: timing for name, timing in baseline['results'].items()
+                                   if args.filter in name}
+        rows = compare_results(baseline, report, args.threshold)
+        return 0 if print_comparison(rows, args.threshold, args.allow_missing) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
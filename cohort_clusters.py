@@ -0,0 +1,299 @@
+# cohort_clusters.py
+"""
+Cluster phil_quiz profiles and compare the clusters' behavior as jurors.
+
+Profiles (30 dimension averages per person) are grouped with mini-batch
+k-means: every step moves the centers toward one random batch using
+matrix products, so a million respondents cluster in seconds with memory
+bounded by the batch and chunk sizes. Clusters are then joined by person
+name to the results warehouse (bayesian-court-game/results_store.py) to
+report each cluster's conviction rate, tolerance for false convictions
+and dB updates per evidence item. All aggregation is done with bincount
+over integer-coded arrays rather than per-row Python.
+
+Run with: python cohort_clusters.py profiles.json --db game_results/results.db -k 6
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from phil_quiz import DIMENSIONS
+
+ASSIGN_CHUNK_SIZE = 65536
+
+
+# ============================================================================
+# Profiles
+# ============================================================================
+
+def load_profiles(path: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Read profiles as (person ids, people x dimensions matrix) from JSON
+    ({person: {dimension: score}}) or CSV (an id column plus one column per
+    dimension). Missing dimensions are NaN.
+    """
+    if path.endswith('.json'):
+        with open(path, 'r') as file:
+            data = json.load(file)
+        ids = list(data)
+        rows = [[data[person].get(dimension, np.nan) for dimension in DIMENSIONS] for person in ids]
+    else:
+        ids, rows = [], []
+        with open(path, 'r', newline='') as file:
+            for row in csv.DictReader(file):
+                ids.append(row['id'])
+                rows.append([float(row[dimension]) if row.get(dimension) not in (None, '') else np.nan
+                             for dimension in DIMENSIONS])
+    matrix = np.array(rows, dtype=float).reshape(len(ids), len(DIMENSIONS))
+    return ids, matrix
+
+
+def person_key(name) -> str:
+    """Normalize a person id or player name for joining."""
+    return str(name).strip().lower()
+
+
+# ============================================================================
+# Mini-batch k-means
+# ============================================================================
+
+def _fill_missing(points: np.ndarray) -> np.ndarray:
+    """Replace unanswered dimensions with that dimension's mean."""
+    if not np.isnan(points).any():
+        return points
+    means = np.nanmean(points, axis=0)
+    means = np.where(np.isnan(means), 0.0, means)
+    return np.where(np.isnan(points), means, points)
+
+
+def _squared_distances(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    distances = ((points * points).sum(axis=1)[:, None] - 2.0 * points @ centers.T
+                 + (centers * centers).sum(axis=1)[None, :])
+    return np.maximum(distances, 0.0)
+
+
+def _init_centers(points: np.ndarray, k: int, rng: np.random.Generator, sample_size: int) -> np.ndarray:
+    """k-means++ seeding on a random sample."""
+    sample = points[rng.choice(len(points), size=min(sample_size, len(points)), replace=False)]
+    centers = [sample[rng.integers(len(sample))]]
+    closest = _squared_distances(sample, np.array(centers))[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(sample), p=closest / total) if total > 0 else rng.integers(len(sample))
+        centers.append(sample[index])
+        closest = np.minimum(closest, _squared_distances(sample, sample[index][None, :])[:, 0])
+    return np.array(centers)
+
+
+def assign_clusters(points: np.ndarray, centers: np.ndarray,
+                    chunk_size: int = ASSIGN_CHUNK_SIZE) -> Tuple[np.ndarray, float]:
+    """Nearest center per point, in chunks. Returns (labels, inertia)."""
+    labels = np.empty(len(points), dtype=np.int64)
+    inertia = 0.0
+    for start in range(0, len(points), chunk_size):
+        distances = _squared_distances(points[start:start + chunk_size], centers)
+        chunk_labels = distances.argmin(axis=1)
+        labels[start:start + chunk_size] = chunk_labels
+        inertia += float(distances[np.arange(len(chunk_labels)), chunk_labels].sum())
+    return labels, inertia
+
+
+def minibatch_kmeans(points: np.ndarray, k: int, batch_size: int = 2048, iterations: int = 200,
+                     seed: int = 0) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Cluster the rows of points (Sculley's mini-batch k-means: each center
+    moves toward its batch members with a per-center 1/count learning rate).
+    Returns (centers, labels, inertia).
+    """
+    points = _fill_missing(np.asarray(points, dtype=float))
+    if len(points) < k:
+        raise ValueError(f"Need at least {k} profiles to form {k} clusters, got {len(points)}")
+    rng = np.random.default_rng(seed)
+    centers = _init_centers(points, k, rng, sample_size=max(batch_size * 4, k * 10))
+    counts = np.zeros(k)
+
+    for _ in range(iterations):
+        batch = points[rng.integers(len(points), size=min(batch_size, len(points)))]
+        labels = _squared_distances(batch, centers).argmin(axis=1)
+        batch_counts = np.bincount(labels, minlength=k).astype(float)
+        batch_sums = np.zeros_like(centers)
+        np.add.at(batch_sums, labels, batch)
+        counts += batch_counts
+        # Equivalent to applying the per-point 1/count updates for each center in turn
+        moved = batch_counts > 0
+        rate = batch_counts[moved] / counts[moved]
+        centers[moved] += rate[:, None] * (batch_sums[moved] / batch_counts[moved][:, None] - centers[moved])
+
+    labels, inertia = assign_clusters(points, centers)
+    return centers, labels, inertia
+
+
+# ============================================================================
+# Joining clusters to game results
+# ============================================================================
+
+def cluster_behavior(ids: List[str], labels: np.ndarray, k: int, db_path: str) -> Dict:
+    """
+    Join clustered people to their games in the results warehouse by
+    player name and summarize each cluster's verdicts and dB updates.
+    """
+    label_by_person = {person_key(person): int(label) for person, label in zip(ids, labels)}
+    conn = sqlite3.connect(db_path)
+    try:
+        players = conn.execute(
+            'SELECT id, name, prior_guilt_tolerance, guilt_threshold_db, would_convict '
+            'FROM players WHERE name IS NOT NULL').fetchall()
+        responses = conn.execute(
+            'SELECT r.player_id, r.case_key, r.evidence_index, r.db_update, e.actual_db_update '
+            'FROM responses r LEFT JOIN evidence e '
+            'ON e.game_id = r.game_id AND e.evidence_index = r.evidence_index').fetchall()
+    finally:
+        conn.close()
+
+    # Cluster of every matched player row, indexed by players.id
+    max_player = max((row[0] for row in players), default=0)
+    player_cluster = np.full(max_player + 1, -1, dtype=np.int64)
+    for player_pk, name, *_ in players:
+        player_cluster[player_pk] = label_by_person.get(person_key(name), -1)
+
+    sizes = np.bincount(labels, minlength=k)
+    summary = {'clusters': [], 'evidence': []}
+
+    if players:
+        player_array = np.array([(row[0], row[2] if row[2] is not None else np.nan,
+                                  row[3] if row[3] is not None else np.nan,
+                                  row[4] if row[4] is not None else np.nan) for row in players], dtype=float)
+        clusters = player_cluster[player_array[:, 0].astype(np.int64)]
+        matched = clusters >= 0
+        clusters = clusters[matched]
+        tolerance, threshold, convict = player_array[matched, 1], player_array[matched, 2], player_array[matched, 3]
+        games = np.bincount(clusters, minlength=k)
+        convictions = np.bincount(clusters, weights=np.nan_to_num(convict), minlength=k)
+        log_tolerance = np.log10(np.where(tolerance > 0, tolerance, np.nan))
+        has_tolerance = ~np.isnan(log_tolerance)
+        tolerance_count = np.bincount(clusters[has_tolerance], minlength=k)
+        log_tolerance_sum = np.bincount(clusters[has_tolerance], weights=log_tolerance[has_tolerance], minlength=k)
+        threshold_sum = np.bincount(clusters, weights=np.nan_to_num(threshold), minlength=k)
+    else:
+        games = convictions = tolerance_count = log_tolerance_sum = threshold_sum = np.zeros(k)
+
+    response_stats = _response_stats(responses, player_cluster, k)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for cluster in range(k):
+            summary['clusters'].append({
+                'cluster': cluster,
+                'profiles': int(sizes[cluster]),
+                'games': int(games[cluster]),
+                'conviction_rate': float(convictions[cluster] / games[cluster]) if games[cluster] else None,
+                'geometric_mean_tolerance': float(10 ** (log_tolerance_sum[cluster] / tolerance_count[cluster]))
+                if tolerance_count[cluster] else None,
+                'mean_threshold_db': float(threshold_sum[cluster] / games[cluster]) if games[cluster] else None,
+                'responses': int(response_stats['counts'][cluster]),
+                'mean_db_update': response_stats['mean_db'][cluster],
+                'mean_db_error': response_stats['mean_error'][cluster],
+            })
+    summary['evidence'] = response_stats['evidence']
+    return summary
+
+
+def _response_stats(responses: List[Tuple], player_cluster: np.ndarray, k: int) -> Dict:
+    """Per-cluster and per-(cluster, evidence item) dB update statistics."""
+    empty = {'counts': np.zeros(k, dtype=int), 'mean_db': [None] * k, 'mean_error': [None] * k, 'evidence': []}
+    if not responses:
+        return empty
+
+    player_pks = np.array([row[0] for row in responses], dtype=np.int64)
+    in_range = player_pks < len(player_cluster)
+    clusters = np.where(in_range, player_cluster[np.minimum(player_pks, len(player_cluster) - 1)], -1)
+    matched = clusters >= 0
+    if not matched.any():
+        return empty
+
+    clusters = clusters[matched]
+    db_update = np.array([row[3] for row in responses], dtype=float)[matched]
+    actual = np.array([row[4] if row[4] is not None else np.nan for row in responses], dtype=float)[matched]
+    items = [(row[1], row[2]) for row, keep in zip(responses, matched) if keep]
+    item_keys, item_codes = np.unique(np.array([f"{case}\x00{index}" for case, index in items]), return_inverse=True)
+
+    counts = np.bincount(clusters, minlength=k)
+    db_sum = np.bincount(clusters, weights=db_update, minlength=k)
+    has_actual = ~np.isnan(actual)
+    error = np.abs(db_update - actual)
+    error_count = np.bincount(clusters[has_actual], minlength=k)
+    error_sum = np.bincount(clusters[has_actual], weights=error[has_actual], minlength=k)
+
+    cells = clusters * len(item_keys) + item_codes
+    cell_counts = np.bincount(cells, minlength=k * len(item_keys))
+    cell_sums = np.bincount(cells, weights=db_update, minlength=k * len(item_keys))
+    cell_actual = np.bincount(item_codes[has_actual], weights=actual[has_actual], minlength=len(item_keys))
+    actual_counts = np.bincount(item_codes[has_actual], minlength=len(item_keys))
+
+    evidence = []
+    for cell in np.flatnonzero(cell_counts):
+        cluster, item = divmod(int(cell), len(item_keys))
+        case_key, evidence_index = item_keys[item].split('\x00')
+        evidence.append({
+            'cluster': cluster,
+            'case_key': case_key,
+            'evidence_index': int(evidence_index),
+            'responses': int(cell_counts[cell]),
+            'mean_db_update': float(cell_sums[cell] / cell_counts[cell]),
+            'actual_db': float(cell_actual[item] / actual_counts[item]) if actual_counts[item] else None,
+        })
+
+    return {
+        'counts': counts,
+        'mean_db': [float(db_sum[c] / counts[c]) if counts[c] else None for c in range(k)],
+        'mean_error': [float(error_sum[c] / error_count[c]) if error_count[c] else None for c in range(k)],
+        'evidence': evidence,
+    }
+
+
+def print_report(summary: Dict, centers: np.ndarray):
+    print(f"{'cluster':>7} {'profiles':>9} {'games':>6} {'convict':>8} {'tolerance':>10} "
+          f"{'mean dB':>8} {'|err| dB':>9}  leanings")
+    for row in summary['clusters']:
+        center = centers[row['cluster']]
+        top = ', '.join(DIMENSIONS[i] for i in np.argsort(center)[::-1][:3])
+        rate = f"{row['conviction_rate'] * 100:7.1f}%" if row['conviction_rate'] is not None else '     n/a'
+        tolerance = f"{row['geometric_mean_tolerance']:10.0f}" if row['geometric_mean_tolerance'] else '       n/a'
+        mean_db = f"{row['mean_db_update']:+8.2f}" if row['mean_db_update'] is not None else '     n/a'
+        error = f"{row['mean_db_error']:9.2f}" if row['mean_db_error'] is not None else '      n/a'
+        print(f"{row['cluster']:>7} {row['profiles']:>9} {row['games']:>6} {rate} {tolerance} "
+              f"{mean_db} {error}  {top}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cluster quiz profiles and compare their verdicts")
+    parser.add_argument('profiles', help="JSON {person: {dimension: score}} or CSV with id + dimension columns")
+    parser.add_argument('--db', default='bayesian-court-game/game_results/results.db',
+                        help="results warehouse (see results_store.py)")
+    parser.add_argument('-k', '--clusters', type=int, default=6)
+    parser.add_argument('--batch-size', type=int, default=2048)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the full summary as JSON")
+    args = parser.parse_args(argv)
+
+    ids, points = load_profiles(args.profiles)
+    centers, labels, inertia = minibatch_kmeans(points, args.clusters, args.batch_size, args.iterations, args.seed)
+    summary = cluster_behavior(ids, labels, args.clusters, args.db)
+    if args.json:
+        summary['centers'] = {f"{c}": dict(zip(DIMENSIONS, map(float, centers[c]))) for c in range(args.clusters)}
+        summary['inertia'] = inertia
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(summary, centers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
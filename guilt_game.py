@@ -1,9 +1,12 @@
+import argparse
 import math
-import time
 import json
 import os
 from datetime import datetime
 
+from bayesian_core import CaseStore, write_json_atomic
+from terminal_renderer import renderer
+
 def decibels_to_probability(db):
     """Convert decibels to probability."""
     if db > 0:
@@ -19,12 +22,8 @@ def probability_to_decibels(prob):
         return -10 * math.log10((1 - prob) / prob)
 
 def print_slowly(text, delay=0.03):
-    """Print text with a typing effect."""
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(delay)
-    print()
-    time.sleep(0.5)
+    """Print text with a typing effect; any key shows the rest of it at once."""
+    renderer.print(text, char_delay=delay)
 
 def clear_screen():
     """Clear the console screen."""
@@ -83,22 +82,31 @@ class BayesianCourtGame:
             exit(1)
     
     def save_case_file(self, filename=None):
-        """Save updated case data to JSON file."""
+        """
+        Save this play's results to a JSON file, referencing the case by
+        content hash in the case store next to it.
+        """
         if filename is None:
             # Create a new filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             base, ext = os.path.splitext(self.case_file)
             filename = f"{base}_played_{timestamp}{ext}"
         
-        # Add player responses to case data
-        self.case_data["player_responses"] = self.player_responses
-        self.case_data["final_evidence_db"] = self.current_evidence_db
-        self.case_data["guilt_threshold_db"] = self.guilt_threshold_db
-        self.case_data["verdict"] = "GUILTY" if self.current_evidence_db >= self.guilt_threshold_db else "NOT GUILTY"
+        # The case itself is stored once in the case store, not in every played file
+        case_store = CaseStore(os.path.join(os.path.dirname(os.path.abspath(filename)), "case_store"))
         
         try:
-            with open(filename, 'w') as file:
-                json.dump(self.case_data, file, indent=2)
+            results = {
+                "case_file": os.path.basename(self.case_file),
+                "case_hash": case_store.put(self.case_data),
+                "case_name": self.case_data["case"]["name"],
+                "prior_db": self.case_data["prior"]["db"],
+                "player_responses": self.player_responses,
+                "final_evidence_db": self.current_evidence_db,
+                "guilt_threshold_db": self.guilt_threshold_db,
+                "verdict": "GUILTY" if self.current_evidence_db >= self.guilt_threshold_db else "NOT GUILTY"
+            }
+            write_json_atomic(filename, results)
             print(f"\nGame results saved to {filename}")
         except Exception as e:
             print(f"Error saving results: {e}")
@@ -251,9 +259,8 @@ class BayesianCourtGame:
             print_slowly("\n=== Explanation ===")
             print_slowly(evidence["explanation"])
         
-        # Save the updated db to the evidence item
-        evidence["player_db_update"] = db_update
-        evidence["updated_total_db"] = self.current_evidence_db
+        # Record the running total with the response rather than on the case itself
+        player_response["updated_total_db"] = self.current_evidence_db
         
         if self.evidence_presented < len(self.case_data["evidence"]):
             input("\nPress Enter to continue to the next piece of evidence...")
@@ -309,6 +316,11 @@ def list_case_files():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bayesian Jurisprudence simulation")
+    parser.add_argument("--text-speed", type=float, default=renderer.speed,
+                        help="typing animation speed multiplier (0 shows text instantly)")
+    renderer.speed = parser.parse_args().text_speed
+    
     print_slowly("Welcome to the Bayesian Court Game!")
     print_slowly("This program will guide you through analyzing legal evidence using Bayesian probability theory.")
     
@@ -1,10 +1,17 @@
 import math
-import time
 import json
 import os
+import re
+import sys
+import csv
+import io
+import argparse
 
 from datetime import datetime
 
+from bayesian_core import CaseStore, write_json_atomic
+from terminal_renderer import renderer
+
 def decibels_to_probability(db):
     """Convert decibels to probability."""
     if db > 0:
@@ -20,33 +27,34 @@ def probability_to_decibels(prob):
         return -10 * math.log10((1 - prob) / prob)
 
 def print_slowly(text, delay=0.005):
-    """Print text with a typing effect."""
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(delay)
-    print()
-    time.sleep(0.5)
+    """Print text with a typing effect; any key shows the rest of it at once."""
+    renderer.print(text, char_delay=delay)
 
 def clear_screen():
     """Clear the console screen."""
     print("\n" * 50)
 
+def check_number(value, min_val=0, max_val=1, allow_float=True):
+    """Validate a number against the same rules as interactive input; raises ValueError."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("Please enter a valid number.")
+    if value < min_val:
+        raise ValueError(f"Please enter a number greater than or equal to {min_val}.")
+    if max_val is not None and value > max_val:
+        raise ValueError(f"Please enter a number less than or equal to {max_val}.")
+    if not allow_float:
+        value = int(value)
+    return value
+
 def get_valid_number(prompt, min_val=0, max_val=1, allow_float=True):
     """Get a valid number input from the user."""
     while True:
         try:
-            value = float(input(prompt))
-            if value < min_val:
-                print(f"Please enter a number greater than or equal to {min_val}.")
-                continue
-            if max_val is not None and value > max_val:
-                print(f"Please enter a number less than or equal to {max_val}.")
-                continue
-            if not allow_float:
-                value = int(value)
-            return value
-        except ValueError:
-            print("Please enter a valid number.")
+            return check_number(input(prompt), min_val, max_val, allow_float)
+        except ValueError as e:
+            print(e)
 
 def print_title():
     """Print the game title."""
@@ -62,9 +70,10 @@ def print_title():
 class BayesianCourtGame:
     """A flexible game applying Bayesian reasoning to a courtroom scenario."""
     
-    def __init__(self, case_file):
+    def __init__(self, case_file, case_data=None):
         self.case_file = case_file
-        self.case_data = self.load_case_file()
+        # Callers grading many answer sheets load the case once and pass it in
+        self.case_data = case_data if case_data is not None else self.load_case_file()
         self.prior_guilt_tolerance = None
         self.guilt_threshold_db = None
         self.current_evidence_db = self.case_data["prior"]["db"]
@@ -97,26 +106,39 @@ class BayesianCourtGame:
             print(f"Error: Invalid JSON format in case file '{self.case_file}'")
             exit(1)
     
-    def save_case_file(self, filename=None):
-        """Save updated case data to JSON file."""
+    def save_case_file(self, filename=None, quiet=False):
+        """
+        Save this play's results to a JSON file, referencing the case by
+        content hash in the case store next to it. quiet skips the
+        confirmation message.
+        """
         if filename is None:
             # Create a new filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             base, ext = os.path.splitext(self.case_file)
             filename = f"{base}_played_{timestamp}{ext}"
         
-        # Add player responses to case data
-        self.case_data["player_responses"] = self.player_responses
-        self.case_data["final_evidence_db"] = self.current_evidence_db
-        self.case_data["guilt_threshold_db"] = self.guilt_threshold_db
-        self.case_data["verdict"] = "GUILTY" if self.current_evidence_db >= self.guilt_threshold_db else "NOT GUILTY"
+        # The case itself is stored once in the case store, not in every played file
+        case_store = CaseStore(os.path.join(os.path.dirname(os.path.abspath(filename)), "case_store"))
         
         try:
-            with open(filename, 'w') as file:
-                json.dump(self.case_data, file, indent=2)
-            print(f"\nGame results saved to {filename}")
+            results = {
+                "case_file": os.path.basename(self.case_file),
+                "case_hash": case_store.put(self.case_data),
+                "case_name": self.case_data["case"]["name"],
+                "prior_db": self.case_data["prior"]["db"],
+                "player_responses": self.player_responses,
+                "final_evidence_db": self.current_evidence_db,
+                "guilt_threshold_db": self.guilt_threshold_db,
+                "verdict": "GUILTY" if self.current_evidence_db >= self.guilt_threshold_db else "NOT GUILTY"
+            }
+            write_json_atomic(filename, results)
+            if not quiet:
+                print(f"\nGame results saved to {filename}")
+            return filename
         except Exception as e:
             print(f"Error saving results: {e}")
+            return None
     
     def set_probability_input_method(self):
         """Set the default method for entering probabilities."""
@@ -193,9 +215,7 @@ class BayesianCourtGame:
         print_slowly("1 out of every 10,000 convictions would be 99.99%.")
         
         tolerance = get_valid_number("\nEnter your tolerance (e.g., for 1 in 200, enter 200): ", min_val=10, max_val=None, allow_float=False)
-        
-        self.prior_guilt_tolerance = tolerance
-        self.guilt_threshold_db = 10 * math.log10(tolerance)
+        self.apply_guilt_threshold(tolerance)
         
         print_slowly(f"\nBased on your tolerance, the threshold for conviction is:")
         print_slowly(f"{self.guilt_threshold_db:.1f} decibels of evidence")
@@ -209,6 +229,11 @@ class BayesianCourtGame:
         input("\nPress Enter to continue...")
         clear_screen()
     
+    def apply_guilt_threshold(self, tolerance):
+        """Set the conviction threshold from a '1 in N' tolerance."""
+        self.prior_guilt_tolerance = tolerance
+        self.guilt_threshold_db = 10 * math.log10(tolerance)
+    
     def present_case(self):
         """Present the initial case scenario."""
         case = self.case_data["case"]
@@ -292,31 +317,10 @@ class BayesianCourtGame:
                 clear_screen()
                 self.present_evidence(evidence_index)  # Re-present the evidence
         
-        # Store the player's response
-        player_response = {
-            "evidence_index": evidence_index,
-            "evidence_name": evidence["name"],
-            "player_prob_guilty": prob_guilty,
-            "player_prob_innocent": prob_innocent,
-            "used_rating_scale": use_rating,
-            "db_update": db_update,
-            "actual_prob_guilty": evidence.get("prob_guilty", None),
-            "actual_prob_innocent": evidence.get("prob_innocent", None),
-        }
-        
-        # Only include ratings if using the rating scale
-        if use_rating:
-            player_response["player_guilty_rating"] = guilty_rating
-            player_response["player_innocent_rating"] = innocent_rating
-        
-        if "prob_guilty" in evidence and "prob_innocent" in evidence:
-            actual_db_update = 10 * math.log10(evidence["prob_guilty"] / evidence["prob_innocent"])
-            player_response["actual_db_update"] = actual_db_update
-        
-        self.player_responses.append(player_response)
-        
-        # Update the current evidence level
-        self.current_evidence_db += db_update
+        # Store the player's response and update the current evidence level
+        player_response = self.record_response(evidence_index, prob_guilty, prob_innocent,
+                                               guilty_rating, innocent_rating)
+        actual_db_update = player_response.get("actual_db_update")
         
         # Display final results
         print_slowly(f"\nYour probability estimates:")
@@ -344,10 +348,6 @@ class BayesianCourtGame:
             print_slowly("\n=== Explanation ===")
             print_slowly(evidence["explanation"])
         
-        # Save the updated db to the evidence item
-        evidence["player_db_update"] = db_update
-        evidence["updated_total_db"] = self.current_evidence_db
-        
         if self.evidence_presented < len(self.case_data["evidence"]):
             input("\nPress Enter to continue to the next piece of evidence...")
         else:
@@ -355,6 +355,73 @@ class BayesianCourtGame:
         
         clear_screen()
     
+    def record_response(self, evidence_index, prob_guilty, prob_innocent, guilty_rating=None, innocent_rating=None):
+        """Store the player's estimates for one piece of evidence and apply the update."""
+        evidence = self.case_data["evidence"][evidence_index]
+        use_rating = guilty_rating is not None
+        db_update = 10 * math.log10(prob_guilty / prob_innocent)
+        
+        player_response = {
+            "evidence_index": evidence_index,
+            "evidence_name": evidence["name"],
+            "player_prob_guilty": prob_guilty,
+            "player_prob_innocent": prob_innocent,
+            "used_rating_scale": use_rating,
+            "db_update": db_update,
+            "actual_prob_guilty": evidence.get("prob_guilty", None),
+            "actual_prob_innocent": evidence.get("prob_innocent", None),
+        }
+        
+        # Only include ratings if using the rating scale
+        if use_rating:
+            player_response["player_guilty_rating"] = guilty_rating
+            player_response["player_innocent_rating"] = innocent_rating
+        
+        if "prob_guilty" in evidence and "prob_innocent" in evidence:
+            player_response["actual_db_update"] = 10 * math.log10(evidence["prob_guilty"] / evidence["prob_innocent"])
+        
+        self.player_responses.append(player_response)
+        self.evidence_presented = evidence_index + 1
+        self.current_evidence_db += db_update
+        
+        # Record the running total with the response rather than on the case itself
+        player_response["updated_total_db"] = self.current_evidence_db
+        return player_response
+    
+    def play_scripted(self, sheet, filename=None, quiet=False):
+        """
+        Play the whole case from an answer sheet without prompts or animation
+        and save the usual _played_ results. Raises ValueError for an answer
+        the interactive game would have rejected.
+        """
+        self.apply_guilt_threshold(check_number(sheet["tolerance"], min_val=10, max_val=None, allow_float=False))
+        
+        method = str(sheet.get("input_method", "rating")).strip().lower()
+        if method not in ANSWER_SHEET_METHODS:
+            raise ValueError(f"Unknown input method '{method}', expected one of {sorted(ANSWER_SHEET_METHODS)}")
+        self.use_rating_scale = ANSWER_SHEET_METHODS[method]
+        
+        answers = sheet["answers"]
+        if len(answers) != len(self.case_data["evidence"]):
+            raise ValueError(f"Expected {len(self.case_data['evidence'])} answers, got {len(answers)}")
+        
+        for i, answer in enumerate(answers):
+            try:
+                if self.use_rating_scale:
+                    innocent_rating = check_number(answer["innocent"], min_val=0, max_val=10, allow_float=False)
+                    guilty_rating = check_number(answer["guilty"], min_val=0, max_val=10, allow_float=False)
+                    self.record_response(i, self.integer_probability_dict[guilty_rating],
+                                         self.integer_probability_dict[innocent_rating],
+                                         guilty_rating, innocent_rating)
+                else:
+                    prob_innocent = check_number(answer["innocent"], min_val=0.00001, max_val=0.9999)
+                    prob_guilty = check_number(answer["guilty"], min_val=0.0001, max_val=0.9999)
+                    self.record_response(i, prob_guilty, prob_innocent)
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"Evidence {i + 1}: {e}")
+        
+        return self.save_case_file(filename, quiet=quiet)
+    
     def deliver_verdict(self):
         """Deliver the final verdict based on all evidence."""
         print_slowly("\n=== FINAL VERDICT ===")
@@ -384,6 +451,77 @@ class BayesianCourtGame:
         print_slowly("\nThank you for participating in this Bayesian reasoning exercise!")
 
 
+# Answer sheet "input_method" values -> whether the rating scale is used
+ANSWER_SHEET_METHODS = {"rating": True, "1": True, "probability": False, "2": False}
+
+def load_answer_sheets(path):
+    """
+    Read answer sheets from a JSON or CSV file, or stdin when path is '-'.
+    
+    JSON: one sheet or a list of sheets, each like
+        {"id": "alice", "tolerance": 200, "input_method": "rating",
+         "answers": [{"guilty": 8, "innocent": 2}, ...]}
+    CSV: one sheet per row with columns
+        id, tolerance, input_method, guilty_1, innocent_1, guilty_2, innocent_2, ...
+    """
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, 'r', newline='') as file:
+            text = file.read()
+    
+    if text.lstrip()[:1] in ("{", "["):
+        sheets = json.loads(text)
+        sheets = sheets if isinstance(sheets, list) else [sheets]
+    else:
+        sheets = []
+        for row in csv.DictReader(io.StringIO(text)):
+            answers = []
+            while row.get(f"guilty_{len(answers) + 1}") not in (None, ""):
+                n = len(answers) + 1
+                answers.append({"guilty": row[f"guilty_{n}"], "innocent": row.get(f"innocent_{n}")})
+            sheets.append({"id": row.get("id"), "tolerance": row.get("tolerance"),
+                           "input_method": row.get("input_method") or "rating", "answers": answers})
+    
+    for number, sheet in enumerate(sheets, 1):
+        if not sheet.get("id"):
+            sheet["id"] = f"sheet{number}"
+    return sheets
+
+def grade_answer_sheets(case_file, sheets, output_dir=None):
+    """
+    Play every answer sheet against one case and save a _played_ file per
+    sheet, with the case store in the same directory. Sheets whose ids
+    clash get a numbered suffix rather than overwriting each other.
+    Returns (sheet id, results filename or None, error message or None)
+    tuples.
+    """
+    case_data = BayesianCourtGame(case_file).case_data
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base, ext = os.path.splitext(os.path.basename(case_file))
+    output_dir = output_dir or os.path.dirname(case_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    graded = []
+    taken = set()
+    for sheet in sheets:
+        sheet_id = str(sheet["id"])
+        safe_id = re.sub(r'[^\w-]', '_', sheet_id)
+        filename = os.path.join(output_dir, f"{base}_played_{timestamp}_{safe_id}{ext}")
+        copy = 1
+        while filename in taken or os.path.exists(filename):
+            copy += 1
+            filename = os.path.join(output_dir, f"{base}_played_{timestamp}_{safe_id}_{copy}{ext}")
+        taken.add(filename)
+        game = BayesianCourtGame(case_file, case_data=case_data)
+        try:
+            saved = game.play_scripted(sheet, filename, quiet=True)
+            graded.append((sheet_id, saved, None if saved else "results could not be saved"))
+        except (KeyError, TypeError, ValueError) as e:
+            graded.append((sheet_id, None, str(e)))
+    return graded
+
 def list_case_files():
     """List available JSON case files in the current directory."""
     # Filter out files that end with _played_ in their name
@@ -400,15 +538,41 @@ def list_case_files():
     return case_files[choice-1]
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bayesian Court Game")
+    parser.add_argument("case_file", nargs="?", help="case file to play (prompted for when omitted)")
+    parser.add_argument("--answers", metavar="FILE",
+                        help="grade answer sheets from a JSON or CSV file ('-' for stdin) without prompts")
+    parser.add_argument("--output-dir", help="where scripted results are written (default: next to the case file)")
+    parser.add_argument("--text-speed", type=float, default=renderer.speed,
+                        help="typing animation speed multiplier (0 shows text instantly)")
+    args = parser.parse_args(argv)
+    renderer.speed = args.text_speed
+    
+    if args.answers:
+        if not args.case_file:
+            parser.error("--answers needs a case file")
+        graded = grade_answer_sheets(args.case_file, load_answer_sheets(args.answers), args.output_dir)
+        for sheet_id, filename, error in graded:
+            if error:
+                print(f"{sheet_id}: ERROR {error}")
+        failed = sum(1 for _, _, error in graded if error)
+        print(f"\nGraded {len(graded) - failed} of {len(graded)} answer sheets.")
+        return 1 if failed else 0
+    
     print_slowly("Welcome to the Bayesian Court Game!")
     print_slowly("This program will guide you through analyzing legal evidence using Bayesian probability theory.")
     
     # Either select a case file or use a default
-    case_file = list_case_files()
+    case_file = args.case_file or list_case_files()
     if not case_file:
         case_file = "guilt_or_innocent.json"
         print(f"Using default case file: {case_file}")
     
     game = BayesianCourtGame(case_file)
-    game.start_game()
\ No newline at end of file
+    game.start_game()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,6 +1,18 @@
+"""
+Philosophical leanings quiz.
+
+Rates agreement with two statements for each of 30 dimensions and plots
+the averages on a radar chart. Importing this module only defines the
+questions and the quiz engine; matplotlib is imported when a chart is
+actually drawn, so the server can use it at no startup cost.
+
+Run with: python phil_quiz.py
+"""
+
+import io
+import math
 import random
-import matplotlib.pyplot as plt
-import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Define the questions and their corresponding dimensions
 questions = {
@@ -125,80 +137,209 @@ questions = {
         "We have a moral obligation to help others even when it requires personal sacrifice."
     ]
 }
-count = 0
-# Initialize scores for each dimension
-scores = {
-    "Spiritual": 0,
-    "Material": 0,
-    "Freedom": 0,
-    "Coercion": 0,
-    "Free Will": 0,
-    "Determinism": 0,
-    "Teleological": 0,
-    "Deontological": 0,
-    "Individualism": 0,
-    "Collectivism": 0,
-    "Optimism": 0,
-    "Pessimism": 0,
-    "Universalism": 0,
-    "Relativism": 0,
-    "Change": 0,
-    "Tradition": 0,
-    "Belief in God": 0,
-    "Atheism": 0,
-    "Equality": 0,
-    "Hierarchy": 0,
-    "Reason": 0,
-    "Emotion": 0,
-    "Nature": 0,
-    "Nurture": 0,
-    "Absolutism": 0,
-    "Pragmatism": 0,
-    "Security": 0,
-    "Risk": 0,
-    "Rational Self-Interest": 0,
-    "Altruism": 0
-}
+# Dimensions in chart order
+DIMENSIONS = list(questions)
+
+MIN_RATING = 1
+MAX_RATING = 10
+
+
+def new_scores() -> Dict[str, float]:
+    """Get a zeroed score for each dimension."""
+    return {dimension: 0 for dimension in DIMENSIONS}
+
+
+def build_question_list(rng: random.Random = None) -> List[Tuple[str, str]]:
+    """Get every (dimension, question) pair in a random order."""
+    rng = rng or random.Random()
+    questions_list = []
+    for dimension in questions:
+        slist = list(questions[dimension])
+        rng.shuffle(slist)
+        for question in slist:
+            questions_list.append((dimension, question))
+    rng.shuffle(questions_list)
+    return questions_list
+
+
+def parse_response(text) -> Optional[int]:
+    """Get a 1-10 rating from user input, or None if it is not one."""
+    text = str(text).strip()
+    if not text.isdigit() or not MIN_RATING <= int(text) <= MAX_RATING:
+        return None
+    return int(text)
+
+
+def score_responses(responses: Iterable[Tuple[str, int]]) -> Dict[str, float]:
+    """Average (dimension, rating) responses per dimension."""
+    scores = new_scores()
+    for dimension, rating in responses:
+        scores[dimension] += rating
+    for dimension in scores:
+        scores[dimension] /= len(questions[dimension])
+    return scores
+
+
+class QuizSession:
+    """One respondent's pass through the quiz, driven by answers rather than input()."""
+
+    def __init__(self, seed: int = None):
+        self.questions_list = build_question_list(random.Random(seed))
+        self.responses: List[Tuple[str, int]] = []
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.responses) == len(self.questions_list)
+
+    def current_question(self) -> Optional[Tuple[str, str]]:
+        if self.is_complete:
+            return None
+        return self.questions_list[len(self.responses)]
+
+    def answer(self, rating) -> bool:
+        """Record a rating for the current question; returns False if it is invalid."""
+        rating = parse_response(rating)
+        if rating is None or self.is_complete:
+            return False
+        dimension, _ = self.current_question()
+        self.responses.append((dimension, rating))
+        return True
+
+    def scores(self) -> Dict[str, float]:
+        return score_responses(self.responses)
+
+
+# ============================================================================
+# Cohort scoring
+# ============================================================================
+
+# Response matrix columns: every statement in question bank order
+QUESTION_COLUMNS = [(dimension, question) for dimension in questions for question in questions[dimension]]
+
+# Each dimension is listed next to its opposite (Spiritual/Material, Freedom/Coercion, ...)
+OPPOSING_PAIRS = [(DIMENSIONS[i], DIMENSIONS[i + 1]) for i in range(0, len(DIMENSIONS), 2)]
+AXIS_NAMES = [f"{first} vs. {second}" for first, second in OPPOSING_PAIRS]
+
+
+class CohortScores:
+    """Dimension averages and opposing-pair axes for many respondents."""
+
+    def __init__(self, averages, axes):
+        # averages: respondents x dimensions (NaN where a dimension was not answered)
+        self.averages = averages
+        # axes: respondents x pairs, first dimension minus its opposite (-9 to 9)
+        self.axes = axes
+
+    def __len__(self) -> int:
+        return self.averages.shape[0]
+
+    def profile(self, respondent: int) -> Dict[str, float]:
+        """One respondent's scores in the same form as score_responses."""
+        return {dimension: float(value) for dimension, value in zip(DIMENSIONS, self.averages[respondent])}
+
+    def axis_profile(self, respondent: int) -> Dict[str, float]:
+        return {name: float(value) for name, value in zip(AXIS_NAMES, self.axes[respondent])}
+
+
+def dimension_matrix(columns: List[str] = None):
+    """One-hot questions x dimensions matrix mapping each column to its dimension."""
+    import numpy as np
+
+    columns = columns or [dimension for dimension, _ in QUESTION_COLUMNS]
+    index = {dimension: i for i, dimension in enumerate(DIMENSIONS)}
+    matrix = np.zeros((len(columns), len(DIMENSIONS)))
+    matrix[np.arange(len(columns)), [index[dimension] for dimension in columns]] = 1.0
+    return matrix
+
+
+def score_batch(responses, columns: List[str] = None) -> CohortScores:
+    """
+    Score a respondents x questions matrix of 1-10 ratings in one pass.
+    Columns follow QUESTION_COLUMNS unless columns names each column's
+    dimension. NaN marks an unanswered question; a dimension's average
+    covers only the questions answered.
+    """
+    import numpy as np
+
+    ratings = np.asarray(responses, dtype=float)
+    if ratings.ndim != 2:
+        raise ValueError("responses must be a respondents x questions matrix")
+    mapping = dimension_matrix(columns)
+    if ratings.shape[1] != mapping.shape[0]:
+        raise ValueError(f"Expected {mapping.shape[0]} question columns, got {ratings.shape[1]}")
+
+    answered = ~np.isnan(ratings)
+    given = ratings[answered]
+    if given.size and (given.min() < MIN_RATING or given.max() > MAX_RATING):
+        raise ValueError(f"Ratings must be between {MIN_RATING} and {MAX_RATING}")
+
+    sums = np.where(answered, ratings, 0.0) @ mapping
+    counts = answered.astype(float) @ mapping
+    with np.errstate(invalid='ignore', divide='ignore'):
+        averages = sums / counts
+    averages[counts == 0] = np.nan
+
+    firsts = [DIMENSIONS.index(first) for first, _ in OPPOSING_PAIRS]
+    seconds = [DIMENSIONS.index(second) for _, second in OPPOSING_PAIRS]
+    return CohortScores(averages, averages[:, firsts] - averages[:, seconds])
+
+
+# ============================================================================
+# Radar chart
+# ============================================================================
+
+def draw_radar(fig, scores: Dict[str, float]):
+    """Draw the radar chart of dimension scores onto a matplotlib figure."""
+    labels = list(scores.keys())
+    angles = [2 * math.pi * i / len(labels) for i in range(len(labels))]
+    stats = [scores[dim] for dim in labels]
+
+    ax = fig.add_subplot(111, polar=True)
+    ax.plot(angles, stats, 'o-', linewidth=2)
+    ax.fill(angles, stats, alpha=0.25)
+
+    # Rotate labels for better readability
+    ax.set_thetagrids([math.degrees(angle) for angle in angles], labels, rotation=45)
+    ax.set_ylim(0, 10)
+    ax.set_title("Philosophical Leanings", va='bottom', pad=20)
+    fig.tight_layout()
+    return ax
+
+
+def render_radar(scores: Dict[str, float], fmt: str = 'png', dpi: int = 100) -> bytes:
+    """Render the radar chart headlessly (Agg) and return the image bytes."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(12, 12))  # Increased figure size for better readability
+    FigureCanvasAgg(fig)
+    draw_radar(fig, scores)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi)
+    return buffer.getvalue()
+
+
+def show_radar(scores: Dict[str, float]):
+    """Show the radar chart in a window."""
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(12, 12))
+    draw_radar(fig, scores)
+    plt.show()
+
+
+def main():
+    session = QuizSession()
+    total = len(session.questions_list)
+    for count, (dimension, question) in enumerate(session.questions_list, 1):
+        print("\nQuestion", count, "of", total)
+        print("\n" + question)
+        response = input("Please enter a number from 1 to 10, where 1 is 'strongly disagree' and 10 is 'strongly agree': ")
+        while not session.answer(response):
+            response = input("Invalid input. Please enter a number from 1 to 10: ")
+
+    show_radar(session.scores())
+
 
-# Ask questions and record responses
-questions_list = []
-for dimension in questions:
-    slist = questions[dimension]
-    random.shuffle(slist)
-    for i in range(len(slist)):  # Changed to use all questions in each dimension
-        questions_list.append((dimension, slist[i]))
-
-random.shuffle(questions_list)
-
-for dimension, question in questions_list:
-    count += 1
-    print("\nQuestion", count, "of", len(questions_list))
-    print("\n" + question)
-    response = input("Please enter a number from 1 to 10, where 1 is 'strongly disagree' and 10 is 'strongly agree': ")
-    while not response.isdigit() or not 1 <= int(response) <= 10:
-        response = input("Invalid input. Please enter a number from 1 to 10: ")
-    scores[dimension] += int(response)
-    
-# Calculate average score for each dimension
-for dimension in scores:
-    scores[dimension] /= len(questions[dimension])
-
-# Plot radar graph
-angles = np.linspace(0, 2*np.pi, len(scores), endpoint=False)
-stats = [scores[dim] for dim in scores.keys()]
-
-fig = plt.figure(figsize=(12,12))  # Increased figure size for better readability
-ax = fig.add_subplot(111, polar=True)
-
-ax.plot(angles, stats, 'o-', linewidth=2)
-ax.fill(angles, stats, alpha=0.25)
-
-ax.set_thetagrids(angles * 180/np.pi, list(scores.keys()))
-ax.set_ylim(0,10)
-ax.set_title("Philosophical Leanings", va='bottom', pad=20)
-
-# Rotate labels for better readability
-plt.xticks(angles * 180/np.pi, list(scores.keys()), rotation=45)
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# radar_renderer.py
+"""
+Batch rendering of phil_quiz radar charts for cohort reports.
+
+Charts are cached on disk by a hash of the rounded score vector, so
+respondents with identical (rounded) profiles share one image and
+re-running a report only renders new profiles. Missing charts are
+rendered across a process pool; each worker builds the figure, axes,
+labels and layout once and then only swaps the plotted data per chart.
+
+Run with: python radar_renderer.py scores.json --out charts/
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from phil_quiz import DIMENSIONS, draw_radar
+
+FORMATS = ('png', 'svg')
+
+
+def rounded_scores(scores: Dict[str, float], decimals: int = 1) -> List[Optional[float]]:
+    """A profile's scores in chart order, rounded; None for an unanswered dimension."""
+    values = []
+    for dimension in DIMENSIONS:
+        value = scores.get(dimension)
+        values.append(None if value is None or math.isnan(value) else round(float(value), decimals))
+    return values
+
+
+def profile_key(values: List[Optional[float]], fmt: str = 'png', dpi: int = 100) -> str:
+    """Cache key for a rounded score vector rendered in a given format."""
+    payload = json.dumps([values, fmt, dpi], separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class RadarCache:
+    """Rendered charts stored as <key>.<fmt> files in one directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str, fmt: str) -> str:
+        return os.path.join(self.directory, f"{key}.{fmt}")
+
+    def __contains__(self, item) -> bool:
+        key, fmt = item
+        return os.path.exists(self.path_for(key, fmt))
+
+    def put(self, key: str, fmt: str, image: bytes) -> str:
+        path = self.path_for(key, fmt)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(image)
+        os.replace(temp_path, path)
+        return path
+
+
+class _RadarTemplate:
+    """One figure whose plotted line and fill are replaced for each chart."""
+
+    def __init__(self, dpi: int):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.dpi = dpi
+        self.figure = Figure(figsize=(12, 12))
+        FigureCanvasAgg(self.figure)
+        # Lay out once with a full-scale profile; every chart has the same labels and limits
+        ax = draw_radar(self.figure, {dimension: 10 for dimension in DIMENSIONS})
+        self.angles = [2 * math.pi * i / len(DIMENSIONS) for i in range(len(DIMENSIONS))]
+        self.line = ax.lines[0]
+        self.fill = ax.patches[0]
+
+    def render(self, values: List[Optional[float]], fmt: str) -> bytes:
+        stats = [math.nan if value is None else value for value in values]
+        self.line.set_data(self.angles, stats)
+        self.fill.set_xy([(angle, 0.0 if math.isnan(stat) else stat)
+                          for angle, stat in zip(self.angles, stats)])
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format=fmt, dpi=self.dpi)
+        return buffer.getvalue()
+
+
+# Per-process template, built by _init_worker
+_template: Optional[_RadarTemplate] = None
+
+
+def _init_worker(dpi: int):
+    global _template
+    _template = _RadarTemplate(dpi)
+
+
+def _render_job(job) -> str:
+    """Render one chart into the cache (runs in a worker process)."""
+    directory, key, values, fmt = job
+    return RadarCache(directory).put(key, fmt, _template.render(values, fmt))
+
+
+def render_profiles(profiles: Iterable[Dict[str, float]], directory: str, fmt: str = 'png',
+                    dpi: int = 100, decimals: int = 1, workers: int = None) -> List[str]:
+    """
+    Render a radar chart per profile (dimension -> score, as returned by
+    phil_quiz.score_responses or CohortScores.profile) and return each
+    profile's image path. Only profiles missing from the cache are rendered.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    cache = RadarCache(directory)
+
+    keys = []
+    jobs = {}
+    for scores in profiles:
+        values = rounded_scores(scores, decimals)
+        key = profile_key(values, fmt, dpi)
+        keys.append(key)
+        if key not in jobs and (key, fmt) not in cache:
+            jobs[key] = (directory, key, values, fmt)
+
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) <= 1 or workers == 1:
+        _init_worker(dpi)
+        for job in jobs.values():
+            _render_job(job)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                                 initargs=(dpi,)) as pool:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            for _ in pool.map(_render_job, jobs.values(), chunksize=chunksize):
+                pass
+
+    return [cache.path_for(key, fmt) for key in keys]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render phil_quiz radar charts for many respondents")
+    parser.add_argument("scores", help="JSON file: {respondent: {dimension: score}} or a list of score dicts")
+    parser.add_argument("--out", default="radar_charts", help="chart cache directory")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.scores, 'r') as file:
+        data = json.load(file)
+    names = list(data) if isinstance(data, dict) else [str(i) for i in range(len(data))]
+    profiles = list(data.values()) if isinstance(data, dict) else data
+
+    paths = render_profiles(profiles, args.out, fmt=args.format, dpi=args.dpi, workers=args.workers)
+    json.dump(dict(zip(names, paths)), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# terminal_renderer.py
+"""
+Buffered typing-effect output for the command-line games.
+
+Text is written in frames: each frame writes every character that is due
+since the last one with a single write and flush, instead of one flush and
+one sleep per character. Pressing any key shows the rest of the passage at
+once and skips the pause after it. When stdout is not a terminal (piped
+output, graded runs) text is written immediately with no pauses.
+
+Set BAYESIAN_COURT_TEXT_SPEED to scale the animation (2 = twice as fast,
+0 = no animation); an unusable value falls back to normal speed.
+"""
+
+import math
+import os
+import sys
+import time
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+if msvcrt is None:
+    import select
+    import termios
+    import tty
+
+
+class _NoKeys:
+    """Key source for when stdin is not a terminal: waits without ever reporting a key."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def wait(self, timeout: float) -> bool:
+        if timeout > 0:
+            time.sleep(timeout)
+        return False
+
+
+class _TerminalKeys:
+    """Watches the keyboard without echo while a passage is being animated."""
+
+    def __init__(self, stdin):
+        self.stdin = stdin
+        self._saved = None
+
+    def __enter__(self):
+        if msvcrt is None:
+            fd = self.stdin.fileno()
+            self._saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+            new = termios.tcgetattr(fd)
+            new[3] &= ~termios.ECHO
+            termios.tcsetattr(fd, termios.TCSANOW, new)
+        return self
+
+    def __exit__(self, *exc):
+        if self._saved is not None:
+            termios.tcsetattr(self.stdin.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+        return False
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout; return True (and swallow the keys) if a key was pressed."""
+        if msvcrt is not None:
+            deadline = time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(remaining, 0.01))
+            while msvcrt.kbhit():
+                msvcrt.getwch()
+            return True
+
+        fd = self.stdin.fileno()
+        ready, _, _ = select.select([fd], [], [], max(timeout, 0))
+        if not ready:
+            return False
+        # Drain everything typed so it does not leak into the next input() prompt
+        while ready:
+            os.read(fd, 1024)
+            ready, _, _ = select.select([fd], [], [], 0)
+        return True
+
+
+class TerminalRenderer:
+    """Writes passages with a skippable, frame-buffered typing effect."""
+
+    def __init__(self, stream=None, speed: float = 1.0, line_pause: float = 0.5,
+                 frame_interval: float = 1 / 30, keys=None, animate: bool = None):
+        self.stream = stream
+        self.speed = speed
+        self.line_pause = line_pause
+        self.frame_interval = frame_interval
+        self.keys = keys
+        # None: animate only when writing to a terminal
+        self.animate = animate
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'TerminalRenderer':
+        speed = os.environ.get('BAYESIAN_COURT_TEXT_SPEED')
+        if speed:
+            try:
+                value = float(speed)
+                if not math.isfinite(value) or value < 0:
+                    raise ValueError(speed)
+                kwargs.setdefault('speed', value)
+            except ValueError:
+                print(f"Warning: ignoring BAYESIAN_COURT_TEXT_SPEED={speed!r}, "
+                      f"expected a number >= 0; using 1.0", file=sys.stderr)
+        return cls(**kwargs)
+
+    def _animating(self, stream) -> bool:
+        if self.speed <= 0:
+            return False
+        if self.animate is not None:
+            return self.animate
+        return hasattr(stream, 'isatty') and stream.isatty()
+
+    def _key_source(self):
+        if self.keys is not None:
+            return self.keys
+        if sys.stdin is not None and sys.stdin.isatty():
+            return _TerminalKeys(sys.stdin)
+        return _NoKeys()
+
+    def print(self, text: str, char_delay: float = 0.005):
+        """Type out text followed by a newline and a short pause."""
+        stream = self.stream or sys.stdout
+        if not self._animating(stream):
+            stream.write(text + '\n')
+            stream.flush()
+            return
+
+        char_delay = char_delay / self.speed
+        with self._key_source() as keys:
+            written = 0
+            skipped = False
+            start = time.monotonic()
+            while written < len(text):
+                due = len(text) if char_delay <= 0 else int((time.monotonic() - start) / char_delay) + 1
+                due = min(max(due, written + 1), len(text))
+                stream.write(text[written:due])
+                stream.flush()
+                written = due
+                if written < len(text) and keys.wait(self.frame_interval):
+                    skipped = True
+                    break
+
+            stream.write(text[written:] + '\n')
+            stream.flush()
+            if not skipped:
+                keys.wait(self.line_pause / self.speed)
+
+
+renderer = TerminalRenderer.from_env()
@@ -6,12 +6,14 @@ Run with: python test_bayesian_core.py
 
 import unittest
 import json
+import math
 import os
 import tempfile
 from bayesian_core import (
     BayesianCalculator, 
     BayesianGame, 
     CaseData, 
+    CaseStore,
     PlayerState, 
     PlayerResponse,
     GamePhase,
@@ -243,7 +245,28 @@ class TestBayesianGame(unittest.TestCase):
         success = self.game.add_player("player1", "Alice Again", 100, True)
         self.assertFalse(success)
         self.assertEqual(len(self.game.players), 2)
-    
+
+    def test_add_players_bulk(self):
+        """Test adding a roster at once and handing a seat to a new id."""
+        self.game.max_players = 3
+        added = self.game.add_players([
+            {'player_id': "seat1", 'name': "Alice", 'guilt_tolerance': 100},
+            {'player_id': "seat1", 'name': "Duplicate", 'guilt_tolerance': 100},
+            {'player_id': "seat2", 'name': "Bob", 'guilt_tolerance': 1000, 'use_rating_scale': False},
+            {'player_id': "seat3", 'name': "Carol", 'guilt_tolerance': 100},
+            {'player_id': "seat4", 'name': "Over capacity", 'guilt_tolerance': 100},
+        ], is_connected=False)
+
+        self.assertEqual(added, ["seat1", "seat2", "seat3"])
+        self.assertAlmostEqual(self.game.players["seat2"].guilt_threshold_db, 30.0)
+        self.assertFalse(self.game.players["seat1"].is_connected)
+
+        self.assertTrue(self.game.reassign_player("seat1", "session_a"))
+        self.assertEqual(self.game.players["session_a"].name, "Alice")
+        self.assertEqual(self.game.players["session_a"].player_id, "session_a")
+        self.assertNotIn("seat1", self.game.players)
+        self.assertFalse(self.game.reassign_player("seat2", "session_a"))
+
     def test_game_phases(self):
         """Test game phase transitions."""
         # Initially in setup
@@ -279,6 +302,12 @@ class TestBayesianGame(unittest.TestCase):
         
         # Not all players have responded yet
         self.assertFalse(self.game.all_players_responded())
+        self.assertEqual(self.game.response_fraction(), 0.5)
+        
+        # Disconnected players do not count toward the fraction
+        self.game.set_player_connection_status("player2", False)
+        self.assertEqual(self.game.response_fraction(), 1.0)
+        self.game.set_player_connection_status("player2", True)
         
         # Submit response for player2
         success = self.game.submit_evidence_response("player2", 0.7, 0.3)
@@ -333,6 +362,7 @@ class TestBayesianGame(unittest.TestCase):
         # Get game state with verdict
         state = self.game.get_game_state()
         self.assertEqual(state['phase'], GamePhase.VERDICT.value)
+        self.assertEqual(state['case_hash'], self.game.case_data.content_hash)
         self.assertIn('verdict', state)
         
         # Check that verdict calculation works
@@ -356,6 +386,33 @@ class TestBayesianGame(unittest.TestCase):
         player_state = self.game.get_player_state("nonexistent")
         self.assertIsNone(player_state)
     
+    def test_advance_evidence_scores_responses(self):
+        """Test calibration scoring against the case's reference probabilities."""
+        self.test_case_data['evidence'][0].update({"prob_guilty": 0.8, "prob_innocent": 0.2})
+        with open(self.temp_file.name, 'w') as f:
+            json.dump(self.test_case_data, f)
+        game = BayesianGame(self.temp_file.name, "scored_game")
+        game.add_player("exact", "Alice", 100, False)
+        game.add_player("off", "Bob", 100, False)
+        game.start_game()
+        game.advance_to_evidence_review()
+        
+        game.submit_evidence_response("exact", 0.8, 0.2)
+        game.submit_evidence_response("off", 0.5, 0.5)
+        game.advance_evidence()
+        
+        exact, off = game.players["exact"], game.players["off"]
+        self.assertAlmostEqual(exact.mean_abs_error_db(), 0.0)
+        self.assertAlmostEqual(exact.mean_log_score(), 0.0)
+        self.assertAlmostEqual(off.mean_abs_error_db(), 10 * math.log10(4))
+        self.assertLess(off.mean_log_score(), 0.0)
+        
+        # Evidence without reference probabilities is not scored
+        game.submit_evidence_response("exact", 0.9, 0.1)
+        game.advance_evidence()
+        self.assertEqual(exact.scored_responses, 1)
+        self.assertIsNone(exact.responses[1].abs_error_db)
+    
     def test_save_game_results(self):
         """Test saving game results."""
         # Set up and complete a game
@@ -385,6 +442,47 @@ class TestBayesianGame(unittest.TestCase):
             os.unlink(filename)
         except Exception as e:
             self.fail(f"Save game results failed: {e}")
+    
+    def test_save_game_results_with_writer(self):
+        """Test handing results to a background writer."""
+        class RecordingWriter:
+            def __init__(self):
+                self.submitted = []
+            
+            def submit(self, filename, results):
+                self.submitted.append((filename, results))
+        
+        self.game.add_player("player1", "Alice", 100, True)
+        writer = RecordingWriter()
+        filename = self.game.save_game_results("queued.json", writer=writer)
+        
+        # Nothing is written by the caller; the writer gets the snapshot
+        self.assertEqual(filename, "queued.json")
+        self.assertFalse(os.path.exists(filename))
+        self.assertEqual(len(writer.submitted), 1)
+        self.assertEqual(writer.submitted[0][1]['game_id'], "test_game")
+        self.assertIn("player1", writer.submitted[0][1]['players'])
+    
+    def test_save_game_results_with_case_store(self):
+        """Test that results reference a case stored once by content hash."""
+        import shutil
+        store_dir = tempfile.mkdtemp()
+        try:
+            case_store = CaseStore(store_dir)
+            other_game = BayesianGame(self.temp_file.name, "other_game")
+            first = self.game.build_results(case_store)
+            second = other_game.build_results(case_store)
+            
+            self.assertNotIn('case_data', first)
+            self.assertEqual(first['case_hash'], second['case_hash'])
+            self.assertEqual(first['case_name'], "Test Case")
+            self.assertEqual(os.listdir(store_dir), [f"{first['case_hash']}.json"])
+            self.assertEqual(CaseStore(store_dir).get(first['case_hash']), self.test_case_data)
+            
+            # Without a store the case is embedded as before
+            self.assertEqual(self.game.build_results()['case_data'], self.test_case_data)
+        finally:
+            shutil.rmtree(store_dir)
 
 
 class TestUtilityFunctions(unittest.TestCase):
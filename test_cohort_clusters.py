@@ -0,0 +1,93 @@
+# test_cohort_clusters.py
+"""
+Test suite for quiz-profile clustering joined to juror behavior.
+Run with: python test_cohort_clusters.py
+"""
+
+import unittest
+import json
+import math
+import os
+import sys
+import tempfile
+from bayesian_core import BayesianGame
+
+# The results warehouse lives with the server
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "bayesian-court-game"))
+from results_store import ResultsStore
+
+try:
+    import numpy
+    from cohort_clusters import minibatch_kmeans, cluster_behavior
+    from phil_quiz import DIMENSIONS
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestCohortClusters(unittest.TestCase):
+    """Test clustering separated profiles and the per-cluster verdict summary."""
+
+    def setUp(self):
+        rng = numpy.random.default_rng(1)
+        low, high = numpy.full(30, 3.0), numpy.full(30, 8.0)
+        self.points = numpy.vstack([low + rng.normal(0, 0.3, (200, 30)), high + rng.normal(0, 0.3, (200, 30))])
+        self.ids = [f"low{i}" for i in range(200)] + [f"high{i}" for i in range(200)]
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        case_file = os.path.join(self.temp_dir.name, "case.json")
+        with open(case_file, 'w') as f:
+            json.dump({
+                "case": {"name": "Test Case", "description": "Test"},
+                "prior": {"db": 5.0, "odds": "3 to 1"},
+                "evidence": [{"name": "Evidence 1", "description": "Test", "prob_guilty": 0.9, "prob_innocent": 0.1}]
+            }, f)
+
+        # Played through the real warehouse, so the join is tested against its schema.
+        # The "low" people convict with a 1 in 10 tolerance, the "high" one does not (1 in 1000)
+        game = BayesianGame(case_file, "game_a")
+        answers = {"LOW1": (10, 0.9, 0.1), "low2": (10, 0.8, 0.2), "high1": (1000, 0.2, 0.8),
+                   "stranger": (100, 0.5, 0.5)}
+        for name, (tolerance, _, _) in answers.items():
+            game.add_player(name.lower(), name, tolerance)
+        game.start_game()
+        game.advance_to_evidence_review()
+        for name, (_, prob_guilty, prob_innocent) in answers.items():
+            game.submit_evidence_response(name.lower(), prob_guilty, prob_innocent)
+        game.advance_evidence()
+
+        self.db_path = os.path.join(self.temp_dir.name, "results.db")
+        store = ResultsStore(self.db_path)
+        store.insert_results(os.path.join(self.temp_dir.name, "case_results_game_a.json"), game.build_results())
+        store.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_minibatch_kmeans_separates_groups(self):
+        """Test that the two profile groups land in different clusters."""
+        centers, labels, _ = minibatch_kmeans(self.points, 2, batch_size=64, iterations=50)
+        self.assertEqual(len(set(labels[:200])), 1)
+        self.assertEqual(len(set(labels[200:])), 1)
+        self.assertNotEqual(labels[0], labels[200])
+        self.assertAlmostEqual(centers[labels[0]][DIMENSIONS.index("Freedom")], 3.0, delta=0.2)
+
+    def test_cluster_behavior_joins_by_name(self):
+        """Test conviction rates, tolerances and dB updates per cluster."""
+        _, labels, _ = minibatch_kmeans(self.points, 2, batch_size=64, iterations=50)
+        summary = cluster_behavior(self.ids, labels, 2, self.db_path)
+        low = summary['clusters'][labels[0]]
+        high = summary['clusters'][labels[200]]
+
+        actual_db = 10 * math.log10(9)
+        low_updates = [actual_db, 10 * math.log10(4)]
+        self.assertEqual((low['profiles'], low['games'], low['conviction_rate']), (200, 2, 1.0))
+        self.assertAlmostEqual(low['geometric_mean_tolerance'], 10.0)
+        self.assertAlmostEqual(low['mean_db_update'], sum(low_updates) / 2)
+        self.assertAlmostEqual(low['mean_db_error'], sum(abs(update - actual_db) for update in low_updates) / 2)
+        self.assertEqual((high['games'], high['conviction_rate']), (1, 0.0))
+        self.assertEqual(sum(row['responses'] for row in summary['evidence']), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# test_guilt_or_innocence_game.py
+"""
+Tests for the command-line game's scripted (answer sheet) mode.
+Run with: python test_guilt_or_innocence_game.py
+"""
+
+import unittest
+import io
+import json
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from guilt_or_innocence_game import load_answer_sheets, grade_answer_sheets
+
+
+class TestScriptedGrading(unittest.TestCase):
+    """Test grading answer sheets without prompts."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.case_file = os.path.join(self.temp_dir, "test_case.json")
+        with open(self.case_file, 'w') as f:
+            json.dump({
+                "case": {"name": "Test Case", "description": "A test case", "population": 100},
+                "prior": {"odds": "1:99", "db": -20.0},
+                "evidence": [
+                    {"name": "Evidence 1", "description": "First", "prob_guilty": 0.9, "prob_innocent": 0.1},
+                    {"name": "Evidence 2", "description": "Second", "prob_guilty": 0.8, "prob_innocent": 0.2}
+                ]
+            }, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_csv_and_json_sheets(self):
+        """Test that CSV rows and JSON objects produce the same sheets."""
+        csv_file = os.path.join(self.temp_dir, "answers.csv")
+        with open(csv_file, 'w') as f:
+            f.write("id,tolerance,input_method,guilty_1,innocent_1,guilty_2,innocent_2\n")
+            f.write("alice,200,rating,8,2,9,1\n")
+            f.write(",100,probability,0.9,0.1,0.8,0.2\n")
+        sheets = load_answer_sheets(csv_file)
+
+        self.assertEqual([sheet["id"] for sheet in sheets], ["alice", "sheet2"])
+        self.assertEqual(sheets[0]["answers"], [{"guilty": "8", "innocent": "2"}, {"guilty": "9", "innocent": "1"}])
+
+        json_file = os.path.join(self.temp_dir, "answers.json")
+        with open(json_file, 'w') as f:
+            json.dump({"id": "bob", "tolerance": 200, "answers": []}, f)
+        self.assertEqual(load_answer_sheets(json_file)[0]["id"], "bob")
+
+    def test_grade_answer_sheets(self):
+        """Test that each valid sheet is saved and invalid answers are reported."""
+        sheets = [
+            {"id": "alice", "tolerance": 10, "input_method": "probability",
+             "answers": [{"guilty": 0.1, "innocent": 0.0001}, {"guilty": 0.1, "innocent": 0.0001}]},
+            {"id": "bob", "tolerance": 200, "input_method": "rating",
+             "answers": [{"guilty": 8, "innocent": 2}, {"guilty": 11, "innocent": 2}]}
+        ]
+        graded = grade_answer_sheets(self.case_file, sheets)
+
+        alice, bob = graded
+        self.assertIsNone(alice[2])
+        self.assertIn("_played_", alice[1])
+        with open(alice[1], 'r') as f:
+            results = json.load(f)
+        self.assertEqual(results["verdict"], "GUILTY")
+        self.assertEqual(len(results["player_responses"]), 2)
+        self.assertAlmostEqual(results["final_evidence_db"], -20.0 + 2 * 30.0)
+
+        self.assertIsNone(bob[1])
+        self.assertIn("Evidence 2", bob[2])
+
+    def test_output_dir_holds_case_store(self):
+        """Test that results and their case store land in the output directory, quietly."""
+        output_dir = os.path.join(self.temp_dir, "graded")
+        sheet = {"id": "carol", "tolerance": 100,
+                 "answers": [{"guilty": 8, "innocent": 2}, {"guilty": 8, "innocent": 2}]}
+        output = io.StringIO()
+        with redirect_stdout(output):
+            (_, filename, error), = grade_answer_sheets(self.case_file, [sheet], output_dir)
+
+        self.assertIsNone(error)
+        self.assertEqual(os.path.dirname(filename), output_dir)
+        with open(filename, 'r') as f:
+            case_hash = json.load(f)["case_hash"]
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "case_store", f"{case_hash}.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "case_store")))
+        self.assertEqual(output.getvalue(), "")
+
+    def test_clashing_ids_get_separate_files(self):
+        """Test that sheets with the same id, before or after cleaning, are all kept."""
+        answers = [{"guilty": 8, "innocent": 2}, {"guilty": 8, "innocent": 2}]
+        sheets = [{"id": sheet_id, "tolerance": 100, "answers": answers} for sheet_id in ("ann", "ann", "a b", "a_b")]
+        graded = grade_answer_sheets(self.case_file, sheets)
+
+        filenames = [filename for _, filename, _ in graded]
+        self.assertEqual([error for _, _, error in graded], [None] * 4)
+        self.assertEqual(len(set(filenames)), 4)
+        for filename in filenames:
+            self.assertTrue(os.path.exists(filename))
+
+
+if __name__ == "__main__":
+    unittest.main()
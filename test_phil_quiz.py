@@ -0,0 +1,93 @@
+# test_phil_quiz.py
+"""
+Test suite for the philosophical leanings quiz engine.
+Run with: python test_phil_quiz.py
+"""
+
+import unittest
+import subprocess
+import sys
+import random
+import phil_quiz
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import matplotlib
+except ImportError:
+    matplotlib = None
+
+
+class TestPhilQuiz(unittest.TestCase):
+    """Test the quiz engine without a terminal."""
+
+    def test_import_is_lightweight(self):
+        """Test that importing the quiz does not pull in matplotlib or numpy."""
+        code = "import sys, phil_quiz; print('matplotlib' in sys.modules or 'numpy' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+    def test_question_list_covers_every_statement(self):
+        """Test that shuffling keeps every statement once and leaves the bank untouched."""
+        before = {dimension: list(statements) for dimension, statements in phil_quiz.questions.items()}
+        questions_list = phil_quiz.build_question_list()
+        self.assertEqual(len(questions_list), sum(len(s) for s in before.values()))
+        self.assertEqual(sorted(q for _, q in questions_list), sorted(q for s in before.values() for q in s))
+        self.assertEqual(phil_quiz.questions, before)
+
+    def test_session_scores(self):
+        """Test that a session rejects bad answers and averages per dimension."""
+        session = phil_quiz.QuizSession(seed=3)
+        self.assertFalse(session.answer("11"))
+        self.assertFalse(session.answer("abc"))
+        while not session.is_complete:
+            dimension, _ = session.current_question()
+            self.assertTrue(session.answer(10 if dimension == "Freedom" else 4))
+        scores = session.scores()
+        self.assertEqual(len(scores), 30)
+        self.assertEqual(scores["Freedom"], 10)
+        self.assertEqual(scores["Coercion"], 4)
+        self.assertFalse(session.answer("5"))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_score_batch_matches_single_scoring(self):
+        """Test that batch scores equal per-respondent scoring, with axes per opposing pair."""
+        rng = random.Random(5)
+        rows = [[rng.randint(1, 10) for _ in phil_quiz.QUESTION_COLUMNS] for _ in range(50)]
+        cohort = phil_quiz.score_batch(rows)
+
+        self.assertEqual(cohort.averages.shape, (50, 30))
+        self.assertEqual(cohort.axes.shape, (50, 15))
+        for i, row in enumerate(rows):
+            expected = phil_quiz.score_responses(
+                (dimension, rating) for (dimension, _), rating in zip(phil_quiz.QUESTION_COLUMNS, row))
+            for dimension, value in cohort.profile(i).items():
+                self.assertAlmostEqual(value, expected[dimension])
+            self.assertAlmostEqual(cohort.axis_profile(i)["Freedom vs. Coercion"],
+                                   expected["Freedom"] - expected["Coercion"])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_score_batch_missing_and_invalid(self):
+        """Test that unanswered questions are left out and out-of-range ratings rejected."""
+        row = [5.0] * len(phil_quiz.QUESTION_COLUMNS)
+        row[0] = 9.0
+        row[1] = numpy.nan
+        cohort = phil_quiz.score_batch([row])
+        self.assertEqual(cohort.profile(0)[phil_quiz.QUESTION_COLUMNS[0][0]], 9.0)
+
+        row[1] = 11
+        with self.assertRaises(ValueError):
+            phil_quiz.score_batch([row])
+
+    @unittest.skipIf(matplotlib is None, "matplotlib is not installed")
+    def test_render_radar(self):
+        """Test that the radar chart renders headlessly to PNG."""
+        image = phil_quiz.render_radar({dimension: 5 for dimension in phil_quiz.DIMENSIONS}, dpi=20)
+        self.assertTrue(image.startswith(b"\x89PNG"))
+
+
+if __name__ == "__main__":
+    unittest.main()
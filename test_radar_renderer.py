@@ -0,0 +1,51 @@
+# test_radar_renderer.py
+"""
+Test suite for cached batch radar-chart rendering.
+Run with: python test_radar_renderer.py
+"""
+
+import unittest
+import os
+import tempfile
+from phil_quiz import DIMENSIONS
+from radar_renderer import rounded_scores, profile_key, render_profiles
+
+try:
+    import matplotlib
+except ImportError:
+    matplotlib = None
+
+
+class TestRadarRenderer(unittest.TestCase):
+    """Test cache keys and rendering with deduplication."""
+
+    def test_profile_key_rounds_scores(self):
+        """Test that profiles equal after rounding share a key and others do not."""
+        base = {dimension: 5.0 for dimension in DIMENSIONS}
+        close = dict(base, Freedom=5.04)
+        different = dict(base, Freedom=5.2)
+        key = profile_key(rounded_scores(base))
+        self.assertEqual(profile_key(rounded_scores(close)), key)
+        self.assertNotEqual(profile_key(rounded_scores(different)), key)
+        self.assertNotEqual(profile_key(rounded_scores(base), fmt='svg'), key)
+        self.assertIsNone(rounded_scores(dict(base, Freedom=float('nan')))[DIMENSIONS.index("Freedom")])
+
+    @unittest.skipIf(matplotlib is None, "matplotlib is not installed")
+    def test_render_profiles_deduplicates(self):
+        """Test that identical profiles render once and a second run hits the cache."""
+        profiles = [{dimension: (i % 2) * 4 + 3 for dimension in DIMENSIONS} for i in range(4)]
+        with tempfile.TemporaryDirectory() as directory:
+            paths = render_profiles(profiles, directory, dpi=20, workers=2)
+            self.assertEqual(len(set(paths)), 2)
+            self.assertEqual(paths[0], paths[2])
+            self.assertEqual(len(os.listdir(directory)), 2)
+            with open(paths[1], 'rb') as f:
+                self.assertTrue(f.read().startswith(b"\x89PNG"))
+
+            mtime = os.path.getmtime(paths[0])
+            self.assertEqual(render_profiles(profiles[:1], directory, dpi=20), paths[:1])
+            self.assertEqual(os.path.getmtime(paths[0]), mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
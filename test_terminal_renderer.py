@@ -0,0 +1,97 @@
+# test_terminal_renderer.py
+"""
+Test suite for the buffered typing-effect renderer.
+Run with: python test_terminal_renderer.py
+"""
+
+import unittest
+import io
+import os
+import time
+from contextlib import redirect_stderr
+from unittest import mock
+from terminal_renderer import TerminalRenderer
+
+
+class CountingStream(io.StringIO):
+    """A stream that counts flushes."""
+
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class FakeKeys:
+    """A key source that waits out each frame and reports a key press on the nth wait."""
+
+    def __init__(self, press_on=None):
+        self.press_on = press_on
+        self.waits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def wait(self, timeout):
+        self.waits += 1
+        if self.waits == self.press_on:
+            return True
+        time.sleep(timeout)
+        return False
+
+
+class TestTerminalRenderer(unittest.TestCase):
+    """Test framing, skipping and the non-terminal fast path."""
+
+    def test_non_terminal_writes_at_once(self):
+        """Test that text for a non-terminal is written with one flush and no pause."""
+        stream = CountingStream()
+        TerminalRenderer(stream=stream).print("Hello, jury")
+        self.assertEqual(stream.getvalue(), "Hello, jury\n")
+        self.assertEqual(stream.flushes, 1)
+
+    def test_frames_batch_characters(self):
+        """Test that animation flushes once per frame rather than once per character."""
+        stream = CountingStream()
+        keys = FakeKeys()
+        text = "x" * 400
+        TerminalRenderer(stream=stream, keys=keys, animate=True, line_pause=0,
+                         frame_interval=0.001).print(text, char_delay=0.0001)
+        self.assertEqual(stream.getvalue(), text + "\n")
+        self.assertLess(stream.flushes, len(text) / 2)
+
+    def test_key_press_shows_rest(self):
+        """Test that a key press writes the rest of the passage and skips the pause."""
+        stream = CountingStream()
+        keys = FakeKeys(press_on=1)
+        text = "The defendant was seen leaving the building at midnight."
+        TerminalRenderer(stream=stream, keys=keys, animate=True).print(text, char_delay=10)
+        self.assertEqual(stream.getvalue(), text + "\n")
+        self.assertEqual(stream.flushes, 2)
+        self.assertEqual(keys.waits, 1)
+
+    def test_zero_speed_disables_animation(self):
+        """Test that speed 0 writes instantly even on a terminal."""
+        stream = CountingStream()
+        keys = FakeKeys()
+        TerminalRenderer(stream=stream, keys=keys, animate=True, speed=0).print("Verdict")
+        self.assertEqual(stream.getvalue(), "Verdict\n")
+        self.assertEqual(keys.waits, 0)
+
+    def test_bad_env_speed_falls_back(self):
+        """Test that an unusable BAYESIAN_COURT_TEXT_SPEED warns and keeps normal speed."""
+        for value, expected in (('2.5', 2.5), ('fast', 1.0), ('-1', 1.0)):
+            errors = io.StringIO()
+            with mock.patch.dict(os.environ, {'BAYESIAN_COURT_TEXT_SPEED': value}), redirect_stderr(errors):
+                self.assertEqual(TerminalRenderer.from_env().speed, expected)
+            self.assertEqual(bool(errors.getvalue()), expected == 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()